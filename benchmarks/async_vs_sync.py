@@ -0,0 +1,68 @@
+"""
+Compare query throughput of the blocking MemVectorDB client against
+AsyncMemVectorDB on a local stand-in server.
+
+Usage:
+    python -m benchmarks.async_vs_sync --queries 2000 --dimension 384 --concurrency 32
+"""
+import argparse
+import asyncio
+import random
+import time
+from memvectordb.collection import MemVectorDB
+from memvectordb.async_collection import AsyncMemVectorDB
+from memvectordb.testing import MockMemVectorDBServer
+
+
+def random_vectors(n, dimension, seed=0):
+    rng = random.Random(seed)
+    return [[rng.random() for _ in range(dimension)] for _ in range(n)]
+
+
+def bench_sync(url, collection_name, query_vectors, k):
+    with MemVectorDB(base_url=url) as client:
+        start = time.perf_counter()
+        for vector in query_vectors:
+            client.query(k, collection_name, vector)
+        return time.perf_counter() - start
+
+
+async def bench_async(url, collection_name, query_vectors, k, concurrency):
+    async with AsyncMemVectorDB(base_url=url, pool_maxsize=concurrency) as client:
+        start = time.perf_counter()
+        await client.query_many(k, collection_name, query_vectors, concurrency=concurrency)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--vectors", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=128)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    collection_name = "benchmark"
+    with MockMemVectorDBServer() as server:
+        with MemVectorDB(base_url=server.url) as client:
+            client.create_collection(collection_name, args.dimension, "cosine")
+            client.batch_insert_embeddings(collection_name, [
+                {"id": {"unique_id": str(i)}, "vector": vector}
+                for i, vector in enumerate(random_vectors(args.vectors, args.dimension))
+            ])
+        query_vectors = random_vectors(args.queries, args.dimension, seed=1)
+
+        sync_seconds = bench_sync(server.url, collection_name, query_vectors, args.k)
+        async_seconds = asyncio.run(
+            bench_async(server.url, collection_name, query_vectors, args.k, args.concurrency)
+        )
+
+    print(f"{'client':<28}{'seconds':>10}{'queries/s':>12}")
+    print(f"{'MemVectorDB':<28}{sync_seconds:>10.3f}{args.queries / sync_seconds:>12.1f}")
+    print(f"{'AsyncMemVectorDB (c=' + str(args.concurrency) + ')':<28}"
+          f"{async_seconds:>10.3f}{args.queries / async_seconds:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
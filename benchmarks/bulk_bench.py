@@ -0,0 +1,75 @@
+"""
+Compare backing up and restoring a collection through JSON against the
+binary export format, on a local stand-in server.
+
+Usage:
+    python -m benchmarks.bulk_bench --vectors 5000 --dimension 384
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.testing import MockMemVectorDBServer
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def json_export(client, collection_name, path):
+    embeddings = client.get_embeddings(collection_name)
+    with open(path, "wb") as f:
+        f.write(client.serializer.dumps(embeddings))
+    return len(embeddings)
+
+
+def json_import(client, collection_name, path, dimension):
+    with open(path, "rb") as f:
+        embeddings = client.serializer.loads(f.read())
+    client.create_collection(collection_name, dimension, "cosine")
+    return client.batch_insert_embeddings(collection_name, embeddings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=5000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.vectors, args.dimension)).astype(np.float32)
+    ids = [str(i) for i in range(args.vectors)]
+    metadata = [{"text": f"document {i}"} for i in range(args.vectors)]
+
+    with MockMemVectorDBServer() as server, MemVectorDB(base_url=server.url) as client, \
+            tempfile.TemporaryDirectory() as directory:
+        client.create_collection("source", args.dimension, "cosine")
+        client.batch_insert_embeddings(
+            "source", ids=ids, vectors=vectors, metadata=metadata, chunk_size=args.chunk_size
+        )
+        json_path = os.path.join(directory, "collection.json")
+        binary_path = os.path.join(directory, "collection.mvdb")
+
+        json_export_seconds, _ = timed(lambda: json_export(client, "source", json_path))
+        json_import_seconds, _ = timed(lambda: json_import(client, "json_copy", json_path, args.dimension))
+        binary_export_seconds, _ = timed(lambda: client.export_collection("source", binary_path, distance="cosine"))
+        binary_import_seconds, _ = timed(
+            lambda: client.import_collection(binary_path, "binary_copy", chunk_size=args.chunk_size)
+        )
+
+        print(f"{args.vectors} vectors of dimension {args.dimension}")
+        print(f"{'format':<8}{'file MB':>10}{'export s':>10}{'import s':>10}")
+        for name, path, export_seconds, import_seconds in (
+            ("json", json_path, json_export_seconds, json_import_seconds),
+            ("binary", binary_path, binary_export_seconds, binary_import_seconds),
+        ):
+            print(f"{name:<8}{os.path.getsize(path) / 1e6:>10.1f}{export_seconds:>10.2f}{import_seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Measure client overhead for single inserts, batch inserts, queries and
+add_documents across vector dimensions and batch sizes, against the local
+stand-in server and a deterministic fake embedder.
+
+Each case reports operations per second, items per second, p50/p99 latency
+and the peak memory traced during one extra pass. The stand-in server runs in
+a child process so its work and memory are not counted. Results can be saved
+as JSON and compared with an earlier run; the exit status is 1 when a case
+got slower than the threshold allows.
+
+Usage:
+    python -m benchmarks.client_bench --output baseline.json
+    python -m benchmarks.client_bench --compare baseline.json --threshold 0.15
+    python -m benchmarks.client_bench --scenarios query --dimensions 384,1536
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import platform
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.testing import FakeSentenceTransformer, MockMemVectorDBServer
+from memvectordb.vectorstore import MemVectorDBVectorStore
+
+SCENARIOS = ("single_insert", "batch_insert", "query", "add_documents")
+
+
+def serve(queue):
+    with MockMemVectorDBServer() as server:
+        queue.put(server.url)
+        queue.get()
+
+
+class ChildServer:
+    """The stand-in server, running in a child process."""
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        self.queue = context.Queue()
+        self.process = context.Process(target=serve, args=(self.queue,), daemon=True)
+        self.process.start()
+        self.url = self.queue.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc):
+        self.queue.put(None)
+        self.process.join(timeout=5)
+
+
+def percentile(latencies, q):
+    return float(np.percentile(latencies, q)) * 1000 if latencies else 0.0
+
+
+def measure(name, setup, op, operations, items_per_op, **labels):
+    """
+    Time `operations` calls of `op(i)` after `setup()`, then trace the peak memory of one more pass.
+    """
+    state = setup()
+    latencies = []
+    start = time.perf_counter()
+    for i in range(operations):
+        begin = time.perf_counter()
+        op(state, i)
+        latencies.append(time.perf_counter() - begin)
+    seconds = time.perf_counter() - start
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        for i in range(min(operations, 20)):
+            op(state, i)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "scenario": name,
+        **labels,
+        "operations": operations,
+        "seconds": seconds,
+        "ops_per_sec": operations / seconds,
+        "items_per_sec": operations * items_per_op / seconds,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "peak_kib": peak / 1024,
+    }
+
+
+def unit_vectors(n, dimension, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def fresh_collection(client, name, dimension):
+    client.delete_collection(name)
+    client.create_collection(name, dimension, "cosine")
+
+
+def run_single_insert(client, dimension, args):
+    vectors = unit_vectors(args.operations, dimension)
+
+    def setup():
+        fresh_collection(client, "bench_single", dimension)
+
+    def op(_, i):
+        client.insert_embeddings("bench_single", str(i), vectors[i], {"i": str(i)})
+
+    return [measure("single_insert", setup, op, args.operations, 1, dimension=dimension, batch_size=1)]
+
+
+def run_batch_insert(client, dimension, args):
+    results = []
+    for batch_size in args.batch_sizes:
+        operations = max(3, args.operations // batch_size)
+        vectors = unit_vectors(batch_size, dimension)
+        ids = [str(i) for i in range(batch_size)]
+
+        def setup():
+            fresh_collection(client, "bench_batch", dimension)
+
+        def op(_, i, ids=ids, vectors=vectors):
+            client.batch_insert_embeddings("bench_batch", ids=ids, vectors=vectors)
+
+        results.append(measure(
+            "batch_insert", setup, op, operations, batch_size, dimension=dimension, batch_size=batch_size
+        ))
+    return results
+
+
+def run_query(client, dimension, args):
+    queries = unit_vectors(args.operations, dimension, seed=1)
+
+    def setup():
+        fresh_collection(client, "bench_query", dimension)
+        client.batch_insert_embeddings(
+            "bench_query",
+            ids=[str(i) for i in range(args.collection_size)],
+            vectors=unit_vectors(args.collection_size, dimension),
+            chunk_size=1000
+        )
+
+    def op(_, i):
+        client.query(args.k, "bench_query", queries[i])
+
+    return [measure("query", setup, op, args.operations, 1, dimension=dimension, batch_size=1)]
+
+
+def run_add_documents(client, dimension, args):
+    results = []
+    for batch_size in args.batch_sizes:
+        operations = max(3, args.operations // batch_size)
+        documents = [
+            SimpleNamespace(page_content=f"Document {i} about topic {i % 17}", metadata={"n": i})
+            for i in range(batch_size)
+        ]
+
+        def setup():
+            fresh_collection(client, "bench_documents", dimension)
+            return MemVectorDBVectorStore(
+                client.base_url, "sentence_transformers", "fake",
+                embedding_model_client=FakeSentenceTransformer(dimension)
+            )
+
+        def op(store, i, documents=documents, batch_size=batch_size):
+            store.add_documents("bench_documents", documents, batch_size=batch_size, show_progress=False)
+
+        results.append(measure(
+            "add_documents", setup, op, operations, batch_size, dimension=dimension, batch_size=batch_size
+        ))
+    return results
+
+
+RUNNERS = {
+    "single_insert": run_single_insert,
+    "batch_insert": run_batch_insert,
+    "query": run_query,
+    "add_documents": run_add_documents,
+}
+
+
+def case_key(result):
+    return result["scenario"], result["dimension"], result["batch_size"]
+
+
+def compare(results, baseline, threshold):
+    """
+    Print each case's change against the baseline. Returns the number of regressions.
+    """
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = 0
+    print(f"\n{'case':<34}{'ops/s':>10}{'change':>9}{'p99 ms':>10}{'change':>9}")
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None:
+            continue
+        speed = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        tail = result["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        regressed = speed < -threshold
+        regressions += regressed
+        name = "{}/d{}/b{}".format(*case_key(result))
+        print(f"{name:<34}{result['ops_per_sec']:>10.1f}{speed:>+9.1%}{result['p99_ms']:>10.2f}{tail:>+9.1%}"
+              + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--dimensions", default="128,384,1536")
+    parser.add_argument("--batch-sizes", default="10,100,1000")
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--collection-size", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--base-url", help="Benchmark against this server instead of the stand-in.")
+    parser.add_argument("--output", help="Save the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with the results saved in this JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="The drop in ops/s counted as a regression, as a fraction.")
+    args = parser.parse_args()
+    args.batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    dimensions = [int(dimension) for dimension in args.dimensions.split(",")]
+    scenarios = args.scenarios.split(",")
+
+    results = []
+    with ChildServer() if args.base_url is None else contextlib.nullcontext(SimpleNamespace(url=args.base_url)) \
+            as server, \
+            MemVectorDB(base_url=server.url) as client:
+        print(f"{'case':<34}{'ops/s':>10}{'items/s':>11}{'p50 ms':>9}{'p99 ms':>9}{'peak KiB':>10}")
+        for scenario in scenarios:
+            for dimension in dimensions:
+                for result in RUNNERS[scenario](client, dimension, args):
+                    results.append(result)
+                    name = "{}/d{}/b{}".format(*case_key(result))
+                    print(f"{name:<34}{result['ops_per_sec']:>10.1f}{result['items_per_sec']:>11.0f}"
+                          f"{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}{result['peak_kib']:>10.0f}")
+        for name in ("bench_single", "bench_batch", "bench_query", "bench_documents"):
+            client.delete_collection(name)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "arguments": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+                "results": results,
+            }, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure the accuracy versus size tradeoff of client-side quantization: recall@k
+against unquantized float32 results, request bytes per vector, and insert and
+query time, on the in-process engine or a server.
+
+Usage:
+    python -m benchmarks.quantization_bench --vectors 5000 --dimension 768 --k 10
+"""
+import argparse
+import time
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.quantization import Quantizer
+
+
+def configurations(dimension, sample):
+    yield "float32", None
+    yield "float16", Quantizer("float16")
+    yield "int8", Quantizer("int8")
+    yield "int8 calibrated", Quantizer.calibrate(sample)
+    for dimensions in (dimension // 2, dimension // 4):
+        yield f"trunc{dimensions}", Quantizer(dimensions=dimensions)
+        yield f"trunc{dimensions}+int8", Quantizer.calibrate(sample, dimensions=dimensions)
+
+
+def result_ids(results):
+    return [{item["embedding"]["id"]["unique_id"] for item in result} for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=5000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--base-url", default="memory://")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Embedding-like data: clustered, with variance decaying across components as
+    # in Matryoshka-trained models, normalized to unit length.
+    centers = rng.standard_normal((50, args.dimension))
+    decay = 1.0 / np.sqrt(1.0 + np.arange(args.dimension) / 32.0)
+    vectors = (centers[rng.integers(0, 50, args.vectors)] + 0.5 * rng.standard_normal((args.vectors, args.dimension)))
+    vectors = (vectors * decay).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = vectors[rng.choice(args.vectors, args.queries, replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+    ids = [str(i) for i in range(args.vectors)]
+
+    print(f"{args.vectors} vectors of dimension {args.dimension}, {args.queries} queries, k={args.k}")
+    print(f"{'encoding':<16}{'recall':>8}{'bytes/vec':>11}{'insert s':>10}{'query ms':>10}")
+    baseline = None
+    for name, quantizer in configurations(args.dimension, vectors[:1000]):
+        with MemVectorDB(base_url=args.base_url, quantization=quantizer) as client:
+            dimension = quantizer.dimensions if quantizer and quantizer.dimensions else args.dimension
+            client.delete_collection("quantization_bench")
+            client.create_collection("quantization_bench", dimension, "cosine")
+            start = time.perf_counter()
+            report = client.batch_insert_embeddings(
+                "quantization_bench", ids=ids, vectors=vectors, chunk_size=1000
+            )
+            insert_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            results = [client.query(args.k, "quantization_bench", query) for query in queries]
+            query_ms = (time.perf_counter() - start) * 1000 / args.queries
+            found = result_ids(results)
+            if baseline is None:
+                baseline = found
+            recall = np.mean([len(a & b) / args.k for a, b in zip(found, baseline)])
+            print(
+                f"{name:<16}{recall:>8.3f}{report.bytes_sent / args.vectors:>11.0f}"
+                f"{insert_seconds:>10.2f}{query_ms:>10.2f}"
+            )
+            client.delete_collection("quantization_bench")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of encode/decode throughput for vector payloads across
+serializers and vector dimensions.
+
+Usage:
+    python -m benchmarks.serialization_bench --vectors 1000 --dimensions 128 384 768 1536
+"""
+import argparse
+import json
+import time
+import numpy as np
+from memvectordb.serialization import JSONSerializer, OrjsonSerializer, orjson
+
+
+def payload(vectors, as_list):
+    return {
+        "collection_name": "benchmark",
+        "embeddings": [
+            {
+                "id": {"unique_id": str(i)},
+                "vector": vector.tolist() if as_list else vector,
+                "metadata": {"text": "benchmark"}
+            }
+            for i, vector in enumerate(vectors)
+        ]
+    }
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=1000)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[128, 384, 768, 1536])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    serializers = [("json", JSONSerializer())]
+    if orjson is not None:
+        serializers.append(("orjson", OrjsonSerializer()))
+
+    rng = np.random.default_rng(0)
+    print(f"{'dimension':>9}  {'serializer':<12}{'input':<12}{'encode MB/s':>12}{'decode MB/s':>12}{'vectors/s':>12}")
+    for dimension in args.dimensions:
+        vectors = rng.standard_normal((args.vectors, dimension)).astype(np.float32)
+        for name, serializer in serializers:
+            for as_list in (True, False):
+                # list input includes the tolist() conversion in the encode time
+                encode_seconds, body = best_of(
+                    lambda serializer=serializer, vectors=vectors, as_list=as_list: serializer.dumps(
+                        payload(vectors, as_list)
+                    ),
+                    args.repeat
+                )
+                decode_seconds, _ = best_of(
+                    lambda serializer=serializer, body=body: serializer.loads(body), args.repeat
+                )
+                megabytes = len(body) / 1e6
+                print(f"{dimension:>9}  {name:<12}{'list' if as_list else 'ndarray':<12}"
+                      f"{megabytes / encode_seconds:>12.1f}{megabytes / decode_seconds:>12.1f}"
+                      f"{args.vectors / encode_seconds:>12.0f}")
+    body = json.dumps(payload(vectors[:1], True)).encode("utf-8")
+    print(f"\nexample body size per {args.dimensions[-1]}-d vector: {len(body)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+import asyncio
+import time
+import aiohttp
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Awaitable, Sequence, Union, AsyncIterator
+from .batching import embedding_id, prepare_embedding
+from .vectors import EmbeddingArrays, as_vector, iter_vectors, to_arrays, many_to_arrays
+from .streaming import JSONArrayStreamParser
+from .serialization import get_serializer
+from .instrumentation import RequestEvent, RequestObserver
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable[Any]],
+    concurrency: int = 10,
+    return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Run awaitables concurrently with at most `concurrency` of them in flight.
+
+    Args:
+        aws (Iterable[Awaitable[Any]]): The awaitables to run.
+        concurrency (int): The maximum number of awaitables running at once.
+        return_exceptions (bool): Whether to return exceptions in place of results
+            instead of raising the first one.
+
+    Returns:
+        List[Any]: The results, in the same order as the input awaitables.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+class AsyncMemVectorDB:
+    def __init__(
+        self,
+        base_url: str,
+        pool_maxsize: int = 100,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        timeout: Optional[float] = None,
+        keep_alive: bool = True,
+        serializer: Union[str, Any] = "auto",
+        instrumentation: Optional[RequestObserver] = None
+    ) -> None:
+        """
+        Initialize the asyncio client. The connection pool is created on first use.
+
+        Args:
+            base_url (str): The base URL of the MemVectorDB server.
+            pool_maxsize (int): The maximum number of simultaneous connections in the pool.
+            max_retries (int): The number of retries for failed connections and 502/503/504 responses.
+            backoff_factor (float): The backoff factor applied between retry attempts.
+            timeout (Optional[float]): Total request timeout in seconds. None waits indefinitely.
+            keep_alive (bool): Whether to reuse connections between requests.
+            serializer (Union[str, Any]): The JSON serializer for request and response bodies,
+                as for `MemVectorDB`.
+            instrumentation (Optional[RequestObserver]): Notified of the timings, sizes,
+                retries and errors of every request, as for `MemVectorDB`.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.serializer = get_serializer(serializer)
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.instrumentation = instrumentation
+        self._batch_query_supported: Optional[bool] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncMemVectorDB":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP session and release pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                force_close=not self.keep_alive
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Content-Type": "application/json"}
+            )
+        return self.session
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Dict[str, Any],
+        event: RequestEvent,
+        read: bool = True
+    ) -> Tuple[aiohttp.ClientResponse, float]:
+        """
+        Send a JSON request, retrying connection errors and 502/503/504 responses
+        with exponential backoff.
+
+        Returns:
+            Tuple[aiohttp.ClientResponse, float]: The response, with its body already
+                read unless `read` is False, so connection errors while reading it are
+                retried too, and the `time.perf_counter()` reading when the body was first sent.
+        """
+        url = f"{self.base_url}{endpoint}"
+        session = self._get_session()
+        start = time.perf_counter()
+        body = self.serializer.dumps(payload)
+        sent = time.perf_counter()
+        event.serialize_seconds = sent - start
+        event.bytes_sent = len(body)
+        for attempt in range(self.max_retries + 1):
+            retry = attempt < self.max_retries
+            event.retries = attempt
+            try:
+                response = await session.request(method, url, data=body)
+                if read and response.status not in (502, 503, 504):
+                    await response.read()
+            except aiohttp.ClientConnectionError as e:
+                if not retry:
+                    if self.instrumentation is not None:
+                        event.network_seconds = time.perf_counter() - sent
+                        event.error = type(e).__name__
+                        self.instrumentation.on_request(event)
+                    raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                continue
+            if retry and response.status in (502, 503, 504):
+                response.release()
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                continue
+            return response, sent
+
+    def _observe(
+        self,
+        event: RequestEvent,
+        status: int,
+        sent: float,
+        received: float
+    ) -> None:
+        """
+        Report a finished request to the instrumentation, if any.
+        """
+        if self.instrumentation is None:
+            return
+        event.status = status
+        event.network_seconds = received - sent
+        if status >= 400:
+            event.error = f"HTTP {status}"
+        self.instrumentation.on_request(event)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[int, Any]:
+        """
+        Send a JSON request to the server over the pooled session, retrying
+        connection errors and 502/503/504 responses with exponential backoff.
+
+        Args:
+            method (str): The HTTP method to use.
+            endpoint (str): The endpoint path, e.g. "/get_similarity".
+            payload (Dict[str, Any]): The JSON body of the request.
+
+        Returns:
+            Tuple[int, Any]: The HTTP status code and the decoded JSON response.
+        """
+        event = RequestEvent(method, endpoint)
+        response, sent = await self._send(method, endpoint, payload, event)
+        content = await response.read()
+        received = time.perf_counter()
+        data = self.serializer.loads(content) if content else None
+        event.deserialize_seconds = time.perf_counter() - received
+        event.bytes_received = len(content)
+        self._observe(event, response.status, sent, received)
+        return response.status, data
+
+    async def create_collection(
+        self,
+        collection_name: str,
+        dimension: int,
+        distance: str
+    ) -> str:
+        """
+        Create a collection with the specified parameters.
+
+        Args:
+            collection_name (str): The name of the collection.
+            dimension (int): The dimension of the vectors in the collection.
+            distance (str): The distance metric to use for similarity search.
+
+        Returns:
+            str: Status message from the server.
+        """
+        payload = {
+            "collection_name": collection_name,
+            "dimension": dimension,
+            "distance": distance
+        }
+        status_code, response_data = await self._request("POST", "/create_collection", payload)
+        if status_code != 200:
+            raise Exception(f"Failed to create collection: {response_data}")
+        status = response_data['status']
+        if status == "Error: UniqueViolation":
+            return "Error: Collection with name '{}' already exists".format(collection_name)
+        return status
+
+    async def get_collection(
+        self,
+        collection_name: str
+    ) -> Dict[str, Any]:
+        """
+        Retrieve information about a collection.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve.
+
+        Returns:
+            dict: Information about the collection.
+        """
+        payload = {
+            "collection_name": collection_name
+        }
+        _, response_data = await self._request("GET", "/get_collection", payload)
+        return response_data
+
+    async def delete_collection(
+        self,
+        collection_name: str
+    ) -> Dict[str, Any]:
+        """
+        Delete an existing collection.
+
+        Args:
+            collection_name (str): The name of the collection to delete.
+
+        Returns:
+            dict: Confirmation statement.
+        """
+        payload = {
+            "collection_name": collection_name
+        }
+        _, response_data = await self._request("DELETE", "/delete_collection", payload)
+        return response_data
+
+    async def insert_embeddings(
+        self,
+        collection_name: str,
+        vector_id: int,
+        vector: Union[List[float], Any],
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """
+        Insert a single embedding into a specified collection.
+
+        Args:
+            collection_name (str): The name of the collection to insert the embedding into.
+            vector_id (int): The unique identifier for the vector.
+            vector (Union[List[float], numpy.ndarray]): The vector to be inserted, as a list,
+                a 1-D NumPy array or a buffer of floats.
+            metadata (Optional[Dict]): Additional metadata associated with the vector.
+
+        Returns:
+            str: Status of the insertion operation.
+        """
+        if metadata:
+            metadata = {str(key): str(value) for key, value in metadata.items()}
+        embedding = {
+            "id": {
+                "unique_id": vector_id
+            },
+            "vector": as_vector(vector),
+            "metadata": metadata
+        }
+        payload = {
+            "collection_name": collection_name,
+            "embedding": embedding
+        }
+        status_code, response_data = await self._request("PUT", "/insert_embeddings", payload)
+        if status_code == 200:
+            return response_data
+        else:
+            return f"Failed to insert embedding: {response_data}"
+
+    async def batch_insert_embeddings(
+        self,
+        collection_name: str,
+        embeddings: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Insert a batch of embeddings into a specified collection.
+
+        Args:
+            collection_name (str): The name of the collection to insert the embeddings into.
+            embeddings (List[Dict[str, Any]]): List of dictionaries representing embeddings,
+                in the same format as `MemVectorDB.batch_insert_embeddings`.
+
+        Returns:
+            str: Status message indicating the success of the insertion operation.
+        """
+        embeddings = [prepare_embedding(emb) for emb in embeddings]
+        payload = {
+            "collection_name": collection_name,
+            "embeddings": embeddings
+        }
+        status_code, response_data = await self._request("PUT", "/batch_insert_embeddings", payload)
+        if status_code == 200:
+            return response_data
+        else:
+            raise Exception(f"Failed to insert embedding: {response_data}")
+
+    async def get_embeddings(
+        self,
+        collection_name: str,
+        as_numpy: bool = False
+    ) -> Union[List[Dict[str, Any]], EmbeddingArrays]:
+        """
+        Retrieve embeddings from a collection.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve embeddings from.
+            as_numpy (bool): Whether to return the embeddings as columns, with the
+                vectors in a 2-D float32 NumPy array.
+
+        Returns:
+            Union[List[Dict[str, Any]], EmbeddingArrays]: A list of dictionaries representing
+                the retrieved embeddings, or their columns when `as_numpy` is set.
+        """
+        payload = {
+            "collection_name": collection_name
+        }
+        status_code, response_data = await self._request("GET", "/get_embeddings", payload)
+        if status_code == 200 and as_numpy:
+            return to_arrays(response_data)
+        return response_data
+
+    async def iter_embeddings(
+        self,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        chunk_size: int = 65536
+    ) -> AsyncIterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Stream embeddings from a collection without loading the whole response.
+
+        The request is retried and reported to the instrumentation like any other;
+        only its body is read as it arrives.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve embeddings from.
+            batch_size (Optional[int]): Yield lists of up to this many embeddings
+                instead of one embedding at a time.
+            chunk_size (int): The number of bytes read from the network at a time.
+
+        Yields:
+            Union[Dict[str, Any], List[Dict[str, Any]]]: Each embedding, or each batch
+                of embeddings when `batch_size` is set.
+        """
+        payload = {
+            "collection_name": collection_name
+        }
+        parser = JSONArrayStreamParser(loads=self.serializer.loads)
+        batch = []
+        event = RequestEvent("GET", "/get_embeddings")
+        response, sent = await self._send("GET", "/get_embeddings", payload, event, read=False)
+        async with response:
+            try:
+                if response.status != 200:
+                    raise Exception(f"Failed to get embeddings: {await response.text()}")
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    event.bytes_received += len(chunk)
+                    for embedding in parser.feed(chunk):
+                        if not batch_size:
+                            yield embedding
+                            continue
+                        batch.append(embedding)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+                    if parser.done:
+                        break
+            finally:
+                self._observe(event, response.status, sent, time.perf_counter())
+        if batch:
+            yield batch
+
+    async def query(
+        self,
+        k: int,
+        collection_name: str,
+        query_vector: Union[List[float], Any],
+        as_numpy: bool = False
+    ) -> Union[List[Dict[str, Any]], EmbeddingArrays]:
+        """
+        Retrieve similar embeddings from a collection based on a query vector.
+
+        Args:
+            k (int): The number of similar embeddings to retrieve.
+            collection_name (str): The name of the collection to retrieve embeddings from.
+            query_vector (Union[List[float], numpy.ndarray]): The query vector for similarity
+                search, as a list, a 1-D NumPy array or a buffer of floats.
+            as_numpy (bool): Whether to return the results as columns, with the vectors
+                and scores in float32 NumPy arrays.
+
+        Returns:
+            Union[List[Dict[str, Any]], EmbeddingArrays]: A list of dictionaries representing
+                the similar embeddings, or their columns when `as_numpy` is set.
+        """
+        payload = {
+            "collection_name": collection_name,
+            "query_vector": as_vector(query_vector),
+            "k": k
+        }
+        status_code, response_data = await self._request("GET", "/get_similarity", payload)
+        if status_code == 200 and as_numpy:
+            return to_arrays(response_data)
+        return response_data
+
+    async def _batch_query(
+        self,
+        k: int,
+        collection_name: str,
+        query_vectors: List[List[float]]
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Try to answer all queries with one request to `/batch_get_similarity`.
+
+        Returns None, and remembers not to try again, if the server does not
+        expose the endpoint.
+        """
+        payload = {
+            "collection_name": collection_name,
+            "query_vectors": query_vectors,
+            "k": k
+        }
+        status_code, response_data = await self._request("GET", "/batch_get_similarity", payload)
+        if status_code in (404, 405, 501):
+            self._batch_query_supported = False
+            return None
+        if status_code == 200 and isinstance(response_data, list) \
+                and len(response_data) == len(query_vectors):
+            self._batch_query_supported = True
+            return response_data
+        return None
+
+    async def query_many(
+        self,
+        k: int,
+        collection_name: str,
+        query_vectors: Union[Sequence[List[float]], Any],
+        concurrency: int = 10,
+        return_exceptions: bool = True,
+        as_numpy: bool = False
+    ) -> List[Union[List[Dict[str, Any]], EmbeddingArrays, Exception]]:
+        """
+        Run many similarity queries concurrently over the shared connection pool.
+
+        A single `/batch_get_similarity` request is used when the server supports it.
+
+        Args:
+            k (int): The number of similar embeddings to retrieve per query.
+            collection_name (str): The name of the collection to query.
+            query_vectors (Union[Sequence[List[float]], numpy.ndarray]): A list of query
+                vectors or a 2-D NumPy array with one query per row.
+            concurrency (int): The maximum number of queries in flight at once.
+            return_exceptions (bool): Whether a failed query puts its exception in its
+                slot of the results instead of raising.
+            as_numpy (bool): Whether to return each query's results as columns, as for `query`.
+
+        Returns:
+            List[Union[List[Dict[str, Any]], EmbeddingArrays, Exception]]: The results of each
+                query, in input order.
+        """
+        query_vectors = list(iter_vectors(query_vectors))
+        if not query_vectors:
+            return []
+        if len(query_vectors) > 1 and self._batch_query_supported is not False:
+            try:
+                results = await self._batch_query(k, collection_name, query_vectors)
+            except (aiohttp.ClientError, ValueError):
+                results = None
+            if results is not None:
+                return many_to_arrays(results) if as_numpy else results
+        results = await gather_bounded(
+            (self.query(k, collection_name, vector) for vector in query_vectors),
+            concurrency=concurrency,
+            return_exceptions=return_exceptions
+        )
+        return many_to_arrays(results) if as_numpy else results
+
+    async def insert_many(
+        self,
+        collection_name: str,
+        embeddings: List[Dict[str, Any]],
+        concurrency: int = 10
+    ) -> List[str]:
+        """
+        Insert embeddings one request each, with up to `concurrency` requests in flight.
+
+        Args:
+            collection_name (str): The name of the collection to insert the embeddings into.
+            embeddings (List[Dict[str, Any]]): Dictionaries with keys 'id', 'vector'
+                and optional 'metadata'.
+            concurrency (int): The maximum number of inserts in flight at once.
+
+        Returns:
+            List[str]: The status of each insertion, in input order.
+        """
+        return await gather_bounded(
+            (
+                self.insert_embeddings(
+                    collection_name=collection_name,
+                    vector_id=embedding_id(emb),
+                    vector=emb["vector"],
+                    metadata=emb.get("metadata")
+                )
+                for emb in embeddings
+            ),
+            concurrency=concurrency
+        )
@@ -0,0 +1,284 @@
+import json
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, Callable, List, Iterable, Iterator, Optional, Tuple, Union
+from .vectors import as_vector
+
+
+@dataclass
+class BatchInsertReport:
+    """
+    Aggregate outcome of a chunked `batch_insert_embeddings` call.
+
+    Attributes:
+        inserted (int): The number of embeddings the server accepted.
+        failed_ids (List[str]): The ids of embeddings in chunks that failed after all retries.
+        chunks (int): The number of chunks sent.
+        failed_chunks (int): The number of chunks that failed after all retries.
+        retries (int): The number of chunk retries performed.
+        bytes_sent (int): The total size of the chunk bodies, excluding retries.
+        elapsed (float): Wall-clock seconds spent on the whole ingest.
+        errors (List[str]): The last error message of each failed chunk.
+        chunk_sizes (List[int]): The number of embeddings in each chunk, in the order sent.
+        adaptive (Optional[AdaptiveBatchStats]): The adaptive batcher's state after the
+            upload, when one chose the chunk sizes.
+    """
+    inserted: int = 0
+    failed_ids: List[str] = field(default_factory=list)
+    chunks: int = 0
+    failed_chunks: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+    chunk_sizes: List[int] = field(default_factory=list)
+    adaptive: Optional["AdaptiveBatchStats"] = None
+
+    @property
+    def throughput(self) -> float:
+        """Embeddings inserted per second."""
+        return self.inserted / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class AdaptiveBatchStats:
+    """
+    The decisions made by an `AdaptiveBatcher`.
+
+    Attributes:
+        chunk_size (int): The current chunk size.
+        chunks (int): The number of chunk results recorded.
+        increases (int): The number of times the chunk size grew.
+        decreases (int): The number of times the chunk size was cut.
+        holds (int): The number of results that left the chunk size unchanged.
+        smallest (int): The smallest chunk size chosen so far.
+        largest (int): The largest chunk size chosen so far.
+        latency (float): A moving average of chunk request seconds.
+        bytes_per_item (float): A moving average of serialized bytes per embedding.
+        slow_start (bool): Whether the batcher is still doubling the chunk size.
+    """
+    chunk_size: int = 0
+    chunks: int = 0
+    increases: int = 0
+    decreases: int = 0
+    holds: int = 0
+    smallest: int = 0
+    largest: int = 0
+    latency: float = 0.0
+    bytes_per_item: float = 0.0
+    slow_start: bool = True
+
+
+class AdaptiveBatcher:
+    """
+    Tunes the chunk size of a chunked upload from the results of earlier chunks.
+
+    The size follows additive-increase/multiplicative-decrease. It starts at
+    `initial_size` and doubles after each full chunk that met the latency target,
+    until the first decrease; after that it grows by `increase`. A chunk that
+    failed, needed retries or took longer than `target_seconds` cuts the size by
+    `decrease`. Growth is skipped when the last chunk's latency, scaled to the
+    larger size, would miss the target, or when the average serialized size per
+    embedding says the larger chunk would exceed `max_chunk_bytes`.
+
+    With several chunks in flight, results arrive for chunks cut at an older
+    size. A bad result for a chunk larger than the current size is not counted
+    again, so one slow period cuts the size once rather than once per chunk.
+
+    An instance keeps its state between calls, so passing the same batcher to
+    every `batch_insert_embeddings` of an ingest carries the tuned size over.
+
+    Args:
+        initial_size (int): The chunk size to start from.
+        min_size (int): The smallest chunk size chosen.
+        max_size (int): The largest chunk size chosen.
+        target_seconds (float): The longest acceptable chunk request.
+        max_chunk_bytes (Optional[int]): The maximum serialized size of a chunk's embeddings.
+        increase (int): The additive step once slow start is over.
+        decrease (float): The factor applied to the chunk size on a decrease.
+        smoothing (float): The weight of the newest sample in the moving averages.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 64,
+        min_size: int = 8,
+        max_size: int = 4096,
+        target_seconds: float = 1.0,
+        max_chunk_bytes: Optional[int] = None,
+        increase: int = 16,
+        decrease: float = 0.5,
+        smoothing: float = 0.3
+    ) -> None:
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        if not 1 <= min_size <= max_size:
+            raise ValueError("min_size must be at least 1 and at most max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.max_chunk_bytes = max_chunk_bytes
+        self.increase = increase
+        self.decrease = decrease
+        self.smoothing = smoothing
+        size = min(max(initial_size, min_size), max_size)
+        self.stats = AdaptiveBatchStats(chunk_size=size, smallest=size, largest=size)
+        self._lock = threading.Lock()
+
+    @property
+    def chunk_size(self) -> int:
+        return self.stats.chunk_size
+
+    def _average(self, current: float, sample: float) -> float:
+        return sample if not current else current + self.smoothing * (sample - current)
+
+    def record(
+        self,
+        size: int,
+        count: int,
+        nbytes: int,
+        seconds: float,
+        ok: bool = True,
+        retries: int = 0
+    ) -> str:
+        """
+        Update the chunk size from one chunk's outcome.
+
+        Args:
+            size (int): The chunk size in effect when the chunk was cut.
+            count (int): The number of embeddings in the chunk.
+            nbytes (int): The serialized size of the chunk's embeddings.
+            seconds (float): How long the chunk took to upload, retries included.
+            ok (bool): Whether the chunk was stored.
+            retries (int): The number of times the chunk was resent.
+
+        Returns:
+            str: "increase", "decrease" or "hold".
+        """
+        with self._lock:
+            stats = self.stats
+            stats.chunks += 1
+            stats.latency = self._average(stats.latency, seconds)
+            if count:
+                stats.bytes_per_item = self._average(stats.bytes_per_item, nbytes / count)
+            current = stats.chunk_size
+            if not ok or retries or seconds > self.target_seconds:
+                if size > current:
+                    decision = "hold"
+                else:
+                    stats.chunk_size = max(self.min_size, int(current * self.decrease))
+                    stats.slow_start = False
+                    decision = "decrease" if stats.chunk_size < current else "hold"
+            elif count < size or size != current:
+                # A short chunk was cut by the byte budget or the end of the input,
+                # and an older one says nothing about the current size.
+                decision = "hold"
+            else:
+                grown = current * 2 if stats.slow_start else current + self.increase
+                grown = min(grown, self.max_size)
+                if self.max_chunk_bytes and stats.bytes_per_item:
+                    grown = min(grown, max(self.min_size, int(self.max_chunk_bytes // stats.bytes_per_item)))
+                if grown > current and seconds * grown / count <= self.target_seconds:
+                    stats.chunk_size = grown
+                    decision = "increase"
+                else:
+                    decision = "hold"
+            if decision == "increase":
+                stats.increases += 1
+            elif decision == "decrease":
+                stats.decreases += 1
+            else:
+                stats.holds += 1
+            stats.smallest = min(stats.smallest, stats.chunk_size)
+            stats.largest = max(stats.largest, stats.chunk_size)
+            return decision
+
+    def snapshot(self) -> AdaptiveBatchStats:
+        """A copy of the current stats."""
+        with self._lock:
+            return replace(self.stats)
+
+
+def embedding_id(embedding: Dict[str, Any]) -> str:
+    """
+    Return the unique id of an embedding dict, whether its 'id' is a plain value
+    or a {"unique_id": ...} mapping.
+    """
+    vector_id = embedding.get("id")
+    if isinstance(vector_id, dict):
+        vector_id = vector_id.get("unique_id")
+    return str(vector_id)
+
+
+def prepare_embedding(embedding: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert an embedding's metadata keys and values to strings, as the server expects,
+    and its vector to a form the serializer encodes directly.
+    """
+    if embedding.get("metadata"):
+        embedding["metadata"] = {str(key): str(value) for key, value in embedding["metadata"].items()}
+    embedding["vector"] = as_vector(embedding["vector"])
+    return embedding
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+def iter_chunks(
+    embeddings: Iterable[Dict[str, Any]],
+    chunk_size: Union[int, Callable[[], int], None] = None,
+    max_chunk_bytes: Optional[int] = None,
+    dumps: Callable[[Any], bytes] = _json_dumps
+) -> Iterator[Tuple[List[str], List[bytes]]]:
+    """
+    Serialize embeddings one at a time and group them into chunks.
+
+    A chunk is closed once it holds `chunk_size` embeddings or adding the next
+    embedding would take its serialized size past `max_chunk_bytes`. A single
+    embedding larger than the byte budget is sent in a chunk of its own.
+
+    Args:
+        embeddings (Iterable[Dict[str, Any]]): The embeddings, possibly a generator.
+        chunk_size (Union[int, Callable[[], int], None]): The maximum number of embeddings
+            per chunk, or a function returning it. The function is called before each
+            embedding is added, so a new limit also applies to the chunk being filled.
+        max_chunk_bytes (Optional[int]): The maximum serialized size of a chunk's embeddings.
+        dumps (Callable[[Any], bytes]): The function used to serialize each embedding.
+
+    Yields:
+        Tuple[List[str], List[bytes]]: The ids and serialized embeddings of each chunk.
+    """
+    ids: List[str] = []
+    parts: List[bytes] = []
+    size = 0
+    for embedding in embeddings:
+        part = dumps(prepare_embedding(embedding))
+        limit = chunk_size() if callable(chunk_size) else chunk_size
+        if parts and (
+            (limit and len(parts) >= limit)
+            or (max_chunk_bytes and size + len(part) + 1 > max_chunk_bytes)
+        ):
+            yield ids, parts
+            ids, parts, size = [], [], 0
+        ids.append(embedding_id(embedding))
+        parts.append(part)
+        size += len(part) + 1
+    if parts:
+        yield ids, parts
+
+
+def chunk_body(
+    collection_name: str,
+    parts: List[bytes]
+) -> bytes:
+    """
+    Assemble the `/batch_insert_embeddings` request body from serialized embeddings.
+    """
+    return b"".join((
+        b'{"collection_name": ',
+        json.dumps(collection_name).encode("utf-8"),
+        b', "embeddings": [',
+        b", ".join(parts),
+        b"]}"
+    ))
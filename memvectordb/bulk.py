@@ -0,0 +1,152 @@
+import json
+import struct
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Iterable, List, Optional
+import numpy as np
+
+MAGIC = b"MVDB"
+FORMAT_VERSION = 1
+# The vector block starts here, so it is aligned for memory mapping.
+VECTORS_OFFSET = 64
+# Magic, format version, reserved, and the offset of the JSON header.
+_PREAMBLE = struct.Struct("<4sHHQ")
+
+
+@dataclass
+class CollectionFile:
+    """
+    A collection read from an export file.
+
+    Attributes:
+        collection_name (str): The name of the exported collection.
+        dimension (int): The dimension of the vectors.
+        distance (str): The distance metric of the collection.
+        ids (List[str]): The unique id of each embedding.
+        vectors (numpy.ndarray): A read-only (count, dimension) float32 matrix mapped from the file.
+        metadata (List[Optional[Dict[str, str]]]): The metadata of each embedding.
+    """
+    collection_name: str
+    dimension: int
+    distance: str
+    ids: List[str]
+    vectors: Any
+    metadata: List[Optional[Dict[str, str]]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _write_column(f, values: List[bytes]) -> Dict[str, int]:
+    """Write variable-length values as a uint64 offsets array followed by their concatenated bytes."""
+    offsets = np.zeros(len(values) + 1, dtype="<u8")
+    np.cumsum([len(value) for value in values], out=offsets[1:])
+    start = f.tell()
+    f.write(offsets.tobytes())
+    f.write(b"".join(values))
+    return {"offset": start, "count": len(values)}
+
+
+def _read_column(data: memoryview, column: Dict[str, int]) -> List[bytes]:
+    count = column["count"]
+    offsets = np.frombuffer(data, dtype="<u8", count=count + 1, offset=column["offset"]).tolist()
+    blob = column["offset"] + 8 * (count + 1)
+    return [bytes(data[blob + offsets[i]:blob + offsets[i + 1]]) for i in range(count)]
+
+
+def write_collection_file(
+    path: str,
+    batches: Iterable[List[Dict[str, Any]]],
+    collection_name: str,
+    distance: str,
+    dimension: Optional[int] = None,
+    dumps: Callable[[Any], bytes] = lambda obj: json.dumps(obj).encode("utf-8")
+) -> int:
+    """
+    Write embeddings to an export file, one batch at a time.
+
+    The file holds a fixed preamble, the vectors as one float32 block starting at
+    byte 64, then the ids and the JSON-encoded metadata as columns of offsets
+    and bytes, and finally a JSON header locating each section. The preamble
+    points to the header, which is written last, so the embeddings can be
+    streamed in without knowing their number up front.
+
+    Args:
+        path (str): The file to write.
+        batches (Iterable[List[Dict[str, Any]]]): Batches of embeddings shaped like `get_embeddings` items.
+        collection_name (str): The name recorded in the header.
+        distance (str): The distance metric recorded in the header.
+        dimension (Optional[int]): The vector dimension. Inferred from the first vector when None.
+        dumps (Callable[[Any], bytes]): Encodes the metadata and the header.
+
+    Returns:
+        int: The number of embeddings written.
+    """
+    ids: List[bytes] = []
+    metadata: List[bytes] = []
+    with open(path, "wb") as f:
+        f.write(b"\0" * VECTORS_OFFSET)
+        for batch in batches:
+            if not batch:
+                continue
+            vectors = np.asarray([embedding["vector"] for embedding in batch], dtype="<f4")
+            if dimension is None:
+                dimension = vectors.shape[1]
+            if vectors.ndim != 2 or vectors.shape[1] != dimension:
+                raise ValueError(f"Expected vectors of dimension {dimension}, got shape {vectors.shape}")
+            f.write(vectors.tobytes())
+            for embedding in batch:
+                vector_id = embedding["id"]
+                ids.append(str(vector_id.get("unique_id") if isinstance(vector_id, dict) else vector_id).encode("utf-8"))
+                meta = embedding.get("metadata")
+                metadata.append(dumps(meta) if meta is not None else b"")
+        header = {
+            "collection_name": collection_name,
+            "dimension": dimension or 0,
+            "distance": distance,
+            "count": len(ids),
+            "dtype": "<f4",
+            "vectors_offset": VECTORS_OFFSET,
+            "ids": _write_column(f, ids),
+            "metadata": _write_column(f, metadata)
+        }
+        header_offset = f.tell()
+        f.write(dumps(header))
+        f.seek(0)
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, header_offset))
+    return len(ids)
+
+
+def read_collection_file(
+    path: str,
+    loads: Callable[[bytes], Any] = json.loads
+) -> CollectionFile:
+    """
+    Open an export file. The vectors are memory-mapped, not read into memory.
+
+    Args:
+        path (str): The file written by `write_collection_file`.
+        loads (Callable[[bytes], Any]): Decodes the metadata and the header.
+
+    Returns:
+        CollectionFile: The header fields, ids, mapped vectors and metadata.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    view = memoryview(data)
+    magic, version, _, header_offset = _PREAMBLE.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a MemVectorDB export file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported export format version {version}")
+    header = loads(bytes(view[header_offset:]))
+    count, dimension = header["count"], header["dimension"]
+    vectors = np.ndarray(
+        (count, dimension), dtype=header["dtype"], buffer=data, offset=header["vectors_offset"]
+    )
+    return CollectionFile(
+        collection_name=header["collection_name"],
+        dimension=dimension,
+        distance=header["distance"],
+        ids=[value.decode("utf-8") for value in _read_column(view, header["ids"])],
+        vectors=vectors,
+        metadata=[loads(value) if value else None for value in _read_column(view, header["metadata"])]
+    )
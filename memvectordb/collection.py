@@ -1,14 +1,212 @@
+import math
 import requests
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Tuple, Union, Sequence, Iterable, Iterator
+from .batching import AdaptiveBatcher, BatchInsertReport, iter_chunks, chunk_body, prepare_embedding
+from .vectors import EmbeddingArrays, as_vector, iter_vectors, embeddings_from_arrays, to_arrays, many_to_arrays
+from .streaming import iter_json_array, batched, read_json_header
+from .serialization import get_serializer
+from .query_cache import QueryCache
+from .rerank import Reranker, as_reranker
+from .filters import FilterStats, MetadataFilter, compile_filter
+from .quantization import Quantizer
+from .instrumentation import RequestEvent, RequestObserver
+
+# The most results a filtered query asks for while over-fetching.
+MAX_FILTER_FETCH = 10_000
 
 
 class MemVectorDB:
     def __init__(
         self, 
-        base_url
+        base_url: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+        keep_alive: bool = True,
+        serializer: Union[str, Any] = "auto",
+        query_cache: Optional[QueryCache] = None,
+        quantization: Optional[Quantizer] = None,
+        instrumentation: Optional[RequestObserver] = None
     ) -> None:
-        self.base_url = base_url
-        pass
+        """
+        Initialize the client with a pooled, keep-alive HTTP session.
+
+        Args:
+            base_url (str): The base URL of the MemVectorDB server, or "memory://" to run
+                against a private in-process NumPy engine. "memory://name" shares the engine
+                named `name` with every client in the process using the same URL.
+            pool_connections (int): The number of connection pools to cache.
+            pool_maxsize (int): The maximum number of connections kept alive per pool.
+            max_retries (int): The number of retries for failed connections and 502/503/504 responses.
+            backoff_factor (float): The backoff factor applied between retry attempts.
+            timeout (Optional[Union[float, Tuple[float, float]]]): Request timeout in seconds,
+                either a single value or a (connect, read) tuple. None waits indefinitely.
+            keep_alive (bool): Whether to reuse connections between requests.
+            serializer (Union[str, Any]): The JSON serializer for request and response bodies:
+                "auto" (orjson when installed, else the standard library), "orjson", "json",
+                or an object with `dumps` and `loads` methods.
+            query_cache (Optional[QueryCache]): A cache of `query` results. The entries of a
+                collection are dropped whenever this client inserts into or deletes it.
+            quantization (Optional[Quantizer]): Compress vectors on the client before they
+                are inserted or queried, and convert the vectors returned back to floats.
+            instrumentation (Optional[RequestObserver]): Notified of the serialization,
+                network and deserialization time, sizes, retries and errors of every
+                request; see `memvectordb.instrumentation.Instrumentation`.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.serializer = get_serializer(serializer)
+        self.timeout = timeout
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self._batch_query_supported: Optional[bool] = None
+        self.query_cache = query_cache
+        self.quantization = quantization
+        self.instrumentation = instrumentation
+        self.filter_stats = FilterStats()
+        self._server_filter_supported: Optional[bool] = None
+        self._filter_ratios: Dict[Tuple[str, str], float] = {}
+        self._stats_lock = threading.Lock()
+        retries = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retries
+        )
+        self._session_retry = retries
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        if not keep_alive:
+            self.session.headers.update({"Connection": "close"})
+        if self.base_url.startswith("memory:"):
+            from .local import LocalAdapter, get_engine
+
+            self.session.mount("memory:", LocalAdapter(get_engine(urlsplit(self.base_url).netloc)))
+
+    def __enter__(self) -> "MemVectorDB":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP session and release pooled connections.
+        """
+        self.session.close()
+
+    def _invalidate(self, collection_name: str) -> None:
+        """
+        Drop the cached query results of a collection after writing to it.
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate(collection_name)
+
+    def _encode_vector(self, vector: Any) -> Any:
+        """
+        Prepare a vector for sending, compressing it when quantization is set.
+        """
+        if self.quantization is not None:
+            return self.quantization.encode(vector)
+        return as_vector(vector)
+
+    def _local_vector(self, vector: Any) -> Any:
+        """
+        The query vector to compare with returned vectors on the client: truncated like
+        the stored vectors when quantization is set, but not rounded.
+        """
+        if self.quantization is not None:
+            return self.quantization.truncate(vector)
+        return vector
+
+    def _decode_vectors(self, embeddings: Any) -> None:
+        """
+        Convert the vectors of embeddings or results returned by the server back to floats.
+        """
+        if self.quantization is not None and isinstance(embeddings, list):
+            self.quantization.decode_embeddings(embeddings)
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        Send a JSON request to the server over the pooled session.
+
+        Args:
+            method (str): The HTTP method to use.
+            endpoint (str): The endpoint path, e.g. "/get_similarity".
+            payload (Optional[Dict[str, Any]]): The body of the request, encoded with the serializer.
+            data (Optional[bytes]): An already serialized JSON body, used instead of `payload`.
+            stream (bool): Whether to defer downloading the response body.
+
+        Returns:
+            requests.Response: The response from the server.
+        """
+        url = f"{self.base_url}{endpoint}"
+        if self.instrumentation is None:
+            if data is None:
+                data = self.serializer.dumps(payload)
+            return self.session.request(method, url, data=data, timeout=self.timeout, stream=stream)
+        event = RequestEvent(method, endpoint)
+        start = time.perf_counter()
+        if data is None:
+            data = self.serializer.dumps(payload)
+        sent = time.perf_counter()
+        event.serialize_seconds = sent - start
+        event.bytes_sent = len(data)
+        try:
+            response = self.session.request(method, url, data=data, timeout=self.timeout, stream=stream)
+        except Exception as e:
+            event.network_seconds = time.perf_counter() - sent
+            event.error = type(e).__name__
+            self.instrumentation.on_request(event)
+            raise
+        event.network_seconds = time.perf_counter() - sent
+        event.status = response.status_code
+        if response.status_code >= 400:
+            event.error = f"HTTP {response.status_code}"
+        if not stream:
+            event.bytes_received = len(response.content)
+        history = getattr(getattr(response.raw, "retries", None), "history", None)
+        event.retries = len(history) if history else 0
+        response.endpoint = endpoint
+        self.instrumentation.on_request(event)
+        return response
+
+    def _decode(
+        self,
+        response: requests.Response
+    ) -> Any:
+        """
+        Decode a JSON response body with the configured serializer.
+        """
+        if self.instrumentation is None:
+            return self.serializer.loads(response.content)
+        start = time.perf_counter()
+        data = self.serializer.loads(response.content)
+        self.instrumentation.on_decode(
+            getattr(response, "endpoint", response.url), time.perf_counter() - start, len(response.content)
+        )
+        return data
 
     def create_collection(
         self,
@@ -32,12 +230,10 @@ class MemVectorDB:
             "dimension": dimension,
             "distance": distance
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/create_collection"
-        response = requests.post(url, json=payload, headers=headers)
+        response = self._request("POST", "/create_collection", payload)
 
         if response.status_code == 200:
-            status = response.json()['status']
+            status = self._decode(response)['status']
             if status == "Error: UniqueViolation":
                 return "Error: Collection with name '{}' already exists".format(collection_name)
             else:
@@ -61,12 +257,12 @@ class MemVectorDB:
         payload = {
             "collection_name": collection_name
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/get_collection"
-        response = requests.get(url, json=payload, headers=headers)
+        response = self._request("GET", "/get_collection", payload)
 
-        response_data = response.json()
+        response_data = self._decode(response)
         if response.status_code == 200:
+            if isinstance(response_data, dict):
+                self._decode_vectors(response_data.get("embeddings"))
             return response_data
         else:
             return response_data
@@ -87,11 +283,10 @@ class MemVectorDB:
         payload = {
             "collection_name": collection_name
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/delete_collection"
-        response = requests.delete(url, json=payload, headers=headers)
+        response = self._request("DELETE", "/delete_collection", payload)
+        self._invalidate(collection_name)
 
-        response_data = response.json()
+        response_data = self._decode(response)
         if response.status_code == 200:
             return response_data
         else:
@@ -101,7 +296,7 @@ class MemVectorDB:
         self, 
         collection_name: str, 
         vector_id: int,
-        vector: List[float],
+        vector: Union[List[float], Any],
         metadata: Optional[Dict] = None
     ) -> str:
         """
@@ -110,7 +305,8 @@ class MemVectorDB:
         Args:
             collection_name (str): The name of the collection to insert the embedding into.
             vector_id (int): The unique identifier for the vector.
-            vector (List[float]): The vector to be inserted.
+            vector (Union[List[float], numpy.ndarray]): The vector to be inserted, as a list,
+                a 1-D NumPy array or a buffer of floats.
             metadata (Optional[Dict]): Additional metadata associated with the vector.
 
         Returns:
@@ -122,17 +318,16 @@ class MemVectorDB:
             "id": {
                 "unique_id": vector_id
             },
-            "vector": vector,
+            "vector": self._encode_vector(vector),
             "metadata": metadata
         }
         payload = {
             "collection_name": collection_name,
             "embedding": embedding
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/insert_embeddings"
-        response = requests.put(url, json=payload, headers=headers)
-        response_data = response.json()
+        response = self._request("PUT", "/insert_embeddings", payload)
+        self._invalidate(collection_name)
+        response_data = self._decode(response)
         if response.status_code == 200:
             return response_data
         else:
@@ -141,16 +336,47 @@ class MemVectorDB:
     def batch_insert_embeddings(
         self, 
         collection_name: str, 
-        embeddings: List[Dict[str, Any]]
-    ) -> str:
+        embeddings: Optional[Iterable[Dict[str, Any]]] = None,
+        chunk_size: Optional[int] = None,
+        max_chunk_bytes: Optional[int] = None,
+        max_in_flight: int = 4,
+        max_chunk_retries: int = 2,
+        ids: Optional[Sequence[Any]] = None,
+        vectors: Optional[Any] = None,
+        metadata: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        adaptive: Union[bool, AdaptiveBatcher] = False
+    ) -> Union[str, BatchInsertReport]:
         """
         Insert a batch of embeddings into a specified collection.
 
+        When `chunk_size` or `max_chunk_bytes` is given, the embeddings are serialized
+        lazily and sent as several smaller requests, with up to `max_in_flight` chunks
+        uploading at once. A generator can then be passed so the full list is never
+        held in memory. Failed chunks are retried with the same ids, so a retry
+        overwrites rather than duplicates.
+
+        Instead of `embeddings`, a 2-D NumPy array can be passed as `vectors` along
+        with `ids` and optional `metadata`; rows are serialized straight from the array.
+
+        With `adaptive`, the upload is chunked and an `AdaptiveBatcher` picks each
+        chunk's size from the latency, errors and size of the chunks before it,
+        starting from `chunk_size` and staying under `max_chunk_bytes`. Pass a
+        batcher instead of True to keep its tuned size across calls.
+
         Args:
             collection_name (str): The name of the collection to insert the embeddings into.
             embeddings (List[Dict[str, Any]]): List of dictionaries representing embeddings. 
                 Each dictionary should contain keys 'id' (int), 'vector' (List[float]), 
                 and optional 'metadata' (List[Dict[str, Any]]).
+            chunk_size (Optional[int]): The maximum number of embeddings per request.
+            max_chunk_bytes (Optional[int]): The maximum serialized size of a request body.
+            max_in_flight (int): The maximum number of chunk requests in flight at once.
+            max_chunk_retries (int): The number of times a chunk is resent after a 429 or a
+                5xx response that the session does not already retry.
+            ids (Optional[Sequence[Any]]): The unique id of each row of `vectors`.
+            vectors (Optional[numpy.ndarray]): A 2-D array with one vector per row.
+            metadata (Optional[Sequence[Optional[Dict[str, Any]]]]): The metadata of each row of `vectors`.
+            adaptive (Union[bool, AdaptiveBatcher]): Whether to tune the chunk size as the upload runs.
         example: 
                 {
                     "collection_name" : "test_collection_name",
@@ -176,78 +402,611 @@ class MemVectorDB:
                 }
 
         Returns:
-            str: Status message indicating the success of the insertion operation.
+            Union[str, BatchInsertReport]: Status message indicating the success of the
+                insertion operation, or an aggregate report when the upload is chunked.
         """
-        for emb in embeddings:
-                if emb.get("metadata"):
-                    emb["metadata"] = {str(key): str(value) for key, value in emb["metadata"].items()}
+        if vectors is not None:
+            embeddings = embeddings_from_arrays(ids, vectors, metadata)
+        if self.quantization is not None:
+            embeddings = (
+                dict(embedding, vector=self.quantization.encode(embedding["vector"]))
+                for embedding in embeddings
+            )
+        batcher = None
+        if isinstance(adaptive, AdaptiveBatcher):
+            batcher = adaptive
+        elif adaptive:
+            batcher = AdaptiveBatcher(initial_size=chunk_size or 64, max_chunk_bytes=max_chunk_bytes)
+        if chunk_size or max_chunk_bytes or batcher is not None:
+            return self._chunked_batch_insert(
+                collection_name,
+                embeddings,
+                chunk_size=chunk_size,
+                max_chunk_bytes=max_chunk_bytes,
+                max_in_flight=max_in_flight,
+                max_chunk_retries=max_chunk_retries,
+                batcher=batcher
+            )
+        embeddings = [prepare_embedding(emb) for emb in embeddings]
         payload = {
             "collection_name": collection_name,
             "embeddings": embeddings
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/batch_insert_embeddings"
-        response = requests.put(url, json=payload, headers=headers)
-        response_data = response.json()
+        response = self._request("PUT", "/batch_insert_embeddings", payload)
+        self._invalidate(collection_name)
+        response_data = self._decode(response)
         if response.status_code == 200:
             return response_data
         else:
             raise Exception(f"Failed to insert embedding: {response_data}")
 
+    def _send_chunk(
+        self,
+        collection_name: str,
+        parts: List[bytes],
+        max_chunk_retries: int
+    ) -> Tuple[bool, int, Optional[str]]:
+        """
+        Upload one serialized chunk, retrying 429 and 5xx responses the session does not.
+
+        Connection errors and 502/503/504 responses are retried by the session's
+        urllib3 `Retry`, so they are resent here only when `max_retries` is 0.
+
+        Returns:
+            Tuple[bool, int, Optional[str]]: Whether the chunk succeeded, the number of
+                retries used by the session and here, and the last error message.
+        """
+        session_retries = bool(self._session_retry.total)
+        retried_statuses = self._session_retry.status_forcelist if session_retries else ()
+        body = chunk_body(collection_name, parts)
+        error = None
+        retries = 0
+        for attempt in range(max_chunk_retries + 1):
+            if attempt:
+                retries += 1
+                time.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+            try:
+                response = self._request("PUT", "/batch_insert_embeddings", data=body)
+            except requests.RequestException as e:
+                error = str(e)
+                if session_retries:
+                    break
+                continue
+            history = getattr(getattr(response.raw, "retries", None), "history", None)
+            retries += len(history) if history else 0
+            if response.status_code == 200:
+                return True, retries, None
+            error = f"Failed to insert embedding: {response.text}"
+            if response.status_code in retried_statuses or (response.status_code != 429 and response.status_code < 500):
+                break
+        return False, retries, error
+
+    def _chunked_batch_insert(
+        self,
+        collection_name: str,
+        embeddings: Iterable[Dict[str, Any]],
+        chunk_size: Optional[int],
+        max_chunk_bytes: Optional[int],
+        max_in_flight: int,
+        max_chunk_retries: int,
+        batcher: Optional[AdaptiveBatcher] = None
+    ) -> BatchInsertReport:
+        """
+        Upload embeddings chunk by chunk with a bounded number of chunks in flight.
+
+        With a batcher, chunks are cut at its current size and each chunk's outcome
+        is fed back to it; its decisions are published as gauges when the
+        instrumentation supports them.
+        """
+        report = BatchInsertReport()
+        lock = threading.Lock()
+        in_flight = threading.BoundedSemaphore(max_in_flight)
+        start = time.perf_counter()
+        if batcher is not None:
+            max_chunk_bytes = max_chunk_bytes or batcher.max_chunk_bytes
+            cut_at = [batcher.chunk_size]
+
+            def chunk_size() -> int:
+                # Remembered so each chunk is reported with the size it was cut at.
+                cut_at[0] = batcher.chunk_size
+                return cut_at[0]
+
+        def upload(ids: List[str], parts: List[bytes], size: int, nbytes: int) -> None:
+            send_start = time.perf_counter()
+            try:
+                try:
+                    ok, retries, error = self._send_chunk(collection_name, parts, max_chunk_retries)
+                except Exception as e:
+                    ok, retries, error = False, 0, str(e)
+                if batcher is not None:
+                    batcher.record(size, len(ids), nbytes, time.perf_counter() - send_start, ok, retries)
+                    self.publish_batcher(batcher)
+            finally:
+                in_flight.release()
+            with lock:
+                report.retries += retries
+                if ok:
+                    report.inserted += len(ids)
+                else:
+                    report.failed_chunks += 1
+                    report.failed_ids.extend(ids)
+                    report.errors.append(error)
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for ids, parts in iter_chunks(embeddings, chunk_size, max_chunk_bytes, self.serializer.dumps):
+                size = cut_at[0] if batcher is not None else len(ids)
+                nbytes = sum(len(part) for part in parts)
+                in_flight.acquire()
+                report.chunks += 1
+                report.bytes_sent += nbytes
+                report.chunk_sizes.append(len(ids))
+                executor.submit(upload, ids, parts, size, nbytes)
+        self._invalidate(collection_name)
+        report.elapsed = time.perf_counter() - start
+        if batcher is not None:
+            report.adaptive = batcher.snapshot()
+        return report
+
+    def publish_batcher(self, batcher: AdaptiveBatcher) -> None:
+        """
+        Export an adaptive batcher's chunk size and decision counts as gauges.
+
+        `batch_insert_embeddings` does this after each adaptive chunk; callers that
+        drive a batcher themselves, such as an ingest pipeline, call it after `record`.
+        Does nothing unless the client's instrumentation has a `set_gauge` method.
+
+        Args:
+            batcher (AdaptiveBatcher): The batcher whose current state to export.
+        """
+        set_gauge = getattr(self.instrumentation, "set_gauge", None)
+        if set_gauge is None:
+            return
+        stats = batcher.snapshot()
+        set_gauge("batch_chunk_size", stats.chunk_size)
+        set_gauge("batch_chunk_latency_seconds", stats.latency)
+        set_gauge("batch_chunk_bytes_per_item", stats.bytes_per_item)
+        for decision in ("increase", "decrease", "hold"):
+            set_gauge("batch_chunk_decisions", getattr(stats, decision + "s"), decision=decision)
+
     def get_embeddings(
         self, 
-        collection_name: str
-    ) -> List[Dict[str, Any]]:
+        collection_name: str,
+        as_numpy: bool = False
+    ) -> Union[List[Dict[str, Any]], EmbeddingArrays]:
         """
         Retrieve embeddings from a collection.
 
         Args:
             collection_name (str): The name of the collection to retrieve embeddings from.
+            as_numpy (bool): Whether to return the embeddings as columns, with the
+                vectors in a 2-D float32 NumPy array.
 
         Returns:
-            List[Dict[str, Any]]: A list of dictionaries representing the retrieved embeddings.
+            Union[List[Dict[str, Any]], EmbeddingArrays]: A list of dictionaries representing
+                the retrieved embeddings, or their columns when `as_numpy` is set.
         """
         payload = {
             "collection_name": collection_name
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/get_embeddings"
-        response = requests.get(url, json=payload, headers=headers)
+        response = self._request("GET", "/get_embeddings", payload)
 
-        response_data = response.json()
+        response_data = self._decode(response)
         if response.status_code == 200:
-            return response_data
+            self._decode_vectors(response_data)
+            return to_arrays(response_data) if as_numpy else response_data
         else:
             return response_data
         
+    def iter_embeddings(
+        self,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        chunk_size: int = 65536
+    ) -> Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Stream embeddings from a collection without loading the whole response.
+
+        The response body is decoded incrementally as it downloads, so peak memory
+        is bounded by `chunk_size` plus the embeddings being yielded, regardless of
+        the collection size.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve embeddings from.
+            batch_size (Optional[int]): Yield lists of up to this many embeddings
+                instead of one embedding at a time.
+            chunk_size (int): The number of bytes read from the network at a time.
+
+        Yields:
+            Union[Dict[str, Any], List[Dict[str, Any]]]: Each embedding, or each batch
+                of embeddings when `batch_size` is set.
+        """
+        payload = {
+            "collection_name": collection_name
+        }
+        with self._request("GET", "/get_embeddings", payload, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(f"Failed to get embeddings: {response.text}")
+            embeddings = iter_json_array(
+                response.iter_content(chunk_size=chunk_size),
+                loads=self.serializer.loads
+            )
+            if batch_size:
+                for batch in batched(embeddings, batch_size):
+                    self._decode_vectors(batch)
+                    yield batch
+            elif self.quantization is not None:
+                for embedding in embeddings:
+                    self._decode_vectors([embedding])
+                    yield embedding
+            else:
+                yield from embeddings
+
+    def export_collection(
+        self,
+        collection_name: str,
+        path: str,
+        distance: Optional[str] = None,
+        batch_size: int = 1024
+    ) -> int:
+        """
+        Stream a collection to a compact binary file.
+
+        The file holds the vectors as one float32 block, the ids and metadata as
+        columns, and a header with the collection's name, dimension and distance;
+        see `memvectordb.bulk`. Embeddings are written as they are downloaded, so
+        memory use does not grow with the vectors.
+
+        Args:
+            collection_name (str): The name of the collection to export.
+            path (str): The file to write.
+            distance (Optional[str]): The collection's distance metric. When None it is
+                read from the head of the `/get_collection` response, which is closed
+                before the embeddings download.
+            batch_size (int): The number of embeddings written at a time.
+
+        Returns:
+            int: The number of embeddings exported.
+        """
+        from .bulk import write_collection_file
+
+        dimension = None
+        if distance is None:
+            info = self.get_collection_info(collection_name)
+            distance, dimension = info["distance"], info["dimension"]
+        return write_collection_file(
+            path,
+            self.iter_embeddings(collection_name, batch_size=batch_size),
+            collection_name,
+            distance,
+            dimension,
+            dumps=self.serializer.dumps
+        )
+
+    def get_collection_info(self, collection_name: str) -> Dict[str, Any]:
+        """
+        Get a collection's dimension and distance without downloading its embeddings.
+
+        Only the start of the `/get_collection` response is read. If the server sends
+        the fields after the embeddings, the full response is loaded instead.
+
+        Args:
+            collection_name (str): The name of the collection.
+
+        Returns:
+            Dict[str, Any]: The collection's fields other than "embeddings".
+        """
+        payload = {
+            "collection_name": collection_name
+        }
+        with self._request("GET", "/get_collection", payload, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(f"Failed to get collection: {response.text}")
+            info = read_json_header(response.iter_content(chunk_size=4096), "embeddings", self.serializer.loads)
+        if "distance" not in info or "dimension" not in info:
+            info = self.get_collection(collection_name)
+            if "distance" not in info:
+                raise Exception(f"Failed to get collection: {info}")
+        return info
+
+    def import_collection(
+        self,
+        path: str,
+        collection_name: Optional[str] = None,
+        create: bool = True,
+        chunk_size: int = 1000,
+        max_in_flight: int = 4
+    ) -> BatchInsertReport:
+        """
+        Upload a file written by `export_collection`.
+
+        The vectors are memory-mapped and uploaded in chunks with up to
+        `max_in_flight` requests at once, as with `batch_insert_embeddings`.
+
+        Args:
+            path (str): The file to read.
+            collection_name (Optional[str]): The collection to import into. Defaults to
+                the name recorded in the file.
+            create (bool): Whether to create the collection with the file's dimension
+                and distance first. An existing collection is reused.
+            chunk_size (int): The number of embeddings per request.
+            max_in_flight (int): The maximum number of requests in flight at once.
+
+        Returns:
+            BatchInsertReport: The outcome of the upload.
+        """
+        from .bulk import read_collection_file
+
+        archive = read_collection_file(path, loads=self.serializer.loads)
+        collection_name = collection_name or archive.collection_name
+        if create:
+            self.create_collection(collection_name, archive.dimension, archive.distance)
+        return self.batch_insert_embeddings(
+            collection_name,
+            ids=archive.ids,
+            vectors=archive.vectors,
+            metadata=archive.metadata,
+            chunk_size=chunk_size,
+            max_in_flight=max_in_flight
+        )
+
     def query(
         self,
         k: int,
         collection_name: str,
-        query_vector: List[float]
-    ) -> List[Dict[str, Any]]:
+        query_vector: Union[List[float], Any],
+        as_numpy: bool = False,
+        rerank: Optional[Union[str, Reranker]] = None,
+        filter: Optional[MetadataFilter] = None
+    ) -> Union[List[Dict[str, Any]], EmbeddingArrays]:
         """
         Retrieve similar embeddings from a collection based on a query vector.
 
+        With `filter`, only embeddings whose metadata matches are returned. The filter
+        is sent to the server, and the results are checked on the client. If the
+        server does not apply it, more results are fetched until k matches are found
+        or the collection is exhausted; `filter_stats` tracks how much was over-fetched.
+        Filtered queries bypass the query cache.
+
+        With `rerank`, more candidates are fetched from the server in the same single
+        request and re-ranked on the client with NumPy; see `Reranker`.
+
         Args:
             k (int): The number of similar embeddings to retrieve.
             collection_name (str): The name of the collection to retrieve embeddings from.
-            query_vector (List[float]): The query vector for similarity search.
+            query_vector (Union[List[float], numpy.ndarray]): The query vector for similarity
+                search, as a list, a 1-D NumPy array or a buffer of floats.
+            as_numpy (bool): Whether to return the results as columns, with the vectors
+                and scores in float32 NumPy arrays.
+            rerank (Optional[Union[str, Reranker]]): A `Reranker`, or a metric name
+                ("cosine", "dot" or "euclidean") to re-rank by that metric alone.
+            filter (Optional[MetadataFilter]): A metadata filter, e.g. {"lang": "en"},
+                {"lang": ["en", "fr"]} or {"path": {"$prefix": "docs/"}}; see `compile_filter`.
 
         Returns:
-            List[Dict[str, Any]]: A list of dictionaries representing the similar embeddings.
+            Union[List[Dict[str, Any]], EmbeddingArrays]: A list of dictionaries representing
+                the similar embeddings, or their columns when `as_numpy` is set.
         """
+        query_vector = as_vector(query_vector)
+        if rerank is not None:
+            rerank = as_reranker(rerank)
+            response_data = self.query(rerank.candidates(k), collection_name, query_vector, filter=filter)
+            if not isinstance(response_data, list):
+                return response_data
+            response_data = rerank.rerank(response_data, self._local_vector(query_vector), k)
+            return to_arrays(response_data) if as_numpy else response_data
+        if self.quantization is not None:
+            query_vector = self.quantization.encode(query_vector)
+        if filter is not None:
+            response_data = self._filtered_query(k, collection_name, query_vector, filter)
+            if not isinstance(response_data, list):
+                return response_data
+            return to_arrays(response_data) if as_numpy else response_data
+        if self.query_cache is not None:
+            cached = self.query_cache.get(collection_name, k, query_vector)
+            if cached is not None:
+                return to_arrays(cached) if as_numpy else cached
+            generation = self.query_cache.generation(collection_name)
         payload = {
             "collection_name": collection_name,
             "query_vector": query_vector,
             "k": k
         }
-        headers = {"Content-Type": "application/json"}
-        url = f"{self.base_url}/get_similarity"
-        response = requests.get(url, json=payload, headers=headers)
+        response = self._request("GET", "/get_similarity", payload)
 
-        response_data = response.json()
+        response_data = self._decode(response)
         if response.status_code == 200:
-            return response_data
+            self._decode_vectors(response_data)
+            if self.query_cache is not None:
+                self.query_cache.put(collection_name, k, query_vector, response_data, generation)
+            return to_arrays(response_data) if as_numpy else response_data
         else:
             return response_data
+
+    def _filtered_query(
+        self,
+        k: int,
+        collection_name: str,
+        query_vector: Any,
+        where: MetadataFilter
+    ) -> Union[List[Dict[str, Any]], Any]:
+        """
+        Answer a filtered query, over-fetching adaptively when the server ignores the filter.
+
+        The first request asks for k results when the server is known or assumed to
+        filter, and otherwise for k times the over-fetch ratio last observed for the
+        same filter on the collection, plus a 20% margin. Each further request grows the fetch size by the observed
+        selectivity, until k matches are found, the collection runs out of results,
+        or MAX_FILTER_FETCH is reached.
+        """
+        predicate = compile_filter(where)
+        send_filter = isinstance(where, dict) and self._server_filter_supported is not False
+        ratio_key = (collection_name, repr(where))
+        fetch = k if send_filter else max(k, math.ceil(k * self._filter_ratios.get(ratio_key, 2.0) * 1.2))
+        fetch = min(fetch, MAX_FILTER_FETCH)
+        requests_sent = fetched = 0
+        while True:
+            payload = {
+                "collection_name": collection_name,
+                "query_vector": query_vector,
+                "k": fetch
+            }
+            if send_filter:
+                payload["filter"] = where
+            response = self._request("GET", "/get_similarity", payload)
+            response_data = self._decode(response)
+            if response.status_code in (400, 422) and send_filter:
+                # A server that rejects the field rather than ignoring it: retry
+                # without it, and keep filtering client-side if that succeeds.
+                requests_sent += 1
+                del payload["filter"]
+                fetch = min(MAX_FILTER_FETCH, max(k, math.ceil(k * self._filter_ratios.get(ratio_key, 2.0) * 1.2)))
+                payload["k"] = fetch
+                response = self._request("GET", "/get_similarity", payload)
+                response_data = self._decode(response)
+                if response.status_code == 200:
+                    self._server_filter_supported = False
+                    send_filter = False
+            if response.status_code != 200:
+                return response_data
+            requests_sent += 1
+            fetched += len(response_data)
+            matched = [item for item in response_data if predicate(item["embedding"].get("metadata"))]
+            if send_filter and len(matched) < len(response_data):
+                self._server_filter_supported = False
+                send_filter = False
+            if len(matched) >= k or len(response_data) < fetch or fetch >= MAX_FILTER_FETCH:
+                break
+            ratio = len(response_data) / len(matched) if matched else 4.0 * fetch / k
+            fetch = min(MAX_FILTER_FETCH, max(2 * fetch, math.ceil(k * ratio * 1.2)))
+        if not send_filter and matched:
+            if len(self._filter_ratios) >= 1024:
+                self._filter_ratios.clear()
+            self._filter_ratios[ratio_key] = max(1.0, len(response_data) / len(matched))
+        results = matched[:k]
+        self._decode_vectors(results)
+        with self._stats_lock:
+            self.filter_stats.queries += 1
+            self.filter_stats.requests += requests_sent
+            self.filter_stats.fetched += fetched
+            self.filter_stats.returned += len(results)
+            if send_filter and requests_sent == 1:
+                self.filter_stats.server_filtered += 1
+        return results
+
+    def _batch_query(
+        self,
+        k: int,
+        collection_name: str,
+        query_vectors: List[List[float]]
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Try to answer all queries with one request to `/batch_get_similarity`.
+
+        Returns None, and remembers not to try again, if the server does not
+        expose the endpoint. Queries answered by the query cache are not sent.
+        """
+        results: List[Any] = [None] * len(query_vectors)
+        if self.query_cache is not None:
+            generation = self.query_cache.generation(collection_name)
+            results = [self.query_cache.get(collection_name, k, vector) for vector in query_vectors]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        payload = {
+            "collection_name": collection_name,
+            "query_vectors": [query_vectors[i] for i in missing],
+            "k": k
+        }
+        response = self._request("GET", "/batch_get_similarity", payload)
+        if response.status_code in (404, 405, 501):
+            self._batch_query_supported = False
+            return None
+        response_data = self._decode(response)
+        if response.status_code == 200 and isinstance(response_data, list) \
+                and len(response_data) == len(missing):
+            self._batch_query_supported = True
+            for i, result in zip(missing, response_data):
+                self._decode_vectors(result)
+                results[i] = result
+                if self.query_cache is not None:
+                    self.query_cache.put(collection_name, k, query_vectors[i], result, generation)
+            return results
+        return None
+
+    def query_many(
+        self,
+        k: int,
+        collection_name: str,
+        query_vectors: Union[Sequence[List[float]], Any],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = True,
+        as_numpy: bool = False,
+        rerank: Optional[Union[str, Reranker]] = None,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[Union[List[Dict[str, Any]], EmbeddingArrays, Exception]]:
+        """
+        Retrieve similar embeddings for many query vectors at once.
+
+        A single `/batch_get_similarity` request is used when the server supports it.
+        Otherwise the queries are sent concurrently over the pooled session.
+
+        Args:
+            k (int): The number of similar embeddings to retrieve per query.
+            collection_name (str): The name of the collection to retrieve embeddings from.
+            query_vectors (Union[Sequence[List[float]], numpy.ndarray]): A list of query
+                vectors or a 2-D NumPy array with one query per row.
+            concurrency (Optional[int]): The maximum number of queries in flight at once.
+                Defaults to the connection pool size.
+            return_exceptions (bool): Whether a failed query puts its exception in its
+                slot of the results instead of raising.
+            as_numpy (bool): Whether to return each query's results as columns, as for `query`.
+            rerank (Optional[Union[str, Reranker]]): Re-rank each query's results, as for `query`.
+            filter (Optional[MetadataFilter]): Filter each query's results, as for `query`.
+                Filtered queries are always sent one by one.
+
+        Returns:
+            List[Union[List[Dict[str, Any]], EmbeddingArrays, Exception]]: The results of each
+                query, in input order.
+        """
+        query_vectors = list(iter_vectors(query_vectors))
+        if not query_vectors:
+            return []
+        if rerank is not None:
+            rerank = as_reranker(rerank)
+        if len(query_vectors) > 1 and self._batch_query_supported is not False and filter is None:
+            try:
+                results = self._batch_query(
+                    rerank.candidates(k) if rerank is not None else k,
+                    collection_name,
+                    [self._encode_vector(vector) for vector in query_vectors]
+                    if self.quantization is not None else query_vectors
+                )
+            except (requests.RequestException, ValueError):
+                results = None
+            if results is not None:
+                if rerank is not None:
+                    results = [
+                        rerank.rerank(result, self._local_vector(query_vector), k)
+                        if isinstance(result, list) else result
+                        for result, query_vector in zip(results, query_vectors)
+                    ]
+                return many_to_arrays(results) if as_numpy else results
+
+        options = {}
+        if rerank is not None:
+            options["rerank"] = rerank
+        if filter is not None:
+            options["filter"] = filter
+
+        def run(query_vector: List[float]) -> Union[List[Dict[str, Any]], Exception]:
+            try:
+                return self.query(k, collection_name, query_vector, **options)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        max_workers = min(concurrency or self.pool_maxsize, len(query_vectors))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run, query_vectors))
+        return many_to_arrays(results) if as_numpy else results
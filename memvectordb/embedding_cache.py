@@ -0,0 +1,271 @@
+import hashlib
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """
+    Hit and miss counters of an `EmbeddingCache`.
+
+    Attributes:
+        hits (int): Lookups answered from memory or disk.
+        misses (int): Lookups that had to call the embedding model.
+        disk_hits (int): The subset of hits answered from the on-disk store.
+        evictions (int): Entries evicted from memory or disk to respect the size limits.
+    """
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+STORAGE_FORMATS = ("float32", "float16")
+
+
+def _to_bytes(vector: Any, storage: str = "float32") -> bytes:
+    if storage == "float16":
+        if hasattr(vector, "astype"):
+            return vector.astype("<f2").tobytes()
+        return struct.pack(f"<{len(vector)}e", *vector)
+    if hasattr(vector, "astype"):
+        return vector.astype("float32").tobytes()
+    return array("f", vector).tobytes()
+
+
+def _from_bytes(data: bytes, storage: str = "float32") -> List[float]:
+    if storage == "float16":
+        return list(struct.unpack(f"<{len(data) // 2}e", data))
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    Embedding cache keyed by (provider, model, SHA-256 of the text).
+
+    Entries are kept in an in-memory LRU and, when `path` is given, in an SQLite
+    database so they survive restarts. Vectors are stored on disk as float32, or
+    as float16 with `storage="float16"`, which halves the file at the cost of
+    about three significant digits per component. The format is recorded in the
+    database, and reopening it with a different one raises ValueError.
+
+    Args:
+        max_items (int): The maximum number of embeddings kept in memory.
+        path (Optional[str]): The SQLite file for the on-disk store. None keeps the cache in memory only.
+        max_disk_items (Optional[int]): The maximum number of embeddings kept on disk;
+            the least recently used are evicted first. None means unbounded.
+        storage (str): "float32" or "float16", the on-disk format of the vectors.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 100_000,
+        path: Optional[str] = None,
+        max_disk_items: Optional[int] = None,
+        storage: str = "float32"
+    ) -> None:
+        if storage not in STORAGE_FORMATS:
+            raise ValueError(f"Unsupported storage: {storage}")
+        self.max_items = max_items
+        self.storage = storage
+        self.max_disk_items = max_disk_items
+        self.stats = EmbeddingCacheStats()
+        self.memory: "OrderedDict[str, Any]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            # Files written before the setting existed hold float32 vectors.
+            self.db.execute(
+                "INSERT OR IGNORE INTO settings (name, value) VALUES ('storage', "
+                "CASE WHEN EXISTS (SELECT 1 FROM embeddings) THEN 'float32' ELSE ? END)", (storage,)
+            )
+            self.db.commit()
+            stored = self.db.execute("SELECT value FROM settings WHERE name = 'storage'").fetchone()[0]
+            if stored != storage:
+                self.db.close()
+                raise ValueError(f"{path} stores {stored} vectors, not {storage}")
+
+    @staticmethod
+    def key(
+        provider: str,
+        model: str,
+        text: str
+    ) -> str:
+        """
+        Build the cache key for a text embedded by a given provider and model.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{provider}:{model}:{digest}"
+
+    def get_many(
+        self,
+        provider: str,
+        model: str,
+        texts: Sequence[str]
+    ) -> List[Optional[Any]]:
+        """
+        Look up the embeddings of many texts.
+
+        Args:
+            provider (str): The embedding provider.
+            model (str): The embedding model.
+            texts (Sequence[str]): The texts to look up.
+
+        Returns:
+            List[Optional[Any]]: The cached embedding of each text, or None on a miss.
+        """
+        keys = [self.key(provider, model, text) for text in texts]
+        results: List[Optional[Any]] = [None] * len(keys)
+        with self.lock:
+            missing = {}
+            for i, key in enumerate(keys):
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    results[i] = self.memory[key]
+                else:
+                    missing.setdefault(key, []).append(i)
+            if missing and self.db is not None:
+                found = self._disk_get(list(missing))
+                for key, vector in found.items():
+                    for i in missing.pop(key):
+                        results[i] = vector
+                        self.stats.disk_hits += 1
+                    self._memory_put(key, vector)
+            misses = sum(len(indexes) for indexes in missing.values())
+            self.stats.misses += misses
+            self.stats.hits += len(keys) - misses
+        return results
+
+    def get(
+        self,
+        provider: str,
+        model: str,
+        text: str
+    ) -> Optional[Any]:
+        """
+        Look up the embedding of a single text, returning None on a miss.
+        """
+        return self.get_many(provider, model, [text])[0]
+
+    def put_many(
+        self,
+        provider: str,
+        model: str,
+        texts: Sequence[str],
+        vectors: Sequence[Any]
+    ) -> None:
+        """
+        Store the embeddings of many texts.
+
+        Args:
+            provider (str): The embedding provider.
+            model (str): The embedding model.
+            texts (Sequence[str]): The embedded texts.
+            vectors (Sequence[Any]): The embedding of each text.
+        """
+        keys = [self.key(provider, model, text) for text in texts]
+        with self.lock:
+            for key, vector in zip(keys, vectors):
+                self._memory_put(key, vector)
+            if self.db is not None:
+                now = time.time()
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    [(key, _to_bytes(vector, self.storage), now) for key, vector in zip(keys, vectors)]
+                )
+                self._disk_evict()
+                self.db.commit()
+
+    def put(
+        self,
+        provider: str,
+        model: str,
+        text: str,
+        vector: Any
+    ) -> None:
+        """
+        Store the embedding of a single text.
+        """
+        self.put_many(provider, model, [text], [vector])
+
+    def __len__(self) -> int:
+        with self.lock:
+            if self.db is not None:
+                return self.db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return len(self.memory)
+
+    def clear(self) -> None:
+        """
+        Remove every entry from memory and disk.
+        """
+        with self.lock:
+            self.memory.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM embeddings")
+                self.db.commit()
+
+    def close(self) -> None:
+        """
+        Close the on-disk store.
+        """
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+    def _memory_put(self, key: str, vector: Any) -> None:
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _disk_get(self, keys: List[str]) -> dict:
+        found = {}
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.db.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            found.update((key, _from_bytes(vector, self.storage)) for key, vector in rows)
+        if found:
+            now = time.time()
+            self.db.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self.db.commit()
+        return found
+
+    def _disk_evict(self) -> None:
+        if self.max_disk_items is None:
+            return
+        count = self.db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = count - self.max_disk_items
+        if excess > 0:
+            self.db.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used ASC, rowid ASC LIMIT ?)", (excess,)
+            )
+            self.stats.evictions += excess
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+
+MetadataFilter = Union[Dict[str, Any], Callable[[Dict[str, str]], bool]]
+
+_OPERATORS = ("$eq", "$in", "$prefix")
+
+
+@dataclass
+class FilterStats:
+    """
+    Counters of filtered queries, to tune how much is over-fetched.
+
+    Attributes:
+        queries (int): The number of filtered queries.
+        requests (int): The number of similarity requests they sent.
+        fetched (int): The number of results downloaded.
+        returned (int): The number of results that matched and were returned.
+        server_filtered (int): Queries answered by a single request with the filter sent to the server.
+    """
+    queries: int = 0
+    requests: int = 0
+    fetched: int = 0
+    returned: int = 0
+    server_filtered: int = 0
+
+    @property
+    def overfetch_ratio(self) -> float:
+        """Results downloaded per result returned; 1.0 means nothing was wasted."""
+        return self.fetched / self.returned if self.returned else 0.0
+
+    @property
+    def requests_per_query(self) -> float:
+        """The average number of requests per filtered query."""
+        return self.requests / self.queries if self.queries else 0.0
+
+
+def _compile_condition(key: str, condition: Any) -> List[Tuple[str, str, Any]]:
+    if isinstance(condition, dict):
+        checks = []
+        for operator, operand in condition.items():
+            if operator not in _OPERATORS:
+                raise ValueError(f"Unsupported filter operator {operator!r} for key {key!r}")
+            if operator == "$eq":
+                checks.append((key, "eq", str(operand)))
+            elif operator == "$in":
+                checks.append((key, "in", frozenset(str(value) for value in operand)))
+            else:
+                checks.append((key, "prefix", str(operand)))
+        return checks
+    if isinstance(condition, (list, tuple, set, frozenset)):
+        return [(key, "in", frozenset(str(value) for value in condition))]
+    return [(key, "eq", str(condition))]
+
+
+def compile_filter(where: MetadataFilter) -> Callable[[Optional[Dict[str, str]]], bool]:
+    """
+    Turn a metadata filter into a predicate on an embedding's metadata.
+
+    A dict filter maps metadata keys to a condition, and every condition must hold:
+
+    * a value: the metadata value equals it, e.g. {"lang": "en"};
+    * a list, tuple or set: the value is one of them, e.g. {"lang": ["en", "fr"]};
+    * an operator dict: {"$eq": value}, {"$in": [values]} or {"$prefix": "docs/"}.
+
+    Values are compared as strings, as metadata is stored stringified. Sets of
+    allowed values are built once here rather than per embedding. A callable
+    filter is called with the metadata dict (empty when there is none).
+
+    Args:
+        where (MetadataFilter): The filter.
+
+    Returns:
+        Callable[[Optional[Dict[str, str]]], bool]: Whether an embedding's metadata matches.
+    """
+    if callable(where):
+        return lambda metadata: bool(where(metadata or {}))
+    checks = [check for key, condition in where.items() for check in _compile_condition(key, condition)]
+
+    def predicate(metadata: Optional[Dict[str, str]]) -> bool:
+        if not metadata:
+            return not checks
+        for key, operator, operand in checks:
+            value = metadata.get(key)
+            if value is None:
+                return False
+            value = str(value)
+            if operator == "eq":
+                if value != operand:
+                    return False
+            elif operator == "in":
+                if value not in operand:
+                    return False
+            elif not value.startswith(operand):
+                return False
+        return True
+
+    return predicate
+
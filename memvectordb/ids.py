@@ -0,0 +1,139 @@
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Container, Iterable, Iterator, Optional, Set
+
+
+def content_id(content: str, source: Optional[str] = None) -> str:
+    """
+    Derive a stable vector id from a piece of content and where it came from.
+
+    The same (source, content) pair always gets the same id, so re-ingesting it
+    overwrites the stored vector instead of adding a duplicate.
+
+    Args:
+        content (str): The text that is embedded.
+        source (Optional[str]): Where the text came from, e.g. a file path or URL.
+
+    Returns:
+        str: A 32-character hexadecimal BLAKE2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((source or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def document_id(document: Any) -> str:
+    """
+    The `content_id` of a document, using its "source" metadata as the source.
+    """
+    source = (document.metadata or {}).get("source")
+    return content_id(document.page_content, str(source) if source is not None else None)
+
+
+class IdLedger:
+    """
+    An append-only file of the ids known to be stored in one collection.
+
+    Ids are added as their uploads succeed, one per line, so the ledger survives
+    a crash and lets a later run skip the documents already ingested without
+    asking the server.
+
+    Args:
+        path (str): The ledger file, created on first write.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.ids: Set[str] = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._valid_bytes = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    # A line cut short by a crash has no newline; it is ignored and overwritten.
+                    if not line.endswith(b"\n"):
+                        break
+                    self.ids.add(line[:-1].decode("utf-8"))
+                    self._valid_bytes += len(line)
+
+    def __contains__(self, vector_id: object) -> bool:
+        return vector_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: Iterable[str]) -> None:
+        """
+        Record ids as stored, writing the new ones to the file.
+        """
+        with self._lock:
+            new = [vector_id for vector_id in ids if vector_id not in self.ids]
+            if not new:
+                return
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+                self._file.truncate(self._valid_bytes)
+            self._file.write("".join(f"{vector_id}\n" for vector_id in new))
+            self._file.flush()
+            self.ids.update(new)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "IdLedger":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SkipCounter:
+    """Counts the documents dropped by `unique_documents`."""
+
+    def __init__(self) -> None:
+        self.duplicates = 0
+        self.existing = 0
+
+    @property
+    def skipped(self) -> int:
+        return self.duplicates + self.existing
+
+
+def unique_documents(
+    documents: Iterable[Any],
+    make_id: Callable[[Any], str] = document_id,
+    existing: Container[str] = frozenset(),
+    counter: Optional[SkipCounter] = None
+) -> Iterator[Any]:
+    """
+    Lazily drop documents whose id was already seen in the input or is in `existing`.
+
+    Args:
+        documents (Iterable[Any]): Documents with `page_content` and `metadata`.
+        make_id (Callable[[Any], str]): Derives a document's id.
+        existing (Container[str]): The ids already stored.
+        counter (Optional[SkipCounter]): Incremented for each document dropped.
+
+    Yields:
+        Any: The documents to ingest, in input order.
+    """
+    seen: Set[str] = set()
+    for document in documents:
+        vector_id = make_id(document)
+        if vector_id in seen:
+            if counter is not None:
+                counter.duplicates += 1
+            continue
+        seen.add(vector_id)
+        if vector_id in existing:
+            if counter is not None:
+                counter.existing += 1
+            continue
+        yield document
@@ -0,0 +1,528 @@
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from .batching import AdaptiveBatchStats
+from .streaming import batched
+
+_DONE = object()
+
+
+def random_id(page: Any) -> str:
+    """The default vector id of a document: a random UUID."""
+    return str(uuid.uuid4())
+
+
+@dataclass
+class IngestFailure:
+    """
+    A document that could not be ingested.
+
+    Attributes:
+        index (int): The position of the document in the input.
+        stage (str): "embed" or "upload".
+        error (str): What went wrong.
+        vector_id (Optional[str]): The id the document would have been stored under, once assigned.
+    """
+    index: int
+    stage: str
+    error: str
+    vector_id: Optional[str] = None
+
+
+@dataclass
+class IngestReport:
+    """
+    Progress and throughput of a document ingest.
+
+    Attributes:
+        documents (int): The number of documents read so far.
+        inserted (int): The number of documents uploaded successfully.
+        embedded (int): The number of documents embedded.
+        failed (int): The number of documents that failed to embed or upload.
+        skipped (int): The number of documents skipped as duplicates or as already stored.
+        batches (int): The number of batches completed, successfully or not.
+        inserted_ids (List[str]): The vector ids of the uploaded documents.
+        errors (List[str]): One message per failed batch or document.
+        failures (List[IngestFailure]): One entry per failed document, with its position in the input.
+        embed_seconds (float): Time spent in embedding calls, summed over workers.
+        upload_seconds (float): Time spent serializing and uploading, summed over workers.
+        elapsed (float): Wall-clock seconds since the ingest started.
+        adaptive (Optional[AdaptiveBatchStats]): The adaptive batcher's state after the
+            ingest, when one sized the batches.
+    """
+    documents: int = 0
+    inserted: int = 0
+    embedded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    batches: int = 0
+    inserted_ids: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    failures: List[IngestFailure] = field(default_factory=list)
+    embed_seconds: float = 0.0
+    upload_seconds: float = 0.0
+    elapsed: float = 0.0
+    adaptive: Optional[AdaptiveBatchStats] = None
+
+    @property
+    def throughput(self) -> float:
+        """Documents inserted per second of wall-clock time."""
+        return self.inserted / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def embed_rate(self) -> float:
+        """Documents embedded per second spent embedding."""
+        return self.embedded / self.embed_seconds if self.embed_seconds else 0.0
+
+    @property
+    def upload_rate(self) -> float:
+        """Documents inserted per second spent uploading."""
+        return self.inserted / self.upload_seconds if self.upload_seconds else 0.0
+
+    def summary(self) -> str:
+        """A one-line human readable summary of the ingest."""
+        return (
+            f"{self.inserted}/{self.documents} documents inserted, {self.failed} failed "
+            f"in {self.elapsed:.2f}s ({self.throughput:.1f} docs/s; "
+            f"embed {self.embed_seconds:.2f}s, upload {self.upload_seconds:.2f}s)"
+        )
+
+
+class _NullProgressBar:
+    """Stands in for a tqdm bar when progress is disabled or tqdm is not installed."""
+
+    def update(self, n: int = 1) -> None:
+        pass
+
+    def set_postfix(self, **kwargs: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def progress_bar(total: Optional[int] = None, desc: str = "Adding documents", enabled: bool = True) -> Any:
+    """
+    Create a tqdm progress bar, or a no-op bar when `enabled` is False or tqdm is not installed.
+    """
+    if enabled:
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            pass
+        else:
+            return tqdm(total=total, desc=desc, unit="doc")
+    return _NullProgressBar()
+
+
+def tqdm_progress(total: Optional[int] = None) -> Callable[[IngestReport, int], None]:
+    """
+    Build a progress callback that advances a tqdm bar and shows the throughput.
+
+    Args:
+        total (Optional[int]): The total number of documents, if known.
+
+    Returns:
+        Callable[[IngestReport, int], None]: A callback taking the report and the
+            number of documents just completed.
+    """
+    bar = progress_bar(total)
+
+    def progress(report: IngestReport, completed: int) -> None:
+        bar.update(completed)
+        bar.set_postfix(docs_per_s=f"{report.throughput:.1f}", failed=report.failed)
+        if total is not None and report.inserted + report.failed >= total:
+            bar.close()
+
+    return progress
+
+
+class IngestPipeline:
+    """
+    Producer/consumer pipeline that overlaps embedding with uploading.
+
+    Batches of documents are embedded on one pool of worker threads while
+    previously embedded batches are serialized and uploaded on another. Both
+    stages are connected by bounded queues, so a slow stage applies backpressure
+    instead of letting batches pile up in memory.
+
+    Args:
+        store (MemVectorDBVectorStore): The vector store providing `embed_batch` and the client.
+        collection_name (str): The name of the collection to insert into.
+        embedding_model_client: An instance of the embedding model client.
+        batch_size (int): The number of documents per embedding call and upload request.
+        embed_workers (int): The number of threads running embedding calls.
+        upload_workers (int): The number of threads serializing and uploading batches.
+        queue_size (int): The maximum number of batches waiting in front of each stage.
+        progress (Optional[Callable[[IngestReport, int], None]]): Called after each batch
+            with the report and the number of documents in the batch.
+        make_id (Callable[[Any], str]): Assigns each document its vector id. Defaults to a random UUID.
+        ledger (Optional[IdLedger]): Records the ids of uploaded batches.
+        batcher (Optional[AdaptiveBatcher]): Sets the number of documents in each batch
+            in place of `batch_size`, from the latency, errors and size of earlier uploads.
+            `batch_size` still bounds each embedding call.
+    """
+
+    def __init__(
+        self,
+        store,
+        collection_name: str,
+        embedding_model_client,
+        batch_size: int = 32,
+        embed_workers: int = 1,
+        upload_workers: int = 2,
+        queue_size: int = 4,
+        progress: Optional[Callable[[IngestReport, int], None]] = None,
+        make_id: Callable[[Any], str] = random_id,
+        ledger=None,
+        batcher=None
+    ) -> None:
+        self.store = store
+        self.collection_name = collection_name
+        self.embedding_model_client = embedding_model_client
+        self.batch_size = batch_size
+        self.embed_workers = embed_workers
+        self.upload_workers = upload_workers
+        self.queue_size = queue_size
+        self.progress = progress
+        self.make_id = make_id
+        self.ledger = ledger
+        self.batcher = batcher
+        self.lock = threading.Lock()
+        self.start = 0.0
+
+    def _finish_batch(
+        self,
+        report: IngestReport,
+        offset: int,
+        count: int,
+        ids: Optional[List[str]] = None,
+        error: Optional[str] = None,
+        stage: str = "upload",
+        failed_ids: Optional[Set[str]] = None
+    ) -> None:
+        with self.lock:
+            report.batches += 1
+            if failed_ids:
+                # Part of an upload failed: only the ids in its failed chunks are reported.
+                report.inserted_ids.extend(vector_id for vector_id in ids if vector_id not in failed_ids)
+                report.inserted += count - len(failed_ids)
+                report.failed += len(failed_ids)
+                report.errors.append(error)
+                report.failures.extend(
+                    IngestFailure(offset + i, stage, error, vector_id)
+                    for i, vector_id in enumerate(ids) if vector_id in failed_ids
+                )
+            elif error is None:
+                report.inserted += count
+                report.inserted_ids.extend(ids)
+            else:
+                report.failed += count
+                report.errors.append(error)
+                report.failures.extend(
+                    IngestFailure(offset + i, stage, error, ids[i] if ids else None) for i in range(count)
+                )
+            report.elapsed = time.perf_counter() - self.start
+            if self.progress is not None:
+                self.progress(report, count)
+
+    def _embed_worker(
+        self,
+        embed_queue: queue.Queue,
+        upload_queue: queue.Queue,
+        report: IngestReport
+    ) -> None:
+        while True:
+            item = embed_queue.get()
+            if item is _DONE:
+                return
+            offset, pages, size = item
+            # Any error fails this batch only; the worker must keep draining the queue.
+            try:
+                self._embed_batch(upload_queue, report, offset, pages, size)
+            except Exception as e:
+                self._finish_batch(report, offset, len(pages), error=f"Embedding failed: {e}", stage="embed")
+
+    def _embed_batch(
+        self,
+        upload_queue: queue.Queue,
+        report: IngestReport,
+        offset: int,
+        pages: List[Any],
+        size: int
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            vectors = self.store.embed_batch(
+                [page.page_content for page in pages],
+                self.embedding_model_client,
+                self.batch_size
+            )
+        finally:
+            with self.lock:
+                report.embed_seconds += time.perf_counter() - start
+        with self.lock:
+            report.embedded += len(pages)
+        embeddings = []
+        for page, vector in zip(pages, vectors):
+            metadata = dict(page.metadata or {})
+            metadata["text"] = page.page_content
+            embeddings.append({
+                "id": self.make_id(page),
+                "vector": vector,
+                "metadata": metadata
+            })
+        upload_queue.put((offset, embeddings, size))
+
+    def _upload_worker(
+        self,
+        upload_queue: queue.Queue,
+        report: IngestReport
+    ) -> None:
+        while True:
+            item = upload_queue.get()
+            if item is _DONE:
+                return
+            offset, embeddings, size = item
+            ids = [embedding["id"] for embedding in embeddings]
+            try:
+                failed_ids, error = self._upload_batch(report, ids, embeddings, size)
+            except Exception as e:
+                failed_ids, error = set(), f"Upload failed: {e}"
+            self._finish_batch(report, offset, len(embeddings), ids=ids, error=error, failed_ids=failed_ids)
+
+    def _upload_batch(
+        self,
+        report: IngestReport,
+        ids: List[str],
+        embeddings: List[Dict[str, Any]],
+        size: int
+    ) -> Tuple[Set[str], Optional[str]]:
+        """
+        Upload one batch and record its stored ids in the ledger.
+
+        With a batcher, the batch is sent as one chunk, within the batcher's byte
+        budget, and its outcome is fed back to the batcher as a chunk of `size`,
+        the batch size in effect when the batch was read.
+
+        Returns:
+            Tuple[Set[str], Optional[str]]: The ids of failed chunks in adaptive mode, and
+                the error, if any.
+        """
+        client = self.store.client
+        start = time.perf_counter()
+        failed_ids: Set[str] = set()
+        try:
+            if self.batcher is None:
+                client.batch_insert_embeddings(collection_name=self.collection_name, embeddings=embeddings)
+                error = None
+            else:
+                result = client.batch_insert_embeddings(
+                    collection_name=self.collection_name,
+                    embeddings=embeddings,
+                    chunk_size=len(embeddings),
+                    max_chunk_bytes=self.batcher.max_chunk_bytes
+                )
+                failed_ids = set(result.failed_ids)
+                error = f"Upload failed: {result.errors[-1]}" if failed_ids else None
+                self.batcher.record(
+                    size, len(ids), result.bytes_sent, time.perf_counter() - start, not failed_ids, result.retries
+                )
+                client.publish_batcher(self.batcher)
+        except Exception as e:
+            error = f"Upload failed: {e}"
+            if self.batcher is not None and not failed_ids:
+                self.batcher.record(size, len(ids), 0, time.perf_counter() - start, ok=False)
+        finally:
+            with self.lock:
+                report.upload_seconds += time.perf_counter() - start
+        if self.ledger is not None and (error is None or failed_ids):
+            self.ledger.add(vector_id for vector_id in ids if vector_id not in failed_ids)
+        return failed_ids, error
+
+    def run(self, documents: Iterable[Any]) -> IngestReport:
+        """
+        Embed and upload documents, returning once every batch has been processed.
+
+        Args:
+            documents (Iterable[Any]): Documents with `page_content` and `metadata`,
+                such as LangChain `Document` objects. A generator is consumed lazily.
+
+        Returns:
+            IngestReport: Counts, inserted ids, errors and per-stage timings.
+        """
+        report = IngestReport()
+        self.start = time.perf_counter()
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        upload_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embedders = [
+            threading.Thread(target=self._embed_worker, args=(embed_queue, upload_queue, report), daemon=True)
+            for _ in range(self.embed_workers)
+        ]
+        uploaders = [
+            threading.Thread(target=self._upload_worker, args=(upload_queue, report), daemon=True)
+            for _ in range(self.upload_workers)
+        ]
+        for worker in embedders + uploaders:
+            worker.start()
+        try:
+            for pages, size in self._batches(documents):
+                with self.lock:
+                    offset = report.documents
+                    report.documents += len(pages)
+                embed_queue.put((offset, pages, size))
+        finally:
+            for _ in embedders:
+                embed_queue.put(_DONE)
+            for worker in embedders:
+                worker.join()
+            for _ in uploaders:
+                upload_queue.put(_DONE)
+            for worker in uploaders:
+                worker.join()
+        report.elapsed = time.perf_counter() - self.start
+        if self.batcher is not None:
+            report.adaptive = self.batcher.snapshot()
+        return report
+
+    def _batches(self, documents: Iterable[Any]) -> Iterator[Tuple[List[Any], int]]:
+        """
+        Group documents into batches, of the batcher's current size when there is one.
+
+        Yields:
+            Tuple[List[Any], int]: Each batch and the batch size in effect when it was read.
+        """
+        if self.batcher is None:
+            for pages in batched(documents, self.batch_size):
+                yield pages, self.batch_size
+            return
+        iterator = iter(documents)
+        while True:
+            size = self.batcher.chunk_size
+            pages = list(islice(iterator, size))
+            if not pages:
+                return
+            yield pages, size
+
+
+def stream_documents(
+    store,
+    collection_name: str,
+    documents: Iterable[Any],
+    embedding_model_client=None,
+    batch_size: int = 32,
+    concurrency: int = 4,
+    progress: Optional[Callable[[IngestReport, int], None]] = None,
+    make_id: Callable[[Any], str] = random_id,
+    ledger=None
+) -> IngestReport:
+    """
+    Embed documents in batches and insert them one by one, with up to
+    `concurrency` batches being worked on at once.
+
+    Each worker embeds a batch with one `embed_batch` call, then inserts its
+    documents with `insert_embeddings`. A failure is recorded for the
+    documents it affects, and the other documents carry on. At most twice
+    `concurrency` batches are read ahead, so a generator is consumed lazily.
+
+    Args:
+        store (MemVectorDBVectorStore): The vector store providing `embed_batch` and the client.
+        collection_name (str): The name of the collection to insert into.
+        documents (Iterable[Any]): Documents with `page_content` and `metadata`.
+        embedding_model_client: An instance of the embedding model client.
+        batch_size (int): The number of documents per embedding call.
+        concurrency (int): The number of worker threads.
+        progress (Optional[Callable[[IngestReport, int], None]]): Called after each batch
+            with the report and the number of documents in the batch.
+        make_id (Callable[[Any], str]): Assigns each document its vector id. Defaults to a random UUID.
+        ledger (Optional[IdLedger]): Records the id of each uploaded document.
+
+    Returns:
+        IngestReport: Counts, inserted ids, per-document failures and per-stage timings.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    report = IngestReport()
+    lock = threading.Lock()
+    read_ahead = threading.BoundedSemaphore(2 * concurrency)
+    start = time.perf_counter()
+
+    def fail(index: int, stage: str, error: str, vector_id: Optional[str] = None) -> None:
+        report.failed += 1
+        report.errors.append(error)
+        report.failures.append(IngestFailure(index, stage, error, vector_id))
+
+    def work(offset: int, pages: List[Any]) -> None:
+        # Documents before `done` have been recorded; any left when an error escapes are failed.
+        done = 0
+        stage = "embed"
+        try:
+            embed_start = time.perf_counter()
+            try:
+                vectors = store.embed_batch([page.page_content for page in pages], embedding_model_client, batch_size)
+            except Exception as e:
+                with lock:
+                    for i in range(len(pages)):
+                        fail(offset + i, "embed", f"Embedding failed: {e}")
+                done = len(pages)
+                return
+            finally:
+                with lock:
+                    report.embed_seconds += time.perf_counter() - embed_start
+            with lock:
+                report.embedded += len(pages)
+            stage = "upload"
+            for i, (page, vector) in enumerate(zip(pages, vectors)):
+                vector_id = None
+                upload_start = time.perf_counter()
+                try:
+                    vector_id = make_id(page)
+                    metadata = dict(page.metadata or {})
+                    metadata["text"] = page.page_content
+                    result = store.client.insert_embeddings(
+                        collection_name=collection_name,
+                        vector_id=vector_id,
+                        vector=vector,
+                        metadata=metadata
+                    )
+                    error = result if isinstance(result, str) and result.startswith("Failed") else None
+                    if error is None and ledger is not None:
+                        ledger.add([vector_id])
+                except Exception as e:
+                    error = f"Upload failed: {e}"
+                with lock:
+                    report.upload_seconds += time.perf_counter() - upload_start
+                    if error is None:
+                        report.inserted += 1
+                        report.inserted_ids.append(vector_id)
+                    else:
+                        fail(offset + i, "upload", error, vector_id)
+                done = i + 1
+            if done < len(pages):
+                raise ValueError(f"{len(vectors)} vectors were returned for {len(pages)} documents")
+        except Exception as e:
+            with lock:
+                for i in range(done, len(pages)):
+                    fail(offset + i, stage, f"Ingest failed: {e}")
+        finally:
+            with lock:
+                report.batches += 1
+                report.elapsed = time.perf_counter() - start
+                if progress is not None:
+                    progress(report, len(pages))
+            read_ahead.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for pages in batched(documents, batch_size):
+            read_ahead.acquire()
+            with lock:
+                offset = report.documents
+                report.documents += len(pages)
+            executor.submit(work, offset, pages)
+    report.failures.sort(key=lambda failure: failure.index)
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -0,0 +1,271 @@
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+PHASES = ("serialize", "network", "deserialize")
+
+
+@dataclass
+class RequestEvent:
+    """
+    The measurements of one request to the server.
+
+    Attributes:
+        method (str): The HTTP method.
+        endpoint (str): The endpoint path, e.g. "/get_similarity".
+        status (Optional[int]): The HTTP status code, or None when no response was received.
+        serialize_seconds (float): Time spent encoding the request body.
+        network_seconds (float): Time from sending the request to receiving the response,
+            including the body unless the response is streamed.
+        deserialize_seconds (float): Time spent decoding the response body. Reported
+            separately through `on_decode` by the synchronous client.
+        bytes_sent (int): The size of the request body.
+        bytes_received (int): The size of the response body, when known.
+        retries (int): The number of retries made for this request.
+        error (Optional[str]): The exception raised, or the error status, if the request failed.
+    """
+    method: str
+    endpoint: str
+    status: Optional[int] = None
+    serialize_seconds: float = 0.0
+    network_seconds: float = 0.0
+    deserialize_seconds: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    retries: int = 0
+    error: Optional[str] = None
+
+
+class RequestObserver:
+    """
+    The instrumentation interface of the clients. Subclass it and override the
+    methods of interest, or use `Instrumentation`, which keeps histograms.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called after each request, successful or not."""
+
+    def on_decode(self, endpoint: str, seconds: float, size: int) -> None:
+        """Called after a response body of `size` bytes is decoded in `seconds`."""
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket bounds, as in Prometheus.
+
+    Args:
+        buckets (Sequence[float]): The sorted upper bounds of the buckets. Values above
+            the last bound are counted in an implicit +Inf bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation within its bucket, as
+        Prometheus' `histogram_quantile` does. Returns the last bound for values in +Inf.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """The (le, cumulative count) pairs of the buckets, +Inf included."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+
+@dataclass
+class EndpointMetrics:
+    """
+    The aggregated measurements of one endpoint.
+
+    Attributes:
+        requests (int): Requests sent, retries not counted separately.
+        errors (int): Requests that raised or got a 4xx/5xx response.
+        retries (int): Retries made.
+        bytes_sent (int): Total request body bytes.
+        bytes_received (int): Total response body bytes, where known.
+        latency (Dict[str, Histogram]): Latency histograms for "serialize", "network"
+            and "deserialize".
+        statuses (Dict[int, int]): The number of responses per status code.
+    """
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency: Dict[str, Histogram] = field(default_factory=lambda: {phase: Histogram() for phase in PHASES})
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+
+def _labels(**labels: Any) -> str:
+    escaped = (
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Instrumentation(RequestObserver):
+    """
+    Per-endpoint latency histograms and counters, kept in process.
+
+    Pass it as `instrumentation=` to `MemVectorDB` or `AsyncMemVectorDB`, read
+    `metrics` or `summary()`, and expose `to_prometheus()` from a metrics endpoint.
+    Callbacks receive each `RequestEvent` as it is recorded, which is the hook for
+    forwarding to OpenTelemetry or a log.
+
+    Args:
+        callbacks (Optional[List[Callable[[RequestEvent], None]]]): Functions called
+            with each request event.
+        namespace (str): The prefix of the exported metric names.
+    """
+
+    def __init__(
+        self,
+        callbacks: Optional[List[Callable[[RequestEvent], None]]] = None,
+        namespace: str = "memvectordb"
+    ) -> None:
+        self.callbacks = list(callbacks or [])
+        self.namespace = namespace
+        self.metrics: Dict[str, EndpointMetrics] = {}
+        self.gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        metrics = self.metrics.get(endpoint)
+        if metrics is None:
+            metrics = self.metrics[endpoint] = EndpointMetrics()
+        return metrics
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.requests += 1
+            metrics.retries += event.retries
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            if event.error is not None:
+                metrics.errors += 1
+            if event.status is not None:
+                metrics.statuses[event.status] = metrics.statuses.get(event.status, 0) + 1
+            metrics.latency["serialize"].observe(event.serialize_seconds)
+            metrics.latency["network"].observe(event.network_seconds)
+            if event.deserialize_seconds:
+                metrics.latency["deserialize"].observe(event.deserialize_seconds)
+        for callback in self.callbacks:
+            callback(event)
+
+    def on_decode(self, endpoint: str, seconds: float, size: int) -> None:
+        with self._lock:
+            self._endpoint(endpoint).latency["deserialize"].observe(seconds)
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Record the current value of a named measurement, exported alongside the request metrics.
+        """
+        key = (name, tuple(sorted((key, str(label)) for key, label in labels.items())))
+        with self._lock:
+            self.gauges[key] = value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.metrics.clear()
+            self.gauges.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Requests, errors, retries, bytes and p50/p99 latency per phase for each endpoint.
+        """
+        with self._lock:
+            summary = {}
+            for endpoint, metrics in self.metrics.items():
+                row: Dict[str, Any] = {
+                    "requests": metrics.requests,
+                    "errors": metrics.errors,
+                    "retries": metrics.retries,
+                    "bytes_sent": metrics.bytes_sent,
+                    "bytes_received": metrics.bytes_received,
+                }
+                for phase, histogram in metrics.latency.items():
+                    row[f"{phase}_p50"] = histogram.quantile(0.5)
+                    row[f"{phase}_p99"] = histogram.quantile(0.99)
+                summary[endpoint] = row
+            return summary
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_request_duration_seconds Client time per request phase.",
+            f"# TYPE {ns}_request_duration_seconds histogram",
+        ]
+        counters = {
+            "requests_total": ("Requests sent.", "requests"),
+            "request_errors_total": ("Requests that failed.", "errors"),
+            "request_retries_total": ("Retries made.", "retries"),
+        }
+        with self._lock:
+            items = sorted(self.metrics.items())
+            for endpoint, metrics in items:
+                for phase, histogram in metrics.latency.items():
+                    for le, count in histogram.cumulative():
+                        labels = _labels(endpoint=endpoint, phase=phase, le=le)
+                        lines.append(f"{ns}_request_duration_seconds_bucket{labels} {count}")
+                    labels = _labels(endpoint=endpoint, phase=phase)
+                    lines.append(f"{ns}_request_duration_seconds_sum{labels} {histogram.sum!r}")
+                    lines.append(f"{ns}_request_duration_seconds_count{labels} {histogram.count}")
+            for name, (help_text, attribute) in counters.items():
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} counter")
+                for endpoint, metrics in items:
+                    lines.append(f"{ns}_{name}{_labels(endpoint=endpoint)} {getattr(metrics, attribute)}")
+            lines.append(f"# HELP {ns}_request_bytes_total Request and response body bytes.")
+            lines.append(f"# TYPE {ns}_request_bytes_total counter")
+            for endpoint, metrics in items:
+                lines.append(f"{ns}_request_bytes_total{_labels(endpoint=endpoint, direction='sent')} {metrics.bytes_sent}")
+                lines.append(
+                    f"{ns}_request_bytes_total{_labels(endpoint=endpoint, direction='received')} {metrics.bytes_received}"
+                )
+            gauges: Dict[str, List[str]] = {}
+            for (name, labels), value in sorted(self.gauges.items()):
+                gauges.setdefault(name, []).append(f"{ns}_{name}{_labels(**dict(labels)) if labels else ''} {value!r}")
+        for name, samples in gauges.items():
+            lines.append(f"# TYPE {ns}_{name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
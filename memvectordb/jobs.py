@@ -0,0 +1,261 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .ids import document_id
+from .ingest import IngestFailure, IngestReport, random_id
+from .streaming import batched
+
+
+@dataclass
+class JournalState:
+    """
+    What an ingest journal says has been done.
+
+    Attributes:
+        completed (Dict[int, List[str]]): The ids uploaded for each completed batch, by offset.
+        embedded (Dict[int, Dict[str, Any]]): The ids and vectors journaled for batches
+            that were embedded but not uploaded, by offset.
+        digests (Dict[int, str]): The content digest of each journaled batch, by offset.
+        batch_size (Optional[int]): The batch size the journal was written with.
+        valid_bytes (int): The length of the journal up to its last complete record.
+    """
+    completed: Dict[int, List[str]] = field(default_factory=dict)
+    embedded: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    digests: Dict[int, str] = field(default_factory=dict)
+    batch_size: Optional[int] = None
+    valid_bytes: int = 0
+
+    @property
+    def documents(self) -> int:
+        """The number of documents in completed batches."""
+        return sum(len(ids) for ids in self.completed.values())
+
+
+def _batch_digest(pages: List[Any]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for page in pages:
+        digest.update(page.page_content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IngestJob:
+    """
+    A resumable `add_documents` that journals its progress to an append-only file.
+
+    Documents are embedded in batches, and each batch is uploaded on a
+    background thread while the next one is embedded. After each upload, a
+    line recording the batch's offset, ids and a digest of its contents is
+    appended to the journal. With `journal_embeddings`, vectors are journaled
+    as soon as they are embedded, so a crash between embedding and upload does
+    not cost the embedding call.
+
+    Running the job again with the same journal and the same documents in the
+    same order skips the completed batches without embedding them. A batch
+    whose contents no longer match the journal raises ValueError. Ids default
+    to `document_id`, so a batch uploaded just before a crash, but not yet
+    journaled, is overwritten rather than duplicated when it is redone.
+
+    Args:
+        store (MemVectorDBVectorStore): The vector store providing `embed_batch` and the client.
+        collection_name (str): The name of the collection to insert into.
+        journal_path (str): The journal file. It is created if missing and appended to otherwise.
+        embedding_model_client: An instance of the embedding model client.
+            Defaults to the store's memoized client.
+        batch_size (int): The number of documents per embedding call and upload request.
+            Must stay the same across runs of a job.
+        journal_embeddings (bool): Whether to journal vectors before uploading them.
+        deterministic_ids (bool): Whether ids are derived from the documents rather than random.
+        fsync (bool): Whether to fsync the journal after each record, for durability
+            against power loss rather than just process crashes.
+        progress (Optional[Callable[[IngestReport, int], None]]): Called after each batch
+            with the report and the number of documents in the batch.
+    """
+
+    def __init__(
+        self,
+        store,
+        collection_name: str,
+        journal_path: str,
+        embedding_model_client=None,
+        batch_size: int = 32,
+        journal_embeddings: bool = False,
+        deterministic_ids: bool = True,
+        fsync: bool = False,
+        progress: Optional[Callable[[IngestReport, int], None]] = None
+    ) -> None:
+        self.store = store
+        self.collection_name = collection_name
+        self.journal_path = journal_path
+        self.embedding_model_client = embedding_model_client
+        self.batch_size = batch_size
+        self.journal_embeddings = journal_embeddings
+        self.make_id = document_id if deterministic_ids else random_id
+        self.fsync = fsync
+        self.progress = progress
+        self.lock = threading.Lock()
+        self._journal = None
+
+    def read_journal(self) -> JournalState:
+        """
+        Replay the journal. A last line cut short by a crash is ignored, and overwritten by the next run.
+        """
+        state = JournalState()
+        if not os.path.exists(self.journal_path):
+            return state
+        loads = self.store.client.serializer.loads
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                record = loads(line)
+                state.valid_bytes += len(line)
+                kind = record["type"]
+                if kind == "start":
+                    state.batch_size = record["batch_size"]
+                elif kind == "embedded":
+                    state.embedded[record["offset"]] = record
+                    state.digests[record["offset"]] = record["digest"]
+                elif kind == "uploaded":
+                    state.completed[record["offset"]] = record["ids"]
+                    state.digests[record["offset"]] = record["digest"]
+                    state.embedded.pop(record["offset"], None)
+        return state
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = self.store.client.serializer.dumps(record) + b"\n"
+        with self.lock:
+            self._journal.write(line)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+
+    def _upload(
+        self,
+        report: IngestReport,
+        offset: int,
+        digest: str,
+        embeddings: List[Dict[str, Any]],
+        start: float
+    ) -> None:
+        ids = [embedding["id"] for embedding in embeddings]
+        upload_start = time.perf_counter()
+        try:
+            self.store.client.batch_insert_embeddings(
+                collection_name=self.collection_name,
+                embeddings=embeddings
+            )
+            error = None
+        except Exception as e:
+            error = f"Upload failed: {e}"
+        upload_seconds = time.perf_counter() - upload_start
+        if error is None:
+            self._write({"type": "uploaded", "offset": offset, "digest": digest, "ids": ids})
+        with self.lock:
+            report.upload_seconds += upload_seconds
+            report.batches += 1
+            if error is None:
+                report.inserted += len(ids)
+                report.inserted_ids.extend(ids)
+            else:
+                report.failed += len(ids)
+                report.errors.append(error)
+                report.failures.extend(IngestFailure(offset + i, "upload", error, ids[i]) for i in range(len(ids)))
+            report.elapsed = time.perf_counter() - start
+            if self.progress is not None:
+                self.progress(report, len(ids))
+
+    def run(self, documents: Iterable[Any]) -> IngestReport:
+        """
+        Ingest documents, skipping the batches the journal records as uploaded.
+
+        Args:
+            documents (Iterable[Any]): Documents with `page_content` and `metadata`, in the
+                same order on every run. A generator is consumed lazily.
+
+        Returns:
+            IngestReport: This run's counts and per-stage timings; `skipped` counts the
+                documents completed by earlier runs.
+        """
+        state = self.read_journal()
+        if state.batch_size is not None and state.batch_size != self.batch_size:
+            raise ValueError(
+                f"The journal was written with batch_size={state.batch_size}, not {self.batch_size}"
+            )
+        report = IngestReport()
+        start = time.perf_counter()
+        pending: Optional[Future] = None
+        with open(self.journal_path, "ab") as self._journal, ThreadPoolExecutor(max_workers=1) as uploader:
+            self._journal.truncate(state.valid_bytes)
+            if state.batch_size is None:
+                self._write({"type": "start", "collection_name": self.collection_name, "batch_size": self.batch_size})
+            try:
+                for index, pages in enumerate(batched(documents, self.batch_size)):
+                    offset = index * self.batch_size
+                    report.documents += len(pages)
+                    digest = _batch_digest(pages)
+                    if offset in state.digests and state.digests[offset] != digest:
+                        raise ValueError(f"The documents at offset {offset} differ from the journaled batch")
+                    if offset in state.completed:
+                        report.skipped += len(pages)
+                        continue
+                    embeddings = self._embed(report, offset, digest, pages, state.embedded.get(offset))
+                    if pending is not None:
+                        pending.result()
+                    if embeddings is None:
+                        pending = None
+                        continue
+                    pending = uploader.submit(self._upload, report, offset, digest, embeddings, start)
+            finally:
+                if pending is not None:
+                    pending.result()
+            self._write({"type": "finished", "documents": report.documents})
+        self._journal = None
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _embed(
+        self,
+        report: IngestReport,
+        offset: int,
+        digest: str,
+        pages: List[Any],
+        journaled: Optional[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Build the embeddings of a batch, from the journal when its vectors were saved there.
+        """
+        if journaled is not None:
+            ids, vectors = journaled["ids"], journaled["vectors"]
+        else:
+            embed_start = time.perf_counter()
+            try:
+                vectors = self.store.embed_batch(
+                    [page.page_content for page in pages], self.embedding_model_client, self.batch_size
+                )
+            except Exception as e:
+                error = f"Embedding failed: {e}"
+                with self.lock:
+                    report.batches += 1
+                    report.failed += len(pages)
+                    report.errors.append(error)
+                    report.failures.extend(IngestFailure(offset + i, "embed", error) for i in range(len(pages)))
+                return None
+            finally:
+                with self.lock:
+                    report.embed_seconds += time.perf_counter() - embed_start
+            with self.lock:
+                report.embedded += len(pages)
+            ids = [self.make_id(page) for page in pages]
+            if self.journal_embeddings:
+                self._write({"type": "embedded", "offset": offset, "digest": digest, "ids": ids, "vectors": vectors})
+        embeddings = []
+        for page, vector_id, vector in zip(pages, ids, vectors):
+            metadata = dict(page.metadata or {})
+            metadata["text"] = page.page_content
+            embeddings.append({"id": vector_id, "vector": vector, "metadata": metadata})
+        return embeddings
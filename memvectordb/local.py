@@ -0,0 +1,329 @@
+import io
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+import numpy as np
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from .batching import embedding_id
+from .filters import compile_filter
+from .serialization import get_serializer
+
+DISTANCES = ("cosine", "euclidean", "dot")
+
+
+class LocalCollection:
+    """
+    A collection held as a contiguous float32 matrix with one vector per row.
+
+    Rows are appended into a buffer that doubles in capacity, so inserting n
+    vectors costs amortized O(n) copies. Inserting an existing id overwrites
+    its row in place. Squared row norms are kept alongside the matrix so cosine
+    and euclidean scores need a single matrix-vector product per query.
+
+    Args:
+        dimension (int): The dimension of the vectors.
+        distance (str): One of "cosine", "euclidean" or "dot".
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        distance: str
+    ) -> None:
+        if distance not in DISTANCES:
+            raise ValueError(f"Unsupported distance: {distance}")
+        self.dimension = dimension
+        self.distance = distance
+        self.ids: List[str] = []
+        self.metadata: List[Optional[Dict[str, str]]] = []
+        self.index: Dict[str, int] = {}
+        self.buffer = np.empty((16, dimension), dtype=np.float32)
+        self.sq_norms = np.empty(16, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """A view of the stored vectors, one per row."""
+        return self.buffer[:len(self.ids)]
+
+    def _reserve(self, count: int) -> None:
+        if count <= len(self.buffer):
+            return
+        capacity = max(count, 2 * len(self.buffer))
+        buffer = np.empty((capacity, self.dimension), dtype=np.float32)
+        buffer[:len(self.ids)] = self.vectors
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        sq_norms[:len(self.ids)] = self.sq_norms[:len(self.ids)]
+        self.buffer, self.sq_norms = buffer, sq_norms
+
+    def insert(
+        self,
+        ids: List[str],
+        vectors: np.ndarray,
+        metadata: List[Optional[Dict[str, str]]]
+    ) -> None:
+        """
+        Insert or overwrite rows. `vectors` must be a 2-D array matching the collection's dimension.
+        """
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise ValueError("Error: DimensionMismatch")
+        self._reserve(len(self.ids) + len(ids))
+        rows = []
+        for unique_id, meta in zip(ids, metadata):
+            row = self.index.get(unique_id)
+            if row is None:
+                row = self.index[unique_id] = len(self.ids)
+                self.ids.append(unique_id)
+                self.metadata.append(meta)
+            else:
+                self.metadata[row] = meta
+            rows.append(row)
+        rows = np.asarray(rows, dtype=np.intp)
+        self.buffer[rows] = vectors
+        self.sq_norms[rows] = np.einsum("ij,ij->i", self.buffer[rows], self.buffer[rows])
+
+    def embedding(self, row: int) -> Dict[str, Any]:
+        """The stored embedding at a row, shaped like the server's JSON."""
+        return {
+            "id": {"unique_id": self.ids[row]},
+            "vector": self.buffer[row].tolist(),
+            "metadata": self.metadata[row]
+        }
+
+    def scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """
+        Score every stored vector against a query: similarity for cosine and dot, distance for euclidean.
+        """
+        dots = self.vectors @ query_vector
+        if self.distance == "dot":
+            return dots
+        query_sq_norm = float(query_vector @ query_vector)
+        sq_norms = self.sq_norms[:len(self.ids)]
+        if self.distance == "euclidean":
+            return np.sqrt(np.maximum(sq_norms + query_sq_norm - 2.0 * dots, 0.0))
+        norms = np.sqrt(sq_norms * query_sq_norm)
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        mask: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k best rows for a query with a partial sort, among the rows
+        selected by `mask` when given.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: The rows and their scores, best first.
+        """
+        if query_vector.shape != (self.dimension,):
+            raise ValueError("Error: DimensionMismatch")
+        scores = self.scores(query_vector)
+        candidates = None
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+            scores = scores[candidates]
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        keys = scores if self.distance == "euclidean" else -scores
+        rows = np.argpartition(keys, k - 1)[:k] if k < len(keys) else np.arange(len(keys))
+        rows = rows[np.argsort(keys[rows], kind="stable")]
+        return (candidates[rows] if candidates is not None else rows), scores[rows]
+
+    def filter_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        A boolean mask of the rows whose metadata matches a filter.
+        """
+        predicate = compile_filter(where)
+        return np.fromiter((predicate(metadata) for metadata in self.metadata), dtype=bool, count=len(self.ids))
+
+
+class LocalEngine:
+    """
+    An in-process MemVectorDB engine backed by NumPy.
+
+    It answers the same endpoints as the server, with the same request and
+    response bodies, and also applies the optional "filter" of similarity
+    requests (see `compile_filter`), so `MemVectorDB` can use it through `LocalAdapter` without
+    a server. Requests are dispatched with `handle`, which takes the HTTP method,
+    the endpoint path and the decoded JSON body and returns a (status, body) pair.
+    """
+
+    def __init__(self) -> None:
+        self.collections: Dict[str, LocalCollection] = {}
+        self.lock = threading.RLock()
+
+    def handle(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Dict[str, Any]
+    ) -> Tuple[int, Any]:
+        handler = self.routes.get((method.upper(), endpoint))
+        if handler is None:
+            return 404, {"status": f"Error: no route for {method} {endpoint}"}
+        with self.lock:
+            try:
+                return handler(self, payload or {})
+            except ValueError as e:
+                return 400, {"status": str(e)}
+
+    def create_collection(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        name = payload["collection_name"]
+        if name in self.collections:
+            return 200, {"status": "Error: UniqueViolation"}
+        self.collections[name] = LocalCollection(int(payload["dimension"]), payload["distance"])
+        return 200, {"status": f'Collection created: "{name}"'}
+
+    def get_collection(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        collection = self.collections.get(payload["collection_name"])
+        if collection is None:
+            return 404, {"status": "Error: NotFound"}
+        return 200, {
+            "dimension": collection.dimension,
+            "distance": collection.distance,
+            "embeddings": [collection.embedding(row) for row in range(len(collection))]
+        }
+
+    def delete_collection(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        name = payload["collection_name"]
+        if self.collections.pop(name, None) is None:
+            return 404, {"status": "Error: NotFound"}
+        return 200, {"status": f'Collection deleted: "{name}"'}
+
+    def _insert(
+        self,
+        collection: LocalCollection,
+        embeddings: List[Dict[str, Any]]
+    ) -> None:
+        if not embeddings:
+            return
+        if any(len(embedding["vector"]) != collection.dimension for embedding in embeddings):
+            raise ValueError("Error: DimensionMismatch")
+        vectors = np.asarray([embedding["vector"] for embedding in embeddings], dtype=np.float32)
+        collection.insert(
+            [embedding_id(embedding) for embedding in embeddings],
+            vectors.reshape(len(embeddings), -1),
+            [embedding.get("metadata") for embedding in embeddings]
+        )
+
+    def insert_embeddings(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        collection = self.collections.get(payload["collection_name"])
+        if collection is None:
+            return 404, {"status": "Error: NotFound"}
+        self._insert(collection, [payload["embedding"]])
+        return 200, {"status": "Embedding inserted"}
+
+    def batch_insert_embeddings(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        collection = self.collections.get(payload["collection_name"])
+        if collection is None:
+            return 404, {"status": "Error: NotFound"}
+        self._insert(collection, payload["embeddings"])
+        return 200, {"status": f"{len(payload['embeddings'])} embeddings inserted"}
+
+    def get_embeddings(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        collection = self.collections.get(payload["collection_name"])
+        if collection is None:
+            return 404, {"status": "Error: NotFound"}
+        return 200, [collection.embedding(row) for row in range(len(collection))]
+
+    def get_similarity(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        collection = self.collections.get(payload["collection_name"])
+        if collection is None:
+            return 404, {"status": "Error: NotFound"}
+        query_vector = np.asarray(payload["query_vector"], dtype=np.float32)
+        where = payload.get("filter")
+        mask = collection.filter_mask(where) if where else None
+        rows, scores = collection.search(query_vector, int(payload["k"]), mask)
+        return 200, [
+            {"score": float(score), "embedding": collection.embedding(row)}
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
+
+    routes = {
+        ("POST", "/create_collection"): create_collection,
+        ("GET", "/get_collection"): get_collection,
+        ("DELETE", "/delete_collection"): delete_collection,
+        ("PUT", "/insert_embeddings"): insert_embeddings,
+        ("PUT", "/batch_insert_embeddings"): batch_insert_embeddings,
+        ("GET", "/get_embeddings"): get_embeddings,
+        ("GET", "/get_similarity"): get_similarity,
+    }
+
+
+_ENGINES: Dict[str, LocalEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_engine(name: str = "") -> LocalEngine:
+    """
+    Get the process-wide engine registered under a name, creating it on first use.
+    An empty name always returns a new, private engine.
+    """
+    if not name:
+        return LocalEngine()
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(name)
+        if engine is None:
+            engine = _ENGINES[name] = LocalEngine()
+        return engine
+
+
+def drop_engine(name: str) -> None:
+    """
+    Forget a named engine and its collections.
+    """
+    with _ENGINES_LOCK:
+        _ENGINES.pop(name, None)
+
+
+class LocalAdapter(BaseAdapter):
+    """
+    A requests transport adapter that answers requests from a `LocalEngine`
+    instead of the network.
+
+    `MemVectorDB` mounts it for "memory://" base URLs: "memory://" gives the
+    client its own engine, and "memory://name" shares the engine registered
+    under that name with every client in the process using the same URL.
+    """
+
+    def __init__(
+        self,
+        engine: LocalEngine,
+        serializer: Any = "auto"
+    ) -> None:
+        super().__init__()
+        self.engine = engine
+        self.serializer = get_serializer(serializer)
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        try:
+            payload = self.serializer.loads(body) if body else {}
+            status, data = self.engine.handle(request.method, urlsplit(request.url).path, payload)
+        except (ValueError, KeyError, TypeError) as e:
+            status, data = 400, {"status": f"Error: {e}"}
+        content = self.serializer.dumps(data)
+        response = Response()
+        response.status_code = status
+        response.reason = "OK" if status == 200 else "Error"
+        response.headers = CaseInsensitiveDict({
+            "Content-Type": "application/json",
+            "Content-Length": str(len(content))
+        })
+        response.encoding = "utf-8"
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
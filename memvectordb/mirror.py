@@ -0,0 +1,322 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Union
+import numpy as np
+from .collection import MemVectorDB
+from .filters import MetadataFilter
+from .local import LocalCollection
+from .vectors import EmbeddingArrays, to_arrays
+
+
+@dataclass
+class MirrorSyncReport:
+    """
+    What a `CollectionMirror.refresh` changed.
+
+    Attributes:
+        added (int): Embeddings new since the last sync.
+        updated (int): Embeddings whose vector or metadata changed.
+        removed (int): Embeddings no longer in the collection.
+        unchanged (int): Embeddings already up to date.
+        elapsed (float): Wall-clock seconds the refresh took.
+    """
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class MirrorStats:
+    """
+    Where a `CollectionMirror` answered its queries.
+
+    Attributes:
+        local_queries (int): Queries answered from the mirror.
+        remote_queries (int): Queries sent to the server because the mirror was stale.
+        refreshes (int): Completed refreshes.
+    """
+    local_queries: int = 0
+    remote_queries: int = 0
+    refreshes: int = 0
+
+
+class _MappedCollection(LocalCollection):
+    """
+    A `LocalCollection` whose vectors live in a memory-mapped float32 file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dimension: int,
+        distance: str,
+        ids: Optional[List[str]] = None,
+        metadata: Optional[List[Optional[Dict[str, str]]]] = None
+    ) -> None:
+        super().__init__(dimension, distance)
+        self.path = path
+        self.ids = list(ids or [])
+        self.metadata = list(metadata or [])
+        self.index = {unique_id: row for row, unique_id in enumerate(self.ids)}
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        rows = os.path.getsize(path) // (4 * dimension)
+        if rows < len(self.ids):
+            raise ValueError(f"{path} holds {rows} vectors but the sidecar lists {len(self.ids)}")
+        self._map(max(rows, 16))
+        self.sq_norms = np.empty(len(self.buffer), dtype=np.float32)
+        self.sq_norms[:len(self.ids)] = np.einsum("ij,ij->i", self.vectors, self.vectors)
+
+    def _map(self, capacity: int) -> None:
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * self.dimension * 4)
+        self.buffer = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+    def _reserve(self, count: int) -> None:
+        if count <= len(self.buffer):
+            return
+        capacity = max(count, 2 * len(self.buffer))
+        self.buffer.flush()
+        self._map(capacity)
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        sq_norms[:len(self.ids)] = self.sq_norms[:len(self.ids)]
+        self.sq_norms = sq_norms
+
+    def compacted(self, path: str, rows: np.ndarray, batch_size: int) -> "_MappedCollection":
+        """
+        Copy the given rows, in order, into a new file at `path` and map it.
+
+        The current file is left untouched, so it stays consistent with the
+        sidecar that describes it until the new one replaces that sidecar.
+        """
+        with open(path, "wb") as f:
+            for start in range(0, len(rows), batch_size):
+                f.write(np.ascontiguousarray(self.buffer[rows[start:start + batch_size]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        rows = rows.tolist()
+        return _MappedCollection(
+            path,
+            self.dimension,
+            self.distance,
+            [self.ids[row] for row in rows],
+            [self.metadata[row] for row in rows]
+        )
+
+    def flush(self) -> None:
+        self.buffer.flush()
+
+
+class CollectionMirror:
+    """
+    A local, memory-mapped copy of a collection that answers queries without the server.
+
+    Vectors are stored in `<directory>/<collection>.f32`, a raw float32 matrix
+    with one row per embedding that is memory-mapped rather than read into
+    memory. Ids, metadata, the dimension, the distance and the time of the last
+    sync are kept in a `<collection>.json` sidecar. A mirror reopened from the
+    same directory is usable at once, without downloading the collection again.
+
+    `refresh` streams the collection with `iter_embeddings` and writes only rows
+    that were added or changed. The server has no change feed, so every refresh
+    still reads the whole collection over the network, but the mirror file is
+    updated in place: rows are only overwritten under their own id or appended,
+    so the previous sidecar stays valid until the new one replaces it. When rows
+    were removed, the kept rows are copied into a new `<collection>.<n>.f32` file
+    instead, which the new sidecar names, so a crash at any point leaves a sidecar
+    that matches its vector file.
+
+    `query` searches the mirror with the same vectorized top-k as the in-process
+    engine, and falls back to the server while the mirror is stale: before the
+    first sync, when `max_age` has passed since the last one, or after `mark_stale`.
+
+    Args:
+        client (MemVectorDB): The client used to sync and to fall back to.
+        collection_name (str): The name of the collection to mirror.
+        directory (str): The directory holding the mirror files.
+        max_age (Optional[float]): Seconds after a sync at which the mirror is stale.
+            None keeps it fresh until `mark_stale` is called.
+        batch_size (int): The number of embeddings applied per step while refreshing.
+    """
+
+    def __init__(
+        self,
+        client: MemVectorDB,
+        collection_name: str,
+        directory: str,
+        max_age: Optional[float] = None,
+        batch_size: int = 1024
+    ) -> None:
+        self.client = client
+        self.collection_name = collection_name
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.stats = MirrorStats()
+        self.vectors_path = os.path.join(directory, f"{collection_name}.f32")
+        self.sidecar_path = os.path.join(directory, f"{collection_name}.json")
+        self.directory = directory
+        self.generation = 0
+        self.collection: Optional[_MappedCollection] = None
+        self.synced_at: Optional[float] = None
+        self._stale = False
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.sidecar_path):
+            with open(self.sidecar_path, "rb") as f:
+                sidecar = self.client.serializer.loads(f.read())
+            self.generation = sidecar.get("generation", 0)
+            self.vectors_path = self._vectors_path(self.generation)
+            self.collection = _MappedCollection(
+                self.vectors_path,
+                sidecar["dimension"],
+                sidecar["distance"],
+                sidecar["ids"],
+                sidecar["metadata"]
+            )
+            self.synced_at = sidecar["synced_at"]
+
+    def __len__(self) -> int:
+        return len(self.collection) if self.collection is not None else 0
+
+    def _vectors_path(self, generation: int) -> str:
+        suffix = f".{generation}.f32" if generation else ".f32"
+        return os.path.join(self.directory, f"{self.collection_name}{suffix}")
+
+    @property
+    def stale(self) -> bool:
+        """Whether queries currently go to the server instead of the mirror."""
+        if self.collection is None or self.synced_at is None or self._stale:
+            return True
+        return self.max_age is not None and time.time() - self.synced_at > self.max_age
+
+    def mark_stale(self) -> None:
+        """
+        Send queries to the server until the next refresh, e.g. after writing to the collection.
+        """
+        self._stale = True
+
+    def refresh(self) -> MirrorSyncReport:
+        """
+        Bring the mirror up to date with the server.
+
+        Returns:
+            MirrorSyncReport: How many embeddings were added, updated, removed or unchanged.
+        """
+        report = MirrorSyncReport()
+        start = time.perf_counter()
+        if self.collection is None:
+            info = self.client.get_collection_info(self.collection_name)
+            if os.path.exists(self.vectors_path):
+                os.remove(self.vectors_path)
+            self.collection = _MappedCollection(self.vectors_path, info["dimension"], info["distance"])
+        batches = self.client.iter_embeddings(self.collection_name, batch_size=self.batch_size)
+        collection = self.collection
+        seen = np.zeros(len(collection), dtype=bool)
+        for batch in batches:
+            if not batch:
+                continue
+            ids = [str(embedding["id"]["unique_id"]) for embedding in batch]
+            metadata = [embedding.get("metadata") for embedding in batch]
+            vectors = np.asarray([embedding["vector"] for embedding in batch], dtype=np.float32)
+            rows = np.fromiter((collection.index.get(unique_id, -1) for unique_id in ids), dtype=np.intp, count=len(ids))
+            known = rows >= 0
+            same = np.zeros(len(ids), dtype=bool)
+            if known.any():
+                same[known] = np.all(collection.buffer[rows[known]] == vectors[known], axis=1)
+                for i in np.flatnonzero(same).tolist():
+                    same[i] = collection.metadata[rows[i]] == metadata[i]
+                seen[rows[known & (rows < len(seen))]] = True
+            changed = np.flatnonzero(~same)
+            report.added += int((~known).sum())
+            report.updated += int((known & ~same).sum())
+            report.unchanged += int(same.sum())
+            if len(changed):
+                collection.insert(
+                    [ids[i] for i in changed.tolist()],
+                    vectors[changed],
+                    [metadata[i] for i in changed.tolist()]
+                )
+        keep = np.concatenate([np.flatnonzero(seen), np.arange(len(seen), len(collection))])
+        report.removed = len(collection) - len(keep)
+        collection.flush()
+        previous_path = self.vectors_path
+        if report.removed:
+            self.generation += 1
+            self.vectors_path = self._vectors_path(self.generation)
+            self.collection = collection.compacted(self.vectors_path, keep, self.batch_size)
+        self.synced_at = time.time()
+        self._stale = False
+        self._save_sidecar()
+        if report.removed:
+            # Only now is the old file unreferenced; drop its mapping before removing it.
+            collection.buffer = None
+            try:
+                os.remove(previous_path)
+            except OSError:
+                pass
+        self.stats.refreshes += 1
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _save_sidecar(self) -> None:
+        sidecar = {
+            "collection_name": self.collection_name,
+            "dimension": self.collection.dimension,
+            "distance": self.collection.distance,
+            "synced_at": self.synced_at,
+            "generation": self.generation,
+            "ids": self.collection.ids,
+            "metadata": self.collection.metadata
+        }
+        temporary = f"{self.sidecar_path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(self.client.serializer.dumps(sidecar))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.sidecar_path)
+
+    def query(
+        self,
+        k: int,
+        query_vector: Union[List[float], Any],
+        as_numpy: bool = False,
+        filter: Optional[MetadataFilter] = None
+    ) -> Union[List[Dict[str, Any]], EmbeddingArrays]:
+        """
+        Retrieve similar embeddings from the mirror, or from the server while it is stale.
+
+        Args:
+            k (int): The number of similar embeddings to retrieve.
+            query_vector (Union[List[float], numpy.ndarray]): The query vector.
+            as_numpy (bool): Whether to return the results as columns, as for `MemVectorDB.query`.
+            filter (Optional[MetadataFilter]): A metadata filter, as for `MemVectorDB.query`.
+
+        Returns:
+            Union[List[Dict[str, Any]], EmbeddingArrays]: The results, shaped like the server's.
+        """
+        if self.stale:
+            self.stats.remote_queries += 1
+            options = {"filter": filter} if filter is not None else {}
+            return self.client.query(k, self.collection_name, query_vector, as_numpy=as_numpy, **options)
+        self.stats.local_queries += 1
+        collection = self.collection
+        mask = collection.filter_mask(filter) if filter is not None else None
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if self.client.quantization is not None:
+            query_vector = self.client.quantization.truncate(query_vector)
+        rows, scores = collection.search(query_vector, k, mask)
+        results = [
+            {"score": float(score), "embedding": collection.embedding(row)}
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
+        return to_arrays(results, collection.dimension) if as_numpy else results
+
+    def close(self) -> None:
+        """
+        Flush and release the memory-mapped file.
+        """
+        if self.collection is not None:
+            self.collection.flush()
+            self.collection = None
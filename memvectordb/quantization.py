@@ -0,0 +1,139 @@
+from typing import Dict, Any, Iterable, List, Optional
+
+MODES = (None, "float16", "int8")
+
+
+class Quantizer:
+    """
+    Client-side compression of vectors sent to the server.
+
+    * Dimension truncation keeps the first `dimensions` components, for
+      Matryoshka-style models such as `text-embedding-3-*`, and rescales the
+      result to unit length unless `renormalize` is False.
+    * "float16" rounds each component to half precision and sends it with four
+      significant digits, about 8 characters per component in JSON instead of
+      12, with no change on the server.
+    * "int8" scalar-quantizes each component to an integer in [-127, 127]
+      with one fixed scale, `scale / 127` per unit, so about 3 characters per
+      component. The server ranks the integer codes directly. Cosine is unaffected
+      by the scale, and dot and euclidean rankings are preserved, but their
+      scores are in code units: multiply dot scores by `(scale / 127) ** 2` and
+      euclidean scores by `scale / 127` to compare them with unquantized scores.
+      Vectors returned by the server are converted back to floats.
+
+    Every client writing to or querying a collection must use the same settings.
+    With `dimensions` set, create the collection with that dimension.
+
+    Args:
+        mode (Optional[str]): None, "float16" or "int8".
+        dimensions (Optional[int]): The number of leading components to keep. None keeps all of them.
+        scale (float): For "int8", the largest absolute component value; larger ones are
+            clipped. 1.0 suits unit-length embeddings.
+        renormalize (bool): Whether truncated vectors are rescaled to unit length.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        scale: float = 1.0,
+        renormalize: bool = True
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unsupported quantization mode: {mode}")
+        self.mode = mode
+        self.dimensions = dimensions
+        self.scale = scale
+        self.renormalize = renormalize
+
+    @classmethod
+    def calibrate(
+        cls,
+        vectors: Any,
+        mode: Optional[str] = "int8",
+        dimensions: Optional[int] = None,
+        quantile: float = 0.999,
+        renormalize: bool = True
+    ) -> "Quantizer":
+        """
+        Build a quantizer whose int8 scale fits a sample of vectors: the given quantile
+        of their absolute component values, after truncation. Components of unit-length
+        embeddings shrink as the dimension grows, so the default scale of 1.0 leaves
+        most codes unused.
+
+        Args:
+            vectors (numpy.ndarray): A 2-D sample of vectors, one per row.
+            mode (Optional[str]): The quantization mode, as for `Quantizer`.
+            dimensions (Optional[int]): The number of leading components to keep.
+            quantile (float): The share of component values that are not clipped.
+            renormalize (bool): Whether truncated vectors are rescaled to unit length.
+
+        Returns:
+            Quantizer: The calibrated quantizer.
+        """
+        import numpy as np
+
+        quantizer = cls(mode, dimensions, renormalize=renormalize)
+        sample = np.abs(quantizer.truncate(vectors))
+        quantizer.scale = float(np.quantile(sample, quantile)) or 1.0
+        return quantizer
+
+    @property
+    def step(self) -> float:
+        """The value of one int8 code unit."""
+        return self.scale / 127
+
+    def truncate(self, vector: Any) -> Any:
+        """
+        Keep the first `dimensions` components of a vector, as a float32 NumPy array.
+        """
+        import numpy as np
+
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.dimensions is None or vector.shape[-1] <= self.dimensions:
+            return vector
+        vector = vector[..., :self.dimensions]
+        if self.renormalize:
+            norms = np.linalg.norm(vector, axis=-1, keepdims=True)
+            vector = np.divide(vector, norms, out=np.zeros_like(vector), where=norms > 0)
+        return np.ascontiguousarray(vector)
+
+    def encode(self, vector: Any) -> Any:
+        """
+        Compress a vector for sending: a float64 NumPy array of short decimals for
+        "float16", a list of ints for "int8", and a float32 array otherwise.
+        """
+        import numpy as np
+
+        vector = self.truncate(vector)
+        if self.mode == "float16":
+            # Rounding to a power of ten in float64 makes the serializer print the
+            # short decimal, which it cannot do for float16 arrays directly.
+            half = vector.astype(np.float16).astype(np.float64)
+            magnitude = np.abs(half)
+            exponent = np.floor(np.log10(magnitude, out=np.zeros_like(magnitude), where=magnitude > 0))
+            scale = 10.0 ** (3 - exponent)
+            return np.round(half * scale) / scale
+        if self.mode == "int8":
+            return np.clip(np.rint(vector / self.step), -127, 127).astype(np.int8).tolist()
+        return vector
+
+    def decode(self, vector: List[float]) -> List[float]:
+        """
+        Convert a vector returned by the server back to floats.
+        """
+        if self.mode != "int8":
+            return vector
+        step = self.step
+        return [value * step for value in vector]
+
+    def decode_embeddings(self, embeddings: Iterable[Dict[str, Any]]) -> None:
+        """
+        Convert the vectors of embeddings, or of {"score", "embedding"} results, in place.
+        """
+        if self.mode != "int8":
+            return
+        for item in embeddings:
+            embedding = item.get("embedding", item)
+            if "vector" in embedding:
+                embedding["vector"] = self.decode(embedding["vector"])
@@ -0,0 +1,185 @@
+import hashlib
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+@dataclass
+class QueryCacheStats:
+    """
+    Hit and miss counters of a `QueryCache`.
+
+    Attributes:
+        hits (int): Queries answered from the cache.
+        misses (int): Queries that had to be sent to the server.
+        evictions (int): Entries evicted to respect the size limit.
+        expirations (int): Entries dropped because they outlived the TTL.
+        invalidations (int): Entries dropped because their collection was written to.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _vector_digest(vector: Any, decimals: int) -> str:
+    """
+    Hash a query vector after rounding it, so vectors that differ only by float noise share a key.
+    """
+    if hasattr(vector, "astype"):
+        import numpy as np
+
+        data = (np.round(np.asarray(vector, dtype=np.float64), decimals) + 0.0).astype(np.float32).tobytes()
+    else:
+        data = array("f", [round(float(x), decimals) + 0.0 for x in vector]).tobytes()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class QueryCache:
+    """
+    LRU cache of similarity query results with an optional time to live.
+
+    Results are keyed by (collection, k, hash of the rounded query vector). A
+    client holding the cache drops a collection's entries whenever it writes to
+    or deletes that collection; writes made by other clients are only picked up
+    once entries expire, so set `ttl` when the collection is shared.
+
+    Cached results are returned as is, not copied, and must be treated as read-only.
+
+    Args:
+        max_items (int): The maximum number of query results kept.
+        ttl (Optional[float]): The number of seconds a result stays valid. None keeps
+            results until they are evicted or invalidated.
+        decimals (int): The number of decimals query vectors are rounded to before hashing.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 1024,
+        ttl: Optional[float] = None,
+        decimals: int = 6
+    ) -> None:
+        self.max_items = max_items
+        self.ttl = ttl
+        self.decimals = decimals
+        self.stats = QueryCacheStats()
+        self.entries: "OrderedDict[Tuple[str, int, str], Tuple[float, Any]]" = OrderedDict()
+        self.by_collection: Dict[str, Set[Tuple[str, int, str]]] = {}
+        self.generations: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def key(
+        self,
+        collection_name: str,
+        k: int,
+        query_vector: Any
+    ) -> Tuple[str, int, str]:
+        """
+        Build the cache key of a query.
+        """
+        return collection_name, int(k), _vector_digest(query_vector, self.decimals)
+
+    def generation(self, collection_name: str) -> int:
+        """
+        The number of times a collection has been invalidated. Pass it to `put` so a
+        query that raced with a write does not cache results from before the write.
+        """
+        with self.lock:
+            return self.generations.get(collection_name, 0)
+
+    def get(
+        self,
+        collection_name: str,
+        k: int,
+        query_vector: Any
+    ) -> Optional[Any]:
+        """
+        Look up the results of a query, returning None on a miss.
+        """
+        key = self.key(collection_name, k, query_vector)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        collection_name: str,
+        k: int,
+        query_vector: Any,
+        results: Any,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Store the results of a query.
+
+        Args:
+            collection_name (str): The name of the queried collection.
+            k (int): The number of results requested.
+            query_vector (Any): The query vector.
+            results (Any): The server's response.
+            generation (Optional[int]): The collection's `generation` when the query was
+                sent. The results are discarded if the collection was invalidated since.
+        """
+        key = self.key(collection_name, k, query_vector)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self.lock:
+            if generation is not None and generation != self.generations.get(collection_name, 0):
+                return
+            self.entries[key] = (expires, results)
+            self.entries.move_to_end(key)
+            self.by_collection.setdefault(collection_name, set()).add(key)
+            while len(self.entries) > self.max_items:
+                self._remove(next(iter(self.entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, collection_name: str) -> None:
+        """
+        Drop every cached result of a collection.
+        """
+        with self.lock:
+            self.generations[collection_name] = self.generations.get(collection_name, 0) + 1
+            keys = self.by_collection.pop(collection_name, set())
+            for key in keys:
+                del self.entries[key]
+            self.stats.invalidations += len(keys)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self.lock:
+            for collection_name in self.by_collection:
+                self.generations[collection_name] = self.generations.get(collection_name, 0) + 1
+            self.entries.clear()
+            self.by_collection.clear()
+
+    def _remove(self, key: Tuple[str, int, str]) -> None:
+        del self.entries[key]
+        keys = self.by_collection.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.by_collection[key[0]]
@@ -0,0 +1,147 @@
+from typing import Dict, Any, List, Optional, Union
+from .filters import MetadataFilter, compile_filter
+
+METRICS = ("cosine", "dot", "euclidean")
+
+
+def score_vectors(
+    vectors: Any,
+    query_vector: Any,
+    metric: str = "cosine"
+) -> Any:
+    """
+    Score the rows of a matrix against a query vector in one vectorized pass.
+
+    Args:
+        vectors (numpy.ndarray): A 2-D float32 matrix with one candidate per row.
+        query_vector (numpy.ndarray): A 1-D vector of the same dimension.
+        metric (str): "cosine", "dot" or "euclidean".
+
+    Returns:
+        numpy.ndarray: One float32 score per row, higher is better. Euclidean
+            distances are negated so that they rank the same way.
+    """
+    import numpy as np
+
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported metric: {metric}")
+    dots = vectors @ query_vector
+    if metric == "dot":
+        return dots
+    if metric == "euclidean":
+        return -np.linalg.norm(vectors - query_vector, axis=1)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query_vector)
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+class Reranker:
+    """
+    Re-ranks similarity results on the client with NumPy.
+
+    `MemVectorDB.query(..., rerank=...)` fetches `candidates(k)` results from the
+    server, then this re-scores their vectors in one batched operation, drops
+    those whose metadata fails `where`, adds metadata boosts and optionally fuses
+    the local ranking with the server's by reciprocal rank fusion.
+
+    Args:
+        metric (str): The local metric: "cosine", "dot" or "euclidean".
+        oversample (int): The number of candidates fetched per requested result.
+        fetch_k (Optional[int]): A fixed number of candidates, overriding `oversample`.
+        where (Optional[MetadataFilter]): Keeps only candidates whose metadata matches;
+            see `compile_filter`.
+        boosts (Optional[Dict[str, Dict[str, float]]]): Added to the local score of a
+            candidate whose metadata `key` equals `value`, as {key: {value: boost}}.
+        fusion (Optional[str]): None ranks by the local score alone; "rrf" ranks by
+            1 / (rrf_k + local rank) + server_weight / (rrf_k + server rank).
+        rrf_k (int): The rank offset of reciprocal rank fusion.
+        server_weight (float): The weight of the server's ranking in reciprocal rank fusion.
+        query_vector (Optional[Any]): Re-rank against this vector instead of the query's,
+            e.g. an embedding from a different model of the same dimension.
+    """
+
+    def __init__(
+        self,
+        metric: str = "cosine",
+        oversample: int = 4,
+        fetch_k: Optional[int] = None,
+        where: Optional[MetadataFilter] = None,
+        boosts: Optional[Dict[str, Dict[str, float]]] = None,
+        fusion: Optional[str] = None,
+        rrf_k: int = 60,
+        server_weight: float = 1.0,
+        query_vector: Optional[Any] = None
+    ) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+        if fusion not in (None, "rrf"):
+            raise ValueError(f"Unsupported fusion: {fusion}")
+        self.metric = metric
+        self.oversample = oversample
+        self.fetch_k = fetch_k
+        self.where = where
+        self.predicate = compile_filter(where) if where is not None else None
+        self.boosts = boosts or {}
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.server_weight = server_weight
+        self.query_vector = query_vector
+
+    def candidates(self, k: int) -> int:
+        """The number of results to fetch from the server for a final top-k."""
+        return max(self.fetch_k or k * self.oversample, k)
+
+    def rerank(
+        self,
+        results: List[Dict[str, Any]],
+        query_vector: Any,
+        k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-rank the results of a similarity query.
+
+        Args:
+            results (List[Dict[str, Any]]): {"score", "embedding"} items, best first, as
+                returned by the server.
+            query_vector (Any): The query vector, used unless the reranker has its own.
+            k (int): The number of results to keep.
+
+        Returns:
+            List[Dict[str, Any]]: Up to k items, best first. "score" holds the re-ranking
+                score (higher is better) and "server_score" the server's score.
+        """
+        import numpy as np
+
+        server_ranks = np.arange(1, len(results) + 1)
+        if self.predicate is not None:
+            keep = [i for i, item in enumerate(results) if self.predicate(item["embedding"].get("metadata"))]
+            results = [results[i] for i in keep]
+            server_ranks = server_ranks[keep]
+        if not results:
+            return []
+        vectors = np.asarray([item["embedding"]["vector"] for item in results], dtype=np.float32)
+        query = np.asarray(self.query_vector if self.query_vector is not None else query_vector, dtype=np.float32)
+        scores = score_vectors(vectors, query, self.metric).astype(np.float64)
+        for key, values in self.boosts.items():
+            scores += np.fromiter(
+                (values.get((item["embedding"].get("metadata") or {}).get(key), 0.0) for item in results),
+                dtype=np.float64,
+                count=len(results)
+            )
+        if self.fusion == "rrf":
+            local_ranks = np.empty(len(scores), dtype=np.int64)
+            local_ranks[np.argsort(-scores, kind="stable")] = np.arange(1, len(scores) + 1)
+            scores = 1.0 / (self.rrf_k + local_ranks) + self.server_weight / (self.rrf_k + server_ranks)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [
+            {"score": float(scores[i]), "server_score": results[i].get("score"), "embedding": results[i]["embedding"]}
+            for i in order.tolist()
+        ]
+
+
+def as_reranker(rerank: Union[str, Reranker]) -> Reranker:
+    """
+    Accept a metric name as shorthand for `Reranker(metric=...)`.
+    """
+    if isinstance(rerank, Reranker):
+        return rerank
+    return Reranker(metric=rerank)
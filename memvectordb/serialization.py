@@ -0,0 +1,76 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _to_builtin(obj: Any) -> Any:
+    """
+    Convert NumPy arrays and scalars, memoryviews and array.array objects
+    to values the JSON encoders understand.
+    """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONSerializer:
+    """
+    Serializer backed by the standard library `json` module.
+
+    NumPy arrays and other buffer-like vectors are converted with `tolist()`.
+    """
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=_to_builtin, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """
+    Serializer backed by `orjson`.
+
+    C-contiguous float32/float64 NumPy arrays are encoded straight from their
+    buffer, without building a Python list first.
+    """
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed. Install it with `pip install orjson`.")
+        self.option = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_to_builtin, option=self.option)
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        return orjson.loads(data)
+
+
+def get_serializer(serializer: Union[str, Any] = "auto") -> Any:
+    """
+    Resolve a serializer by name.
+
+    Args:
+        serializer (Union[str, Any]): "auto" for orjson when it is installed and the
+            standard library otherwise, "orjson", "json", or an object with
+            `dumps(obj) -> bytes` and `loads(data) -> Any` methods.
+
+    Returns:
+        Any: The serializer instance.
+    """
+    if not isinstance(serializer, str):
+        return serializer
+    if serializer == "auto":
+        return OrjsonSerializer() if orjson is not None else JSONSerializer()
+    if serializer == "orjson":
+        return OrjsonSerializer()
+    if serializer == "json":
+        return JSONSerializer()
+    raise ValueError(f"Unknown serializer '{serializer}'. Choose 'auto', 'orjson' or 'json'.")
@@ -0,0 +1,219 @@
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+_STRUCTURAL = re.compile(rb'[\[\]{}"]')
+_STRING_END = re.compile(rb'["\\]')
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally decode the elements of a JSON array as bytes arrive.
+
+    Feed the response body in chunks; each call returns the array elements that
+    were completed by that chunk. Only the element being decoded is buffered, so
+    memory stays bounded by the largest element rather than the whole document.
+    The elements must be JSON objects or arrays, as the server's embeddings are.
+
+    Args:
+        key (Optional[str]): Decode the array stored under this key of a top-level
+            object, e.g. "embeddings" for a `/get_collection` response. When None,
+            the top-level value itself must be the array.
+        loads (Callable[[bytes], Any]): The function used to decode each element.
+    """
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        loads: Callable[[bytes], Any] = json.loads
+    ) -> None:
+        self.key = key.encode("utf-8") if key is not None else None
+        self.loads = loads
+        self.buffer = bytearray()
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.string_start = 0
+        self.last_key: Optional[bytes] = None
+        self.array_depth: Optional[int] = None
+        self.element_start: Optional[int] = None
+        self.done = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Consume the next chunk of the document.
+
+        Args:
+            chunk (bytes): The next bytes of the response body.
+
+        Returns:
+            List[Any]: The array elements completed by this chunk, in order.
+        """
+        if self.done:
+            return []
+        self.buffer += chunk
+        elements = []
+        buffer = self.buffer
+        while True:
+            if self.in_string:
+                match = _STRING_END.search(buffer, self.pos)
+                if match is None:
+                    self.pos = len(buffer)
+                    break
+                index = match.start()
+                if buffer[index] == 0x5C:
+                    if index + 1 >= len(buffer):
+                        self.pos = index
+                        break
+                    self.pos = index + 2
+                    continue
+                self.in_string = False
+                self.pos = index + 1
+                if self.depth == 1 and self.element_start is None:
+                    self.last_key = bytes(buffer[self.string_start:index])
+                continue
+
+            match = _STRUCTURAL.search(buffer, self.pos)
+            if match is None:
+                self.pos = len(buffer)
+                break
+            index = match.start()
+            char = buffer[index]
+            self.pos = index + 1
+            if char == 0x22:
+                self.in_string = True
+                self.string_start = index + 1
+            elif char in (0x7B, 0x5B):
+                self.depth += 1
+                if self.array_depth is None:
+                    if char == 0x5B and self._is_target_array():
+                        self.array_depth = self.depth
+                elif self.depth == self.array_depth + 1:
+                    self.element_start = index
+            else:
+                if self.array_depth is not None and self.depth == self.array_depth + 1:
+                    elements.append(self.loads(bytes(buffer[self.element_start:index + 1])))
+                    self.element_start = None
+                self.depth -= 1
+                if self.array_depth is not None and self.depth < self.array_depth:
+                    self.done = True
+                    break
+        self._compact()
+        return elements
+
+    def _is_target_array(self) -> bool:
+        if self.key is None:
+            return self.depth == 1
+        return self.depth == 2 and self.last_key == self.key
+
+    def _compact(self) -> None:
+        if self.element_start is not None:
+            keep = self.element_start
+        elif self.in_string:
+            keep = self.string_start - 1
+        else:
+            keep = self.pos
+        if keep:
+            del self.buffer[:keep]
+            self.pos -= keep
+            self.string_start -= keep
+            if self.element_start is not None:
+                self.element_start -= keep
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: Optional[str] = None,
+    loads: Callable[[bytes], Any] = json.loads
+) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array from an iterable of byte chunks.
+
+    Args:
+        chunks (Iterable[bytes]): The document, e.g. `response.iter_content(65536)`.
+        key (Optional[str]): The top-level object key holding the array, if any.
+        loads (Callable[[bytes], Any]): The function used to decode each element.
+
+    Yields:
+        Any: Each decoded array element.
+    """
+    parser = JSONArrayStreamParser(key=key, loads=loads)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            break
+
+
+def batched(
+    items: Iterable[Any],
+    batch_size: int
+) -> Iterator[List[Any]]:
+    """
+    Group an iterable into lists of at most `batch_size` items.
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_json_header(
+    chunks: Iterable[bytes],
+    key: str,
+    loads: Callable[[bytes], Any] = json.loads
+) -> Dict[str, Any]:
+    """
+    Decode the fields of a top-level JSON object that come before `key`,
+    without reading the rest of the document.
+
+    For a `/get_collection` response with key="embeddings", this returns the
+    dimension and distance while leaving the embeddings undownloaded. Fields
+    that come after `key` are not returned; when `key` is missing, the whole
+    object is.
+
+    Args:
+        chunks (Iterable[bytes]): The document, e.g. `response.iter_content(4096)`.
+        key (str): The top-level key at which to stop.
+        loads (Callable[[bytes], Any]): The function used to decode the fields.
+
+    Returns:
+        Dict[str, Any]: The fields before `key`.
+    """
+    target = key.encode("utf-8")
+    buffer = bytearray()
+    pos = depth = 0
+    in_string = escaped = False
+    string_start = 0
+    candidate: Optional[int] = None
+    for chunk in chunks:
+        buffer += chunk
+        while pos < len(buffer):
+            byte = buffer[pos]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif byte == 0x5C:
+                    escaped = True
+                elif byte == 0x22:
+                    in_string = False
+                    if depth == 1 and buffer[string_start + 1:pos] == target:
+                        candidate = string_start
+            elif byte == 0x22:
+                in_string, string_start = True, pos
+            elif byte == 0x3A and candidate is not None:
+                prefix = bytes(buffer[:candidate]).rstrip()
+                if prefix.endswith(b","):
+                    prefix = prefix[:-1]
+                return loads(prefix + b"}")
+            elif byte not in b" \t\r\n":
+                candidate = None
+                if byte in b"{[":
+                    depth += 1
+                elif byte in b"}]":
+                    depth -= 1
+            pos += 1
+    return loads(bytes(buffer))
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import math
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+from .local import LocalEngine
+
+
+class MockMemVectorDBStore(LocalEngine):
+    """
+    The store behind `MockMemVectorDBServer`: the in-process `LocalEngine`,
+    so the HTTP stand-in and "memory://" clients share one implementation of
+    the server's endpoints.
+
+    Subclasses can count or add endpoints by overriding handlers and extending
+    `routes`.
+    """
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _dispatch(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            payload = json.loads(body) if body else {}
+            status, data = self.server.store.handle(self.command, self.path, payload)
+        except (ValueError, KeyError, TypeError) as e:
+            status, data = 400, {"status": f"Error: {e}"}
+        response = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class MockMemVectorDBServer:
+    """
+    A local stand-in for the MemVectorDB HTTP server, for tests and benchmarks.
+
+    The server runs on a background thread and serves the same endpoints as
+    the real server from a `MockMemVectorDBStore`.
+
+    Example:
+        with MockMemVectorDBServer() as server:
+            client = MemVectorDB(base_url=server.url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ) -> None:
+        self.httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = MockMemVectorDBStore()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def store(self) -> MockMemVectorDBStore:
+        return self.httpd.store
+
+    def start(self) -> "MockMemVectorDBServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> "MockMemVectorDBServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+class FakeSentenceTransformer:
+    """
+    A deterministic stand-in for a SentenceTransformer model.
+
+    Each text is embedded as a unit vector derived from its SHA-256 digest, so
+    the same text always gets the same embedding. Use it with the
+    "sentence_transformers" provider to exercise the vector store without
+    downloading a model.
+
+    Attributes:
+        calls (int): The number of `encode` calls made.
+        texts_encoded (int): The total number of texts encoded.
+    """
+
+    def __init__(
+        self,
+        dimension: int = 384
+    ) -> None:
+        self.dimension = dimension
+        self.calls = 0
+        self.texts_encoded = 0
+
+    def _embed(self, text: str) -> List[float]:
+        values = []
+        counter = 0
+        while len(values) < self.dimension:
+            digest = hashlib.sha256(f"{counter}:{text}".encode("utf-8")).digest()
+            values.extend(x / 2 ** 31 - 1.0 for x in struct.unpack("<8I", digest))
+            counter += 1
+        values = values[:self.dimension]
+        norm = math.sqrt(sum(x * x for x in values)) or 1.0
+        return [x / norm for x in values]
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> Any:
+        import numpy as np
+
+        self.calls += 1
+        if isinstance(sentences, str):
+            self.texts_encoded += 1
+            return np.asarray(self._embed(sentences), dtype=np.float32)
+        self.texts_encoded += len(sentences)
+        return np.asarray([self._embed(text) for text in sentences], dtype=np.float32).reshape(-1, self.dimension)
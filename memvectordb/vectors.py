@@ -0,0 +1,148 @@
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+
+class EmbeddingArrays(NamedTuple):
+    """
+    Columnar view of embeddings returned by the server.
+
+    Attributes:
+        ids (List[str]): The unique id of each embedding.
+        vectors (numpy.ndarray): A 2-D float32 matrix with one embedding per row.
+        metadata (List[Optional[Dict[str, str]]]): The metadata of each embedding.
+        scores (Optional[numpy.ndarray]): The similarity scores, for query results.
+    """
+    ids: List[str]
+    vectors: Any
+    metadata: List[Optional[Dict[str, str]]]
+    scores: Optional[Any] = None
+
+
+def as_vector(vector: Any) -> Any:
+    """
+    Prepare a single vector for serialization.
+
+    Lists and tuples are returned unchanged. NumPy arrays and buffer-protocol
+    objects such as `array.array('f')` or a memoryview are returned as contiguous
+    1-D float32/float64 NumPy arrays, which the serializer encodes directly from
+    the buffer.
+
+    Args:
+        vector (Any): A sequence of floats, a 1-D NumPy array or a buffer of floats.
+
+    Returns:
+        Any: The vector, ready to be serialized.
+    """
+    if isinstance(vector, (list, tuple)):
+        return vector
+    import numpy as np
+
+    array = np.asarray(memoryview(vector) if not hasattr(vector, "__array__") else vector)
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-D vector, got an array of shape {array.shape}")
+    if array.dtype not in (np.float32, np.float64):
+        array = array.astype(np.float32)
+    return np.ascontiguousarray(array)
+
+
+def as_matrix(vectors: Any) -> Any:
+    """
+    Convert a 2-D NumPy array, a buffer or a sequence of vectors into a
+    contiguous 2-D float32/float64 NumPy array.
+    """
+    import numpy as np
+
+    array = np.asarray(vectors)
+    if array.ndim != 2:
+        raise ValueError(f"Expected a 2-D array of vectors, got an array of shape {array.shape}")
+    if array.dtype not in (np.float32, np.float64):
+        array = array.astype(np.float32)
+    return np.ascontiguousarray(array)
+
+
+def iter_vectors(vectors: Any) -> Iterator[Any]:
+    """
+    Iterate over the rows of a 2-D array, or the items of a sequence of vectors,
+    preparing each one with `as_vector`.
+    """
+    if hasattr(vectors, "ndim"):
+        vectors = as_matrix(vectors)
+    for vector in vectors:
+        yield as_vector(vector)
+
+
+def embeddings_from_arrays(
+    ids: Sequence[Any],
+    vectors: Any,
+    metadata: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Build embedding dicts for `batch_insert_embeddings` from columnar inputs.
+
+    Each vector is a view of a row of `vectors`, so no nested Python lists are
+    created. Combine with `chunk_size` to upload large matrices in pieces.
+
+    Args:
+        ids (Sequence[Any]): The unique id of each vector.
+        vectors (Any): A 2-D NumPy array, or a sequence of vectors, one per id.
+        metadata (Optional[Sequence[Optional[Dict[str, Any]]]]): The metadata of each vector.
+
+    Yields:
+        Dict[str, Any]: Embeddings with 'id', 'vector' and 'metadata' keys.
+    """
+    if len(ids) != len(vectors):
+        raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+    if metadata is not None and len(metadata) != len(ids):
+        raise ValueError(f"Got {len(metadata)} metadata entries for {len(ids)} vectors")
+    for i, vector in enumerate(iter_vectors(vectors)):
+        yield {
+            "id": {"unique_id": str(ids[i])},
+            "vector": vector,
+            "metadata": metadata[i] if metadata is not None else None
+        }
+
+
+def to_arrays(
+    results: Iterable[Dict[str, Any]],
+    dimension: Optional[int] = None
+) -> EmbeddingArrays:
+    """
+    Convert embeddings or similarity results returned by the server into columns.
+
+    Args:
+        results (Iterable[Dict[str, Any]]): Embeddings from `get_embeddings`, or
+            {"score", "embedding"} items from `query`.
+        dimension (Optional[int]): The vector dimension, used to shape an empty result.
+
+    Returns:
+        EmbeddingArrays: The ids, a float32 vector matrix, the metadata and, for
+            query results, a float32 array of scores.
+    """
+    import numpy as np
+
+    ids, vectors, metadata, scores = [], [], [], []
+    for item in results:
+        if "embedding" in item:
+            scores.append(item.get("score"))
+            item = item["embedding"]
+        vector_id = item.get("id")
+        ids.append(str(vector_id.get("unique_id") if isinstance(vector_id, dict) else vector_id))
+        vectors.append(item["vector"])
+        metadata.append(item.get("metadata"))
+    if vectors:
+        matrix = np.asarray(vectors, dtype=np.float32)
+    else:
+        matrix = np.empty((0, dimension or 0), dtype=np.float32)
+    return EmbeddingArrays(
+        ids=ids,
+        vectors=matrix,
+        metadata=metadata,
+        scores=np.asarray(scores, dtype=np.float32) if scores else None
+    )
+
+
+def many_to_arrays(results: List[Any]) -> List[Any]:
+    """
+    Convert the successful results of `query_many` into columns, leaving
+    exceptions and error responses as they are.
+    """
+    return [to_arrays(result) if isinstance(result, list) else result for result in results]
@@ -1,9 +1,87 @@
-from openai import OpenAI
 from .collection import MemVectorDB
+from .batching import AdaptiveBatcher, BatchInsertReport
+from .streaming import batched
+from .ingest import IngestPipeline, IngestReport, progress_bar, random_id, stream_documents, tqdm_progress
+from .ids import IdLedger, SkipCounter, content_id, document_id, unique_documents
+from .embedding_cache import EmbeddingCache
+from .query_cache import QueryCache
+from .filters import MetadataFilter
+from .quantization import Quantizer
+from .instrumentation import RequestObserver
+import threading
+import time
 import uuid
-from tqdm import tqdm
-from typing import List, Any, Dict
-from sentence_transformers import SentenceTransformer
+from dataclasses import dataclass
+from typing import List, Any, Container, Dict, Iterator, Optional, Union
+
+# OpenAI accepts at most 2048 inputs and 300k tokens per embeddings request.
+OPENAI_MAX_BATCH_SIZE = 2048
+OPENAI_MAX_BATCH_TOKENS = 300_000
+SENTENCE_TRANSFORMERS_BATCH_SIZE = 32
+# Documents embedded per model call before their inserts start in streaming mode.
+STREAMING_BATCH_SIZE = 32
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count for English text, about four characters per token."""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class EmbeddingClientStats:
+    """
+    Load metrics of the embedding model client used by a vector store.
+
+    Attributes:
+        load_seconds (float): The time it took to create the client, 0.0 until it is loaded.
+        loaded_at (Optional[float]): The `time.time()` at which the client was created.
+        reused (bool): Whether the client was already loaded in this process by another store.
+    """
+    load_seconds: float = 0.0
+    loaded_at: Optional[float] = None
+    reused: bool = False
+
+
+# Embedding clients shared by every store in the process, keyed by (provider, model, api_key).
+_EMBEDDING_CLIENTS: Dict[tuple, tuple] = {}
+_EMBEDDING_CLIENT_LOCKS: Dict[tuple, threading.Lock] = {}
+_EMBEDDING_CLIENTS_LOCK = threading.Lock()
+
+
+def _create_embedding_model_client(
+    embedding_provider: str,
+    embedding_model: str,
+    api_key: Optional[str] = None
+) -> Any:
+    # Provider libraries are imported here so that importing memvectordb does not
+    # pull in openai or sentence_transformers (and torch) until a provider is used.
+    if embedding_provider == "openai":
+        try:
+            from openai import OpenAI
+        except ImportError as e:
+            raise ImportError(
+                "The openai provider requires the openai package: pip install 'memvectordb-python[openai]'"
+            ) from e
+        return OpenAI(api_key=api_key)
+    elif embedding_provider == "sentence_transformers":
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The sentence_transformers provider requires the sentence_transformers package: "
+                "pip install 'memvectordb-python[sentence-transformers]'"
+            ) from e
+        return SentenceTransformer(embedding_model)
+    raise ValueError(f"Unsupported embedding provider: {embedding_provider}")
+
+
+def clear_embedding_model_clients() -> None:
+    """
+    Forget the embedding clients loaded in this process, so the next use reloads them.
+    """
+    with _EMBEDDING_CLIENTS_LOCK:
+        _EMBEDDING_CLIENTS.clear()
+        _EMBEDDING_CLIENT_LOCKS.clear()
 
 class MemVectorDBVectorStore:
     def __init__(
@@ -11,20 +89,64 @@ class MemVectorDBVectorStore:
         base_url: str,
         embedding_provider: str,
         embedding_model: str,
-        api_key: str = None
+        api_key: str = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_model_client: Any = None,
+        warm_start: bool = False,
+        query_cache: Optional[QueryCache] = None,
+        quantization: Optional[Quantizer] = None,
+        instrumentation: Optional[RequestObserver] = None
         ) -> None:
+        """
+        Args:
+            base_url (str): The base URL of the MemVectorDB server.
+            embedding_provider (str): Either "openai" or "sentence_transformers".
+            embedding_model (str): The name of the embedding model.
+            api_key (str): The OpenAI API key, for the "openai" provider.
+            embedding_cache (Optional[EmbeddingCache]): A cache consulted by `embed` and
+                `embed_batch` before calling the model, so unchanged texts are not re-embedded.
+            embedding_model_client (Any): A ready embedding client to use instead of loading one.
+            warm_start (bool): Whether to load the embedding client now rather than on first use.
+            query_cache (Optional[QueryCache]): A cache of `query_collection` results, dropped for a
+                collection whenever this store adds to or deletes it.
+            quantization (Optional[Quantizer]): Compress vectors before they are stored or
+                queried. With `dimensions` set, collections are created with that dimension.
+            instrumentation (Optional[RequestObserver]): Passed to the client, which reports
+                each request and the adaptive batch gauges to it.
+        """
         self.client = MemVectorDB(
-            base_url=base_url
+            base_url=base_url,
+            query_cache=query_cache,
+            quantization=quantization,
+            instrumentation=instrumentation
             )
         self.embedding_model=embedding_model
         self.embedding_provider=embedding_provider
         self.api_key = api_key
-        pass
+        self.embedding_cache = embedding_cache
+        self.embedding_client_stats = EmbeddingClientStats()
+        self._embedding_model_client = embedding_model_client
+        if warm_start:
+            self.warmup()
+
+    def __enter__(self) -> "MemVectorDBVectorStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the underlying MemVectorDB client and its pooled connections.
+        """
+        self.client.close()
 
     def initialize_embedding_model_client(self):
-        """Initializes a client for generating text embeddings.
+        """Returns the client for generating text embeddings, loading it on first use.
 
-        This method creates a client object based on the configured embedding provider.
+        The client is created once per process for each provider, model and API key,
+        and shared by every store using them, so repeated calls do not reload the model.
+        Loading is thread-safe: concurrent first calls wait for a single load.
 
         Supported Providers:
 
@@ -36,12 +158,40 @@ class MemVectorDBVectorStore:
         A client object for generating text embeddings. The specific type of client
         will depend on the chosen provider.
         """
-        if self.embedding_provider == "openai":
-            client = OpenAI(api_key=self.api_key)
-        elif self.embedding_provider == "sentence_transformers":
-            client = SentenceTransformer(self.embedding_model)
+        if self._embedding_model_client is not None:
+            return self._embedding_model_client
+        key = (self.embedding_provider, self.embedding_model, self.api_key)
+        with _EMBEDDING_CLIENTS_LOCK:
+            lock = _EMBEDDING_CLIENT_LOCKS.setdefault(key, threading.Lock())
+        with lock:
+            if key in _EMBEDDING_CLIENTS:
+                client, load_seconds, loaded_at = _EMBEDDING_CLIENTS[key]
+                reused = True
+            else:
+                start = time.perf_counter()
+                client = _create_embedding_model_client(*key)
+                load_seconds, loaded_at = time.perf_counter() - start, time.time()
+                _EMBEDDING_CLIENTS[key] = (client, load_seconds, loaded_at)
+                reused = False
+        self.embedding_client_stats = EmbeddingClientStats(load_seconds, loaded_at, reused)
+        self._embedding_model_client = client
         return client
-    
+
+    @property
+    def embedding_model_client(self) -> Any:
+        """The embedding client, loaded on first access."""
+        return self.initialize_embedding_model_client()
+
+    def warmup(self) -> EmbeddingClientStats:
+        """
+        Loads the embedding client ahead of the first request.
+
+        Returns:
+            EmbeddingClientStats: How long the load took.
+        """
+        self.initialize_embedding_model_client()
+        return self.embedding_client_stats
+
     def create_collection(
         self,
         collection_name: str,
@@ -63,6 +213,9 @@ class MemVectorDBVectorStore:
             dimension = 1536
         elif self.embedding_model=="multi-qa-MiniLM-L6-cos-v1":
             dimension = 384
+        quantization = self.client.quantization
+        if quantization is not None and quantization.dimensions:
+            dimension = min(dimension, quantization.dimensions)
         return self.client.create_collection(
             collection_name=collection_name,
             dimension=dimension,
@@ -86,7 +239,7 @@ class MemVectorDBVectorStore:
     def embed(
         self,
         text,
-        embedding_model_client,
+        embedding_model_client=None,
     ):
         """
         Embeds the given text using the specified embedding model client.
@@ -94,10 +247,20 @@ class MemVectorDBVectorStore:
         Args:
             text (str): The input text to embed.
             embedding_model_client: An instance of the embedding model client.
+                Defaults to the store's memoized client.
 
         Returns:
-            numpy.ndarray: The embeddings of the input text as a NumPy array.
+            The embeddings of the input text: a list of floats for OpenAI, or a NumPy
+            array for SentenceTransformers, which the client serializes without a
+            `tolist()` round trip. Embeddings served from the embedding cache's on-disk
+            store are lists of floats.
         """
+        if self.embedding_cache is not None:
+            embeddings = self.embedding_cache.get(self.embedding_provider, self.embedding_model, text)
+            if embeddings is not None:
+                return embeddings
+        if embedding_model_client is None:
+            embedding_model_client = self.embedding_model_client
         if self.embedding_provider=="openai":
             embeddings = embedding_model_client.embeddings.create(
                 input=text,
@@ -106,14 +269,107 @@ class MemVectorDBVectorStore:
             embeddings = embeddings.data[0].embedding
         elif self.embedding_provider=="sentence_transformers":
             embeddings = embedding_model_client.encode(text)
-            embeddings = embeddings.tolist()
+        if self.embedding_cache is not None:
+            self.embedding_cache.put(self.embedding_provider, self.embedding_model, text, embeddings)
         return embeddings
     
+    def _openai_batches(
+        self,
+        texts: List[str],
+        batch_size: int
+    ) -> Iterator[List[str]]:
+        """
+        Split texts into request-sized batches that respect OpenAI's input and token limits.
+        """
+        batch, tokens = [], 0
+        for text in texts:
+            text_tokens = _estimate_tokens(text)
+            if batch and (len(batch) >= batch_size or tokens + text_tokens > OPENAI_MAX_BATCH_TOKENS):
+                yield batch
+                batch, tokens = [], 0
+            batch.append(text)
+            tokens += text_tokens
+        if batch:
+            yield batch
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        embedding_model_client=None,
+        batch_size: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Embeds many texts with as few model calls as possible.
+
+        Texts found in the embedding cache are not sent to the model.
+
+        For OpenAI, texts are sent in requests of up to `batch_size` inputs (at most 2048)
+        and an estimated 300k tokens. For SentenceTransformers, they are encoded in one
+        call with `batch_size` texts per forward pass.
+
+        Args:
+            texts (List[str]): The input texts to embed.
+            embedding_model_client: An instance of the embedding model client.
+                Defaults to the store's memoized client.
+            batch_size (Optional[int]): The number of texts per request or forward pass.
+                Defaults to 2048 for OpenAI and 32 for SentenceTransformers.
+
+        Returns:
+            List[Any]: One embedding per input text, in input order.
+        """
+        texts = list(texts)
+        if self.embedding_cache is None:
+            return self._embed_batch(texts, embedding_model_client, batch_size)
+        embeddings = self.embedding_cache.get_many(self.embedding_provider, self.embedding_model, texts)
+        missing = [i for i, vector in enumerate(embeddings) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors = self._embed_batch(missing_texts, embedding_model_client, batch_size)
+            self.embedding_cache.put_many(self.embedding_provider, self.embedding_model, missing_texts, vectors)
+            for i, vector in zip(missing, vectors):
+                embeddings[i] = vector
+        return embeddings
+
+    def _embed_batch(
+        self,
+        texts: List[str],
+        embedding_model_client=None,
+        batch_size: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Calls the embedding model on many texts, bypassing the embedding cache.
+        """
+        if not texts:
+            return []
+        if embedding_model_client is None:
+            embedding_model_client = self.embedding_model_client
+        if self.embedding_provider=="openai":
+            batch_size = min(batch_size or OPENAI_MAX_BATCH_SIZE, OPENAI_MAX_BATCH_SIZE)
+            embeddings = []
+            for batch in self._openai_batches(texts, batch_size):
+                response = embedding_model_client.embeddings.create(
+                    input=batch,
+                    model=self.embedding_model
+                    )
+                data = sorted(response.data, key=lambda item: item.index)
+                embeddings.extend(item.embedding for item in data)
+        elif self.embedding_provider=="sentence_transformers":
+            matrix = embedding_model_client.encode(
+                texts,
+                batch_size=batch_size or SENTENCE_TRANSFORMERS_BATCH_SIZE
+            )
+            embeddings = list(matrix)
+        return embeddings
+
     def add_texts(
         self,
         collection_name: str,
         text: str,
-        embedding_model_client
+        embedding_model_client=None,
+        deterministic_ids: bool = False,
+        source: Optional[str] = None,
+        skip_existing: bool = False,
+        ledger: Optional[IdLedger] = None
         ) -> str:
         """
         Adds a single text to the specified collection.
@@ -121,72 +377,229 @@ class MemVectorDBVectorStore:
         Args:
             collection_name (str): The name of the collection.
             text (str): The text to be added.
+            embedding_model_client: An instance of the embedding model client.
+                Defaults to the store's memoized client.
+            deterministic_ids (bool): Whether the id is derived from `source` and the text,
+                so adding the same text again overwrites it; see `content_id`.
+            source (Optional[str]): Where the text came from, part of its deterministic id.
+            skip_existing (bool): With deterministic ids, whether to skip embedding and
+                uploading a text whose id is already stored, according to `ledger`
+                or otherwise to the server.
+            ledger (Optional[IdLedger]): A local record of the stored ids, updated on success.
 
         Returns:
             str: Status message indicating the success of the operation.
         """
-        vector_id = str(uuid.uuid4())
+        vector_id = content_id(text, source) if deterministic_ids else str(uuid.uuid4())
+        if deterministic_ids and skip_existing and vector_id in self._existing_ids(collection_name, ledger):
+            return f"Skipped: embedding {vector_id} already exists"
         embeddings = self.embed(text, embedding_model_client)
-        return self.client.insert_embeddings(
+        result = self.client.insert_embeddings(
             collection_name=collection_name,
             vector_id=vector_id,
             vector=embeddings,
             metadata={"text": text}
         )
+        if ledger is not None and not (isinstance(result, str) and result.startswith("Failed")):
+            ledger.add([vector_id])
+        return result
+
+    def _existing_ids(
+        self,
+        collection_name: str,
+        ledger: Optional[IdLedger] = None
+    ) -> Container[str]:
+        """
+        The ids already stored in a collection: the ledger when one is given, otherwise
+        every id streamed from the server.
+        """
+        if ledger is not None:
+            return ledger
+        return {
+            embedding["id"]["unique_id"]
+            for embedding in self.client.iter_embeddings(collection_name)
+        }
         
     def add_documents(
         self,
         collection_name: str,
         documents: list,
-        embedding_model_client,
-        streaming: bool
-    ) -> str:
+        embedding_model_client=None,
+        streaming: bool = False,
+        batch_size: Optional[int] = None,
+        pipeline: bool = False,
+        embed_workers: int = 1,
+        upload_workers: int = 2,
+        queue_size: int = 4,
+        show_progress: bool = True,
+        concurrency: Optional[int] = None,
+        deterministic_ids: bool = False,
+        skip_existing: bool = False,
+        ledger: Optional[IdLedger] = None,
+        adaptive: Union[bool, AdaptiveBatcher] = False
+    ) -> Union[str, IngestReport, BatchInsertReport]:
         """
         Adds multiple documents to the specified collection.
 
+        Documents are embedded in batches with `embed_batch` rather than one model
+        call per document.
+
+        With `pipeline=True`, embedding and uploading overlap: batches are embedded
+        on `embed_workers` threads while earlier batches are uploaded on
+        `upload_workers` threads, connected by queues of at most `queue_size` batches.
+
+        With `streaming=True` and `concurrency` set, up to `concurrency` batches are
+        embedded and inserted at once on a thread pool, and an `IngestReport` listing
+        the inserted ids and each failed document is returned instead of printing errors.
+
+        With `deterministic_ids=True`, each document's id is a hash of its "source"
+        metadata and its content, so a re-run overwrites instead of duplicating, and
+        repeated documents in the input are embedded only once. `skip_existing` also
+        skips, before embedding, the documents whose id is already stored: those in
+        `ledger`, or, without a ledger, those returned by the server.
+
+        With `adaptive`, an `AdaptiveBatcher` tunes the upload size from the latency,
+        errors and size of earlier uploads, starting from `batch_size`. In batch mode it
+        sizes the chunks of the single upload; in pipeline mode it sets how many
+        documents each batch holds. Streaming inserts one document per request and
+        ignores it.
+
         Args:
             collection_name (str): The name of the collection.
             documents (list): The documents to be added.
-            streaming (bool): Whether to stream the documents or not.
+            embedding_model_client: An instance of the embedding model client.
+                Defaults to the store's memoized client.
+            streaming (bool): Whether to stream the documents or not. Ignored in pipeline mode.
+            batch_size (Optional[int]): The number of documents embedded per model call.
+                Defaults to 32 when streaming or pipelining and to the provider's batch size otherwise.
+            pipeline (bool): Whether to run the embedding and upload stages concurrently.
+            embed_workers (int): The number of embedding threads in pipeline mode.
+            upload_workers (int): The number of upload threads in pipeline mode.
+            queue_size (int): The maximum number of batches queued per stage in pipeline mode.
+            show_progress (bool): Whether to show a progress bar when streaming or pipelining.
+                Requires tqdm; without it no bar is shown.
+            concurrency (Optional[int]): The number of streaming workers. None streams one
+                batch at a time and returns a status message.
+            deterministic_ids (bool): Whether to derive ids from the documents; see `document_id`.
+            skip_existing (bool): With deterministic ids, whether to skip documents already stored.
+            ledger (Optional[IdLedger]): A local record of the stored ids, consulted by
+                `skip_existing` and updated as uploads succeed.
+            adaptive (Union[bool, AdaptiveBatcher]): Whether to tune the upload chunk size,
+                or the batcher to tune it with.
 
         Returns:
-            str: Status message indicating the success of the operation.
+            Union[str, IngestReport, BatchInsertReport]: Status message indicating the success
+                of the operation, the ingest report in pipeline mode and concurrent streaming,
+                or the chunked upload report in adaptive batch mode.
         """
+        make_id = document_id if deterministic_ids else random_id
+        batcher = adaptive if isinstance(adaptive, AdaptiveBatcher) else None
+        if adaptive and batcher is None:
+            batcher = AdaptiveBatcher(initial_size=batch_size or STREAMING_BATCH_SIZE)
+        counter = SkipCounter()
+        if deterministic_ids:
+            existing = self._existing_ids(collection_name, ledger) if skip_existing else frozenset()
+            sized = hasattr(documents, "__len__")
+            documents = unique_documents(documents, make_id, existing, counter)
+            if sized:
+                documents = list(documents)
+        if pipeline:
+            report = IngestPipeline(
+                self,
+                collection_name,
+                embedding_model_client,
+                batch_size=batch_size or STREAMING_BATCH_SIZE,
+                embed_workers=embed_workers,
+                upload_workers=upload_workers,
+                queue_size=queue_size,
+                progress=tqdm_progress(len(documents) if hasattr(documents, "__len__") else None)
+                if show_progress else None,
+                make_id=make_id,
+                ledger=ledger,
+                batcher=batcher
+            ).run(documents)
+            report.skipped = counter.skipped
+            return report
+        if streaming and concurrency:
+            report = stream_documents(
+                self,
+                collection_name,
+                documents,
+                embedding_model_client,
+                batch_size=batch_size or STREAMING_BATCH_SIZE,
+                concurrency=concurrency,
+                progress=tqdm_progress(len(documents) if hasattr(documents, "__len__") else None)
+                if show_progress else None,
+                make_id=make_id,
+                ledger=ledger
+            )
+            report.skipped = counter.skipped
+            return report
         try:
             if streaming:
-                for page in tqdm(documents, desc="Adding documents"):
+                progress = progress_bar(
+                    len(documents) if hasattr(documents, "__len__") else None, enabled=show_progress
+                )
+                for pages in batched(documents, batch_size or STREAMING_BATCH_SIZE):
                     try:
-                        embeddings = self.embed(page.page_content, embedding_model_client)
-                        vector_id = str(uuid.uuid4())
-                        metadata = page.metadata
-                        metadata["text"] = page.page_content
-
-                        self.client.insert_embeddings(
-                            collection_name=collection_name,
-                            vector_id=vector_id,
-                            vector=embeddings,
-                            metadata=metadata
+                        vectors = self.embed_batch(
+                            [page.page_content for page in pages], embedding_model_client, batch_size
                         )
                     except Exception as e:
-                        print(f"An error occurred while adding a document: {e}")
+                        print(f"An error occurred while embedding a batch of documents: {e}")
+                        progress.update(len(pages))
+                        continue
+                    for page, embeddings in zip(pages, vectors):
+                        try:
+                            vector_id = make_id(page)
+                            metadata = page.metadata
+                            metadata["text"] = page.page_content
+
+                            result = self.client.insert_embeddings(
+                                collection_name=collection_name,
+                                vector_id=vector_id,
+                                vector=embeddings,
+                                metadata=metadata
+                            )
+                            if ledger is not None and not str(result).startswith("Failed"):
+                                ledger.add([vector_id])
+                        except Exception as e:
+                            print(f"An error occurred while adding a document: {e}")
+                        progress.update(1)
+                progress.close()
                 result = "Streaming insertion completed."
             else:
+                # Read once: a generator would be exhausted by the texts before the zip below.
+                documents = list(documents)
+                if not documents:
+                    # Nothing left to embed or send, e.g. every document was already stored.
+                    if batcher is not None:
+                        return BatchInsertReport(adaptive=batcher.snapshot())
+                    if counter.skipped:
+                        return f"Skipped: all {counter.skipped} documents already exist"
+                    return "No documents to insert."
+                vectors = self.embed_batch(
+                    [page.page_content for page in documents], embedding_model_client, batch_size
+                )
                 doc_embeddings = []
-                for page in documents:
-                    embeddings = self.embed(page.page_content, embedding_model_client)
+                for page, embeddings in zip(documents, vectors):
                     metadata = page.metadata
                     metadata["text"] = page.page_content
 
                     doc_embeddings.append({
-                        "id": str(uuid.uuid4()),
+                        "id": make_id(page),
                         "vector": embeddings,
                         "metadata": metadata
                     })
 
                 result = self.client.batch_insert_embeddings(
                     collection_name=collection_name,
-                    embeddings=doc_embeddings
+                    embeddings=doc_embeddings,
+                    adaptive=batcher or False
                 )
+                if ledger is not None:
+                    failed_ids = set(result.failed_ids) if batcher is not None else set()
+                    ledger.add([embedding["id"] for embedding in doc_embeddings if embedding["id"] not in failed_ids])
             return result
         except Exception as e:
             print(f"An error occurred during document processing: {e}")
@@ -196,7 +609,8 @@ class MemVectorDBVectorStore:
         self,
         k: int,
         collection_name: str,
-        query_vector: List[float]
+        query_vector: List[float],
+        filter: Optional[MetadataFilter] = None
     ) -> List[Dict[str, Any]]:
         """
         Queries the collection for the nearest vectors.
@@ -205,6 +619,8 @@ class MemVectorDBVectorStore:
             k (int): The number of nearest vectors to return.
             collection_name (str): The name of the collection.
             query_vector (List[float]): The query vector.
+            filter (Optional[MetadataFilter]): Only return vectors whose metadata matches,
+                e.g. {"source": {"$prefix": "handbook/"}}; see `MemVectorDB.query`.
 
         Returns:
             List[Dict[str, Any]]: The list of nearest vectors.
@@ -212,7 +628,8 @@ class MemVectorDBVectorStore:
         return self.client.query(
             k=k,
             collection_name=collection_name,
-            query_vector=query_vector
+            query_vector=query_vector,
+            filter=filter
         )
 
     def delete_collection(
@@ -0,0 +1,151 @@
+import asyncio
+import unittest
+from memvectordb.async_collection import AsyncMemVectorDB, gather_bounded
+from memvectordb.instrumentation import Instrumentation
+from memvectordb.testing import MockMemVectorDBServer, MockMemVectorDBStore
+
+
+class FlakyEmbeddingsStore(MockMemVectorDBStore):
+    """A stand-in store whose first `/get_embeddings` answer is a 503."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.embeddings_requests = 0
+
+    def get_embeddings(self, payload):
+        self.embeddings_requests += 1
+        if self.embeddings_requests == 1:
+            return 503, {"status": "Error: unavailable"}
+        return super().get_embeddings(payload)
+
+    routes = {
+        **MockMemVectorDBStore.routes,
+        ("GET", "/get_embeddings"): get_embeddings,
+    }
+
+
+class TestAsyncMemVectorDB(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(self) -> None:
+        self.server = MockMemVectorDBServer().start()
+
+    @classmethod
+    def tearDownClass(self) -> None:
+        self.server.stop()
+
+    async def asyncSetUp(self) -> None:
+        self.client = AsyncMemVectorDB(base_url=self.server.url)
+        self.collection_name = "test_collection_name"
+        self.dimension = 3
+        self.distance = "cosine"
+        await self.client.create_collection(self.collection_name, self.dimension, self.distance)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.delete_collection(self.collection_name)
+        await self.client.close()
+
+    def embeddings(self):
+        return [
+            {
+                "id": {
+                    "unique_id": "1"
+                },
+                "vector": [0.14, 0.316, 0.433],
+                "metadata": {
+                    "key1": "value1",
+                    "key2": "value2"
+                }
+            },
+            {
+                "id": {
+                    "unique_id": "4"
+                },
+                "vector": [0.27, 0.531, 0.621],
+                "metadata": {
+                    "key1": "value3",
+                    "key2": "value4"
+                }
+            }
+        ]
+
+    async def test_01_create_collection(self):
+        """Test creating a collection and rejecting duplicates."""
+        collection = await self.client.create_collection("other_collection", self.dimension, self.distance)
+        duplicate = await self.client.create_collection("other_collection", self.dimension, self.distance)
+        await self.client.delete_collection("other_collection")
+        self.assertIn('Collection created: "other_collection"', collection)
+        self.assertIn("already exists", duplicate)
+
+    async def test_02_get_collection(self):
+        """Test getting a collection."""
+        inserted_data = await self.client.get_collection(self.collection_name)
+        self.assertEqual(self.dimension, inserted_data["dimension"])
+        self.assertEqual(self.distance, inserted_data["distance"])
+        self.assertEqual(0, len(inserted_data['embeddings']))
+
+    async def test_03_insert_embeddings(self):
+        """Test inserting single embeddings concurrently."""
+        await self.client.insert_many(self.collection_name, self.embeddings(), concurrency=2)
+        embeddings = await self.client.get_embeddings(self.collection_name)
+        self.assertEqual(2, len(embeddings))
+
+    async def test_04_batch_insert_embeddings(self):
+        """Test batch inserting embeddings into a collection."""
+        await self.client.batch_insert_embeddings(self.collection_name, self.embeddings())
+        inserted_data = await self.client.get_collection(self.collection_name)
+        self.assertEqual(2, len(inserted_data['embeddings']))
+
+    async def test_05_query_many(self):
+        """Test that concurrent queries return results in input order."""
+        await self.client.batch_insert_embeddings(self.collection_name, self.embeddings())
+        query_vectors = [[0.14, 0.316, 0.433], [0.27, 0.531, 0.621]] * 5
+        results = await self.client.query_many(1, self.collection_name, query_vectors, concurrency=3)
+        self.assertEqual(len(query_vectors), len(results))
+        self.assertEqual(["1", "4"] * 5, [r[0]["embedding"]["id"]["unique_id"] for r in results])
+
+    async def test_06_iter_embeddings(self):
+        """Test streaming embeddings in batches."""
+        await self.client.batch_insert_embeddings(self.collection_name, self.embeddings())
+        batches = [batch async for batch in self.client.iter_embeddings(self.collection_name, batch_size=1)]
+        self.assertEqual(["1", "4"], [batch[0]["id"]["unique_id"] for batch in batches])
+
+    async def test_07_gather_bounded(self):
+        """Test that gather_bounded never exceeds the concurrency limit."""
+        in_flight, peak = 0, 0
+
+        async def task(i):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return i
+
+        results = await gather_bounded((task(i) for i in range(20)), concurrency=4)
+        self.assertEqual(list(range(20)), results)
+        self.assertLessEqual(peak, 4)
+
+    async def test_08_iter_embeddings_retries(self):
+        """Test that streaming embeddings is retried and reported like any other request."""
+        await self.client.batch_insert_embeddings(self.collection_name, self.embeddings())
+        original = self.server.store
+        store = FlakyEmbeddingsStore()
+        store.collections = original.collections
+        self.server.httpd.store = store
+        instrumentation = Instrumentation()
+        try:
+            async with AsyncMemVectorDB(
+                base_url=self.server.url, backoff_factor=0, instrumentation=instrumentation
+            ) as client:
+                embeddings = [embedding async for embedding in client.iter_embeddings(self.collection_name)]
+        finally:
+            self.server.httpd.store = original
+        self.assertEqual(["1", "4"], [embedding["id"]["unique_id"] for embedding in embeddings])
+        self.assertEqual(2, store.embeddings_requests)
+        metrics = instrumentation.to_prometheus()
+        self.assertIn('memvectordb_request_retries_total{endpoint="/get_embeddings"} 1', metrics)
+        self.assertIn('memvectordb_request_errors_total{endpoint="/get_embeddings"} 0', metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
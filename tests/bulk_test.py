@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest import mock
+from memvectordb.bulk import read_collection_file, write_collection_file
+from memvectordb.collection import MemVectorDB
+from memvectordb.testing import MockMemVectorDBServer
+
+
+class TestCollectionFile(unittest.TestCase):
+    def test_01_round_trip(self):
+        """Test that a written file reads back with mapped vectors, ids and metadata."""
+        batches = [
+            [{"id": {"unique_id": "a"}, "vector": [1.0, 2.0], "metadata": {"lang": "en"}}],
+            [],
+            [{"id": {"unique_id": "é"}, "vector": [3.0, 4.0], "metadata": None}],
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "collection.mvdb")
+            self.assertEqual(2, write_collection_file(path, batches, "name", "dot"))
+            archive = read_collection_file(path)
+            self.assertEqual(("name", 2, "dot"), (archive.collection_name, archive.dimension, archive.distance))
+            self.assertEqual(["a", "é"], archive.ids)
+            self.assertEqual([{"lang": "en"}, None], archive.metadata)
+            self.assertEqual([[1.0, 2.0], [3.0, 4.0]], archive.vectors.tolist())
+            self.assertFalse(archive.vectors.flags.writeable)
+            del archive
+
+    def test_02_rejects_other_files(self):
+        """Test that a file without the magic bytes is rejected."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "other.bin")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 64)
+            with self.assertRaises(ValueError):
+                read_collection_file(path)
+
+
+class TestExportImport(unittest.TestCase):
+    """export_collection and import_collection against the local stand-in server."""
+
+    def test_01_export_then_import(self):
+        """Test that a collection survives an export and an import into a new collection."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((250, 8)).astype(np.float32)
+        with MockMemVectorDBServer() as server, MemVectorDB(base_url=server.url) as client, \
+                tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "collection.mvdb")
+            client.create_collection("source", 8, "euclidean")
+            client.batch_insert_embeddings(
+                "source", ids=[str(i) for i in range(250)], vectors=vectors,
+                metadata=[{"i": str(i)} for i in range(250)]
+            )
+            self.assertEqual(250, client.export_collection("source", path, batch_size=64))
+            report = client.import_collection(path, "copy", chunk_size=100)
+            self.assertEqual((250, 3), (report.inserted, report.chunks))
+            copy = client.get_collection("copy")
+            self.assertEqual("euclidean", copy["distance"])
+            self.assertEqual(
+                client.query(3, "source", vectors[5]),
+                client.query(3, "copy", vectors[5])
+            )
+
+
+    def test_02_export_reads_only_the_header(self):
+        """Test that export takes the distance from the head of the response instead of a full get_collection."""
+        with MockMemVectorDBServer() as server, MemVectorDB(base_url=server.url) as client, \
+                tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "collection.mvdb")
+            client.create_collection("source", 4, "dot")
+            client.batch_insert_embeddings("source", ids=["a", "b"], vectors=np.eye(4, dtype=np.float32)[:2])
+            with mock.patch.object(client, "get_collection", side_effect=AssertionError("full load")):
+                self.assertEqual(2, client.export_collection("source", path))
+            archive = read_collection_file(path)
+            self.assertEqual(("dot", 4), (archive.distance, archive.dimension))
+            del archive
+
+
+if __name__ == "__main__":
+    unittest.main()
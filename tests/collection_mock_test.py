@@ -0,0 +1,251 @@
+import unittest
+import numpy as np
+from array import array
+from memvectordb.batching import AdaptiveBatcher
+from memvectordb.collection import MemVectorDB
+from memvectordb.instrumentation import Instrumentation
+from memvectordb.testing import MockMemVectorDBServer, MockMemVectorDBStore
+
+
+class BatchQueryStore(MockMemVectorDBStore):
+    """A stand-in store that also serves `/batch_get_similarity`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_requests = 0
+
+    def batch_get_similarity(self, payload):
+        self.batch_requests += 1
+        return 200, [
+            self.get_similarity({**payload, "query_vector": vector})[1]
+            for vector in payload["query_vectors"]
+        ]
+
+    routes = {
+        **MockMemVectorDBStore.routes,
+        ("GET", "/batch_get_similarity"): batch_get_similarity,
+    }
+
+
+class FlakyInsertStore(MockMemVectorDBStore):
+    """A stand-in store that answers the first `failures` batch inserts with `status`."""
+
+    def __init__(self, status, failures) -> None:
+        super().__init__()
+        self.status = status
+        self.failures = failures
+        self.insert_requests = 0
+
+    def batch_insert_embeddings(self, payload):
+        self.insert_requests += 1
+        if self.insert_requests <= self.failures:
+            return self.status, {"status": "Error: unavailable"}
+        return super().batch_insert_embeddings(payload)
+
+    routes = {
+        **MockMemVectorDBStore.routes,
+        ("PUT", "/batch_insert_embeddings"): batch_insert_embeddings,
+    }
+
+
+class TestMemVectorDBMockServer(unittest.TestCase):
+    """MemVectorDB client tests against the local stand-in server."""
+
+    @classmethod
+    def setUpClass(self) -> None:
+        self.server = MockMemVectorDBServer().start()
+
+    @classmethod
+    def tearDownClass(self) -> None:
+        self.server.stop()
+
+    def setUp(self) -> None:
+        self.client = MemVectorDB(base_url=self.server.url)
+        self.collection_name = "test_collection_name"
+        self.client.create_collection(self.collection_name, 3, "cosine")
+        self.client.batch_insert_embeddings(self.collection_name, [
+            {"id": {"unique_id": "1"}, "vector": [0.14, 0.316, 0.433]},
+            {"id": {"unique_id": "4"}, "vector": [0.27, 0.531, 0.621]},
+            {"id": {"unique_id": "7"}, "vector": [0.9, 0.1, 0.05]},
+        ])
+
+    def tearDown(self) -> None:
+        self.client.delete_collection(self.collection_name)
+        self.client.close()
+        self.server.httpd.store = MockMemVectorDBStore()
+
+    def test_01_query_many_preserves_order(self):
+        """Test that query_many returns one result list per query, in input order."""
+        query_vectors = [[0.9, 0.1, 0.05], [0.14, 0.316, 0.433], [0.27, 0.531, 0.621]] * 4
+        results = self.client.query_many(1, self.collection_name, query_vectors, concurrency=4)
+        self.assertEqual(["7", "1", "4"] * 4, [r[0]["embedding"]["id"]["unique_id"] for r in results])
+        self.assertFalse(self.client._batch_query_supported)
+
+    def test_02_query_many_numpy(self):
+        """Test that query_many accepts a 2-D NumPy array."""
+        query_vectors = np.array([[0.9, 0.1, 0.05], [0.14, 0.316, 0.433]], dtype=np.float32)
+        results = self.client.query_many(2, self.collection_name, query_vectors)
+        self.assertEqual(2, len(results))
+        self.assertEqual([2, 2], [len(r) for r in results])
+
+    def test_03_query_many_isolates_errors(self):
+        """Test that a failing query does not affect the others."""
+        client = MemVectorDB(base_url=self.server.url)
+        query = client.query
+
+        def flaky_query(k, collection_name, query_vector):
+            if query_vector[0] < 0:
+                raise ValueError("bad vector")
+            return query(k, collection_name, query_vector)
+
+        client.query = flaky_query
+        results = client.query_many(1, self.collection_name, [[0.9, 0.1, 0.05], [-1.0, 0.0, 0.0]])
+        client.close()
+        self.assertEqual("7", results[0][0]["embedding"]["id"]["unique_id"])
+        self.assertIsInstance(results[1], ValueError)
+
+    def test_04_query_many_batch_endpoint(self):
+        """Test that a single batch request is used when the server supports it."""
+        store = BatchQueryStore()
+        store.collections = self.server.store.collections
+        self.server.httpd.store = store
+        results = self.client.query_many(1, self.collection_name, [[0.9, 0.1, 0.05], [0.14, 0.316, 0.433]])
+        self.assertEqual(1, store.batch_requests)
+        self.assertEqual(["7", "1"], [r[0]["embedding"]["id"]["unique_id"] for r in results])
+
+    def test_05_chunked_batch_insert(self):
+        """Test that a generator is uploaded in chunks and reported in aggregate."""
+        embeddings = (
+            {"id": {"unique_id": str(i)}, "vector": [float(i), 1.0, 0.5], "metadata": {"n": i}}
+            for i in range(100, 150)
+        )
+        report = self.client.batch_insert_embeddings(
+            self.collection_name, embeddings, chunk_size=8, max_in_flight=3
+        )
+        inserted_data = self.client.get_collection(self.collection_name)
+        self.assertEqual(50, report.inserted)
+        self.assertEqual(7, report.chunks)
+        self.assertEqual([], report.failed_ids)
+        self.assertEqual(53, len(inserted_data["embeddings"]))
+
+    def test_06_chunked_batch_insert_byte_budget(self):
+        """Test that chunks respect the byte budget and failed chunks report their ids."""
+        embeddings = [
+            {"id": {"unique_id": str(i)}, "vector": [0.1, 0.2, 0.3]}
+            for i in range(20)
+        ]
+        embeddings[13]["vector"] = [0.1, 0.2]
+        report = self.client.batch_insert_embeddings(
+            self.collection_name, embeddings, max_chunk_bytes=300, max_chunk_retries=1
+        )
+        self.assertGreater(report.chunks, 1)
+        self.assertEqual(1, report.failed_chunks)
+        self.assertIn("13", report.failed_ids)
+        self.assertEqual(20, report.inserted + len(report.failed_ids))
+
+    def test_07_iter_embeddings(self):
+        """Test streaming embeddings one at a time and in batches."""
+        embeddings = list(self.client.iter_embeddings(self.collection_name, chunk_size=16))
+        batches = list(self.client.iter_embeddings(self.collection_name, batch_size=2))
+        self.assertEqual(self.client.get_embeddings(self.collection_name), embeddings)
+        self.assertEqual([2, 1], [len(batch) for batch in batches])
+
+    def test_08_numpy_vectors(self):
+        """Test inserting and querying with NumPy arrays and buffers, and columnar results."""
+        self.client.insert_embeddings(self.collection_name, "20", np.array([0.5, 0.5, 0.5], dtype=np.float32))
+        self.client.insert_embeddings(self.collection_name, "21", array("f", [0.1, 0.9, 0.1]))
+        self.client.batch_insert_embeddings(
+            self.collection_name,
+            ids=["30", "31"],
+            vectors=np.eye(3, dtype=np.float32)[:2],
+            metadata=[{"row": 0}, None],
+            chunk_size=1
+        )
+        results = self.client.query(2, self.collection_name, np.array([1.0, 0.0, 0.0]), as_numpy=True)
+        embeddings = self.client.get_embeddings(self.collection_name, as_numpy=True)
+        self.assertEqual("30", results.ids[0])
+        self.assertEqual((2, 3), results.vectors.shape)
+        self.assertEqual(np.float32, results.vectors.dtype)
+        self.assertAlmostEqual(1.0, float(results.scores[0]), places=5)
+        self.assertEqual((7, 3), embeddings.vectors.shape)
+        self.assertEqual({"row": "0"}, embeddings.metadata[embeddings.ids.index("30")])
+
+    def test_09_adaptive_batch_insert(self):
+        """Test that adaptive chunks grow while fast, shrink after a failure, and are exported as gauges."""
+        instrumentation = Instrumentation()
+        client = MemVectorDB(base_url=self.server.url, instrumentation=instrumentation)
+        embeddings = [
+            {"id": {"unique_id": str(i)}, "vector": [0.1, 0.2, 0.3]}
+            for i in range(100, 400)
+        ]
+        embeddings[250]["vector"] = [0.1, 0.2]
+        batcher = AdaptiveBatcher(initial_size=8, min_size=4, target_seconds=5.0)
+        report = client.batch_insert_embeddings(
+            self.collection_name, embeddings, max_in_flight=1, max_chunk_retries=0, adaptive=batcher
+        )
+        client.close()
+        self.assertEqual(300, report.inserted + len(report.failed_ids))
+        self.assertIn("350", report.failed_ids)
+        growth = report.chunk_sizes[:5]
+        self.assertEqual(8, growth[0])
+        self.assertEqual(sorted(growth), growth)
+        self.assertGreaterEqual(report.adaptive.largest, 64)
+        self.assertEqual(1, report.adaptive.decreases)
+        self.assertFalse(report.adaptive.slow_start)
+        self.assertLess(report.adaptive.chunk_size, report.adaptive.largest)
+        self.assertIn("memvectordb_batch_chunk_size ", instrumentation.to_prometheus())
+        self.assertIn('memvectordb_batch_chunk_decisions{decision="decrease"} 1', instrumentation.to_prometheus())
+
+    def test_10_chunk_retries_not_stacked(self):
+        """Test that a chunk's retries count the session's and the client's, and never repeat each other's."""
+        embeddings = [{"id": {"unique_id": str(i)}, "vector": [0.1, 0.2, 0.3]} for i in range(4)]
+        client = MemVectorDB(base_url=self.server.url, max_retries=2, backoff_factor=0)
+        for status, failures, requests, retries, ok in [
+            (503, 2, 3, 2, True),
+            (503, 5, 3, 2, False),
+            (500, 2, 3, 2, True),
+            (500, 5, 3, 2, False),
+        ]:
+            store = FlakyInsertStore(status, failures)
+            self.server.httpd.store = store
+            client.create_collection(self.collection_name, 3, "cosine")
+            report = client.batch_insert_embeddings(self.collection_name, embeddings, chunk_size=4, max_chunk_retries=2)
+            self.assertEqual((requests, retries), (store.insert_requests, report.retries), status)
+            self.assertEqual(4 if ok else 0, report.inserted)
+        client.close()
+
+
+class TestAdaptiveBatcher(unittest.TestCase):
+    def test_01_aimd(self):
+        """Test slow start, additive increase, multiplicative decrease and the limits."""
+        batcher = AdaptiveBatcher(initial_size=10, min_size=5, max_size=100, target_seconds=1.0, increase=5)
+        self.assertEqual("increase", batcher.record(10, 10, 1000, 0.1))
+        self.assertEqual(20, batcher.chunk_size)
+        self.assertEqual("decrease", batcher.record(20, 20, 2000, 2.0))
+        self.assertEqual(10, batcher.chunk_size)
+        # A chunk cut before the decrease does not cut the size again.
+        self.assertEqual("hold", batcher.record(20, 20, 2000, 0.1, ok=False))
+        self.assertEqual("increase", batcher.record(10, 10, 1000, 0.1))
+        self.assertEqual(15, batcher.chunk_size)
+        # Growing would put the next chunk over the latency target.
+        self.assertEqual("hold", batcher.record(15, 15, 1500, 0.9))
+        self.assertEqual("decrease", batcher.record(15, 15, 1500, 0.1, retries=1))
+        self.assertEqual("decrease", batcher.record(7, 7, 700, 0.1, ok=False))
+        self.assertEqual(5, batcher.chunk_size)
+        stats = batcher.snapshot()
+        self.assertEqual((2, 3, 2), (stats.increases, stats.decreases, stats.holds))
+        self.assertEqual((5, 20), (stats.smallest, stats.largest))
+
+    def test_02_byte_budget(self):
+        """Test that the chunk size stops growing at the byte budget."""
+        batcher = AdaptiveBatcher(initial_size=8, max_chunk_bytes=2000, target_seconds=10.0)
+        for _ in range(5):
+            batcher.record(batcher.chunk_size, batcher.chunk_size, 100 * batcher.chunk_size, 0.01)
+        self.assertEqual(20, batcher.chunk_size)
+        self.assertEqual("hold", batcher.record(20, 12, 1200, 0.01))
+        with self.assertRaises(ValueError):
+            AdaptiveBatcher(decrease=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
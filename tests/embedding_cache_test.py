@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from memvectordb.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def test_01_memory_lru(self):
+        """Test hits, misses and least recently used eviction in memory."""
+        cache = EmbeddingCache(max_items=2)
+        cache.put("openai", "model", "a", [1.0, 0.0])
+        cache.put("openai", "model", "b", [0.0, 1.0])
+        self.assertEqual([1.0, 0.0], cache.get("openai", "model", "a"))
+        cache.put("openai", "model", "c", [0.5, 0.5])
+        self.assertIsNone(cache.get("openai", "model", "b"))
+        self.assertIsNone(cache.get("openai", "other-model", "a"))
+        self.assertEqual(1, cache.stats.hits)
+        self.assertEqual(2, cache.stats.misses)
+        self.assertEqual(1, cache.stats.evictions)
+
+    def test_02_disk_persistence(self):
+        """Test that embeddings survive a restart and disk size is bounded."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+            cache = EmbeddingCache(path=path, max_disk_items=2)
+            cache.put_many("st", "model", ["a", "b", "c"], [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+            cache.close()
+
+            cache = EmbeddingCache(path=path)
+            results = cache.get_many("st", "model", ["a", "b", "c", "c"])
+            cache.close()
+        self.assertIsNone(results[0])
+        self.assertEqual([[3.0, 4.0], [5.0, 6.0], [5.0, 6.0]], results[1:])
+        self.assertEqual(3, cache.stats.disk_hits)
+        self.assertAlmostEqual(0.75, cache.stats.hit_rate)
+
+
+    def test_03_float16_storage(self):
+        """Test that float16 storage halves the stored vectors and that the format is checked on reopen."""
+        import numpy as np
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+            cache = EmbeddingCache(path=path, storage="float16")
+            cache.put("openai", "model", "a", [0.1, 0.2, 0.3])
+            cache.put("openai", "model", "b", np.array([1.0, -2.0], dtype=np.float32))
+            size = cache.db.execute("SELECT SUM(LENGTH(vector)) FROM embeddings").fetchone()[0]
+            cache.close()
+            self.assertEqual(10, size)
+            cache = EmbeddingCache(path=path, storage="float16")
+            vector = cache.get("openai", "model", "a")
+            self.assertEqual([1.0, -2.0], cache.get("openai", "model", "b"))
+            cache.close()
+            for expected, actual in zip([0.1, 0.2, 0.3], vector):
+                self.assertAlmostEqual(expected, actual, places=3)
+            with self.assertRaises(ValueError):
+                EmbeddingCache(path=path)
+        with self.assertRaises(ValueError):
+            EmbeddingCache(storage="int8")
+
+
+if __name__ == "__main__":
+    unittest.main()
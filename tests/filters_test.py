@@ -0,0 +1,113 @@
+import unittest
+from memvectordb.collection import MemVectorDB
+from memvectordb.filters import compile_filter
+from memvectordb.testing import MockMemVectorDBServer, MockMemVectorDBStore
+
+
+class FilterIgnoringStore(MockMemVectorDBStore):
+    """A stand-in store for a server that predates filters and ignores them."""
+
+    def get_similarity(self, payload):
+        return super().get_similarity({key: value for key, value in payload.items() if key != "filter"})
+
+    routes = {
+        **MockMemVectorDBStore.routes,
+        ("GET", "/get_similarity"): get_similarity,
+    }
+
+
+class FilterRejectingStore(MockMemVectorDBStore):
+    """A stand-in store for a server that rejects the unknown filter field."""
+
+    def get_similarity(self, payload):
+        if "filter" in payload:
+            return 400, {"status": "Error: unknown field `filter`"}
+        return super().get_similarity(payload)
+
+    routes = {
+        **MockMemVectorDBStore.routes,
+        ("GET", "/get_similarity"): get_similarity,
+    }
+
+
+def make_embeddings(n):
+    return [
+        {
+            "id": {"unique_id": str(i)},
+            "vector": [1.0, i / n, 0.0],
+            "metadata": {"lang": "en" if i % 10 == 0 else "fr", "path": f"docs/{i}" if i < n // 2 else f"blog/{i}"}
+        }
+        for i in range(n)
+    ]
+
+
+class TestCompileFilter(unittest.TestCase):
+    def test_01_operators(self):
+        """Test equality, IN, prefix and callable filters."""
+        metadata = {"lang": "en", "path": "docs/intro", "page": "3"}
+        self.assertTrue(compile_filter({"lang": "en", "page": 3})(metadata))
+        self.assertTrue(compile_filter({"lang": ["fr", "en"]})(metadata))
+        self.assertTrue(compile_filter({"path": {"$prefix": "docs/"}, "lang": {"$in": ["en"]}})(metadata))
+        self.assertFalse(compile_filter({"path": {"$prefix": "blog/"}})(metadata))
+        self.assertFalse(compile_filter({"missing": "x"})(metadata))
+        self.assertFalse(compile_filter({"lang": "en"})(None))
+        self.assertTrue(compile_filter(lambda metadata: int(metadata["page"]) > 2)(metadata))
+        with self.assertRaises(ValueError):
+            compile_filter({"lang": {"$regex": "e.*"}})
+
+
+class TestFilteredQuery(unittest.TestCase):
+    """Filtered queries against a server that ignores filters and one that applies them."""
+
+    def setUp(self) -> None:
+        self.server = MockMemVectorDBServer().start()
+        self.server.httpd.store = FilterIgnoringStore()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def check_client(self, client):
+        client.create_collection("test_collection_name", 3, "cosine")
+        client.batch_insert_embeddings("test_collection_name", make_embeddings(200))
+        results = client.query(5, "test_collection_name", [1.0, 0.0, 0.0], filter={"lang": "en"})
+        self.assertEqual(5, len(results))
+        self.assertTrue(all(item["embedding"]["metadata"]["lang"] == "en" for item in results))
+        prefixed = client.query(
+            3, "test_collection_name", [1.0, 0.0, 0.0], filter={"path": {"$prefix": "blog/"}}, as_numpy=True
+        )
+        self.assertEqual(3, len(prefixed.ids))
+        self.assertTrue(all(int(vector_id) >= 100 for vector_id in prefixed.ids))
+        none = client.query(5, "test_collection_name", [1.0, 0.0, 0.0], filter={"lang": "de"})
+        self.assertEqual([], none)
+
+    def test_01_adaptive_overfetch(self):
+        """Test that the client over-fetches when the server ignores the filter."""
+        with MemVectorDB(base_url=self.server.url) as client:
+            self.check_client(client)
+            self.assertIs(False, client._server_filter_supported)
+            self.assertGreater(client.filter_stats.overfetch_ratio, 1.0)
+            requests = client.filter_stats.requests
+            client.query(5, "test_collection_name", [1.0, 0.0, 0.0], filter={"lang": "en"})
+            self.assertEqual(requests + 1, client.filter_stats.requests)
+
+    def test_02_server_side_filter(self):
+        """Test that a filtering server answers each filtered query in one request."""
+        with MemVectorDB(base_url="memory://") as client:
+            self.check_client(client)
+            self.assertEqual(3, client.filter_stats.server_filtered)
+            self.assertEqual(1.0, client.filter_stats.overfetch_ratio)
+
+    def test_03_rejected_filter(self):
+        """Test that a 400 for the filter field falls back to client-side filtering."""
+        self.server.httpd.store = FilterRejectingStore()
+        with MemVectorDB(base_url=self.server.url) as client:
+            self.check_client(client)
+            self.assertIs(False, client._server_filter_supported)
+            self.assertEqual(0, client.filter_stats.server_filtered)
+            requests = client.filter_stats.requests
+            client.query(5, "test_collection_name", [1.0, 0.0, 0.0], filter={"lang": "en"})
+            self.assertEqual(requests + 1, client.filter_stats.requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
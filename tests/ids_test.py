@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from memvectordb.ids import IdLedger, SkipCounter, content_id, document_id, unique_documents
+
+
+class TestContentIds(unittest.TestCase):
+    def test_01_stable_ids(self):
+        """Test that ids depend on the source and content only."""
+        self.assertEqual(content_id("text", "a.pdf"), content_id("text", "a.pdf"))
+        self.assertNotEqual(content_id("text", "a.pdf"), content_id("text", "b.pdf"))
+        self.assertNotEqual(content_id("ab", "c"), content_id("b", "ac"))
+        document = SimpleNamespace(page_content="text", metadata={"source": "a.pdf", "page": 3})
+        self.assertEqual(content_id("text", "a.pdf"), document_id(document))
+
+    def test_02_unique_documents(self):
+        """Test that duplicates and existing ids are dropped lazily and counted."""
+        documents = [SimpleNamespace(page_content=text, metadata={}) for text in ("a", "b", "a", "c")]
+        counter = SkipCounter()
+        kept = unique_documents(documents, existing={content_id("c")}, counter=counter)
+        self.assertEqual(["a", "b"], [document.page_content for document in kept])
+        self.assertEqual((1, 1), (counter.duplicates, counter.existing))
+
+
+class TestIdLedger(unittest.TestCase):
+    def test_01_persists(self):
+        """Test that recorded ids survive a reopen and a torn last line is ignored."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ids.ledger")
+            with IdLedger(path) as ledger:
+                ledger.add(["a", "b"])
+                ledger.add(["b", "c"])
+            with open(path, "a") as f:
+                f.write("d")
+            ledger = IdLedger(path)
+            self.assertEqual(3, len(ledger))
+            self.assertIn("c", ledger)
+            self.assertNotIn("d", ledger)
+            ledger.add(["e"])
+            ledger.close()
+            self.assertEqual({"a", "b", "c", "e"}, IdLedger(path).ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
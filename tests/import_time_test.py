@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["torch", "openai", "sentence_transformers", "tqdm", "numpy"]
+
+
+def import_in_subprocess(module):
+    """Import a module in a fresh interpreter and report which heavy modules it loaded and how long it took."""
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+class TestImportTime(unittest.TestCase):
+    """Importing the HTTP client must stay cheap for services that never embed text."""
+
+    def test_01_collection_import_is_light(self):
+        """Test that importing memvectordb.collection loads no provider libraries and is fast."""
+        result = import_in_subprocess("memvectordb.collection")
+        self.assertEqual([], result["loaded"])
+        self.assertLess(result["elapsed"], 1.0)
+
+    def test_02_vectorstore_import_is_lazy(self):
+        """Test that importing memvectordb.vectorstore defers openai, sentence_transformers and tqdm."""
+        result = import_in_subprocess("memvectordb.vectorstore")
+        self.assertEqual([], result["loaded"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from memvectordb.async_collection import AsyncMemVectorDB
+from memvectordb.collection import MemVectorDB
+from memvectordb.instrumentation import Histogram, Instrumentation
+from memvectordb.testing import MockMemVectorDBServer
+
+
+class TestHistogram(unittest.TestCase):
+    def test_01_quantiles(self):
+        """Test that quantiles interpolate within buckets and buckets are cumulative."""
+        histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+            histogram.observe(value)
+        self.assertEqual(5, histogram.count)
+        self.assertAlmostEqual(1.75, histogram.quantile(0.5))
+        self.assertEqual(4.0, histogram.quantile(0.99))
+        self.assertEqual([("1.0", 1), ("2.0", 3), ("4.0", 4), ("+Inf", 5)], histogram.cumulative())
+
+
+class TestClientInstrumentation(unittest.TestCase):
+    def test_01_records_requests(self):
+        """Test that each request is recorded per endpoint with its phases, sizes and errors."""
+        events = []
+        instrumentation = Instrumentation(callbacks=[events.append])
+        with MemVectorDB(base_url="memory://", instrumentation=instrumentation) as client:
+            client.create_collection("c", 2, "dot")
+            client.insert_embeddings("c", "a", [1.0, 0.0])
+            client.query(1, "c", [1.0, 0.0])
+            client.query(1, "c", [0.0, 1.0])
+            client.get_embeddings("missing")
+        self.assertEqual(
+            ["/create_collection", "/insert_embeddings", "/get_similarity", "/get_similarity", "/get_embeddings"],
+            [event.endpoint for event in events]
+        )
+        similarity = instrumentation.metrics["/get_similarity"]
+        self.assertEqual((2, 0), (similarity.requests, similarity.errors))
+        self.assertEqual(2, similarity.latency["deserialize"].count)
+        self.assertGreater(similarity.bytes_sent, 0)
+        self.assertGreater(similarity.bytes_received, 0)
+        self.assertEqual(1, instrumentation.metrics["/get_embeddings"].errors)
+        self.assertEqual(2, instrumentation.summary()["/get_similarity"]["requests"])
+
+        instrumentation.set_gauge("chunk_size", 500, collection="c")
+        text = instrumentation.to_prometheus()
+        self.assertIn('memvectordb_requests_total{endpoint="/get_similarity"} 2', text)
+        self.assertIn(
+            'memvectordb_request_duration_seconds_count{endpoint="/get_similarity",phase="network"} 2', text
+        )
+        self.assertIn('memvectordb_chunk_size{collection="c"} 500', text)
+
+
+class TestAsyncInstrumentation(unittest.IsolatedAsyncioTestCase):
+    async def test_01_records_requests(self):
+        """Test that the asyncio client reports all three phases in one event."""
+        instrumentation = Instrumentation()
+        with MockMemVectorDBServer() as server:
+            async with AsyncMemVectorDB(base_url=server.url, instrumentation=instrumentation) as client:
+                await client.create_collection("c", 2, "dot")
+                await client.query(1, "c", [1.0, 0.0])
+        similarity = instrumentation.metrics["/get_similarity"]
+        self.assertEqual(1, similarity.requests)
+        self.assertEqual(1, similarity.latency["deserialize"].count)
+        self.assertEqual(200, next(iter(similarity.statuses)))
+
+
+if __name__ == "__main__":
+    unittest.main()
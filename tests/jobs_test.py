@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from memvectordb.jobs import IngestJob
+from memvectordb.testing import MockMemVectorDBServer, FakeSentenceTransformer
+from memvectordb.vectorstore import MemVectorDBVectorStore
+
+
+def make_documents(n):
+    return [
+        SimpleNamespace(page_content=f"Page {i} of the document", metadata={"source": "doc.pdf", "page": i})
+        for i in range(n)
+    ]
+
+
+class TestIngestJob(unittest.TestCase):
+    """IngestJob tests against the local stand-in server and a fake embedder."""
+
+    @classmethod
+    def setUpClass(self) -> None:
+        self.server = MockMemVectorDBServer().start()
+
+    @classmethod
+    def tearDownClass(self) -> None:
+        self.server.stop()
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = os.path.join(self.directory.name, "ingest.journal")
+        self.collection_name = "test_collection_name"
+        self.store = MemVectorDBVectorStore(self.server.url, "sentence_transformers", "multi-qa-MiniLM-L6-cos-v1")
+        self.store.create_collection(self.collection_name, "cosine")
+        self.embedder = FakeSentenceTransformer(dimension=384)
+
+    def tearDown(self) -> None:
+        self.store.delete_collection(self.collection_name)
+        self.store.close()
+        self.directory.cleanup()
+
+    def job(self, **kwargs):
+        return IngestJob(self.store, self.collection_name, self.journal, self.embedder, batch_size=4, **kwargs)
+
+    def stored(self):
+        return len(self.store.get_collection(self.collection_name)["embeddings"])
+
+    def test_01_resume_after_failure(self):
+        """Test that a rerun redoes only the batches that did not complete."""
+        encode = self.embedder.encode
+
+        def flaky_encode(sentences, batch_size=32, **kwargs):
+            if "Page 8 of the document" in sentences:
+                raise RuntimeError("model crashed")
+            return encode(sentences, batch_size=batch_size)
+
+        with mock.patch.object(self.embedder, "encode", flaky_encode):
+            report = self.job().run(iter(make_documents(14)))
+        self.assertEqual((14, 10, 4), (report.documents, report.inserted, report.failed))
+        self.assertEqual([8, 9, 10, 11], [failure.index for failure in report.failures])
+        encoded = self.embedder.texts_encoded
+
+        report = self.job().run(make_documents(14))
+        self.assertEqual((4, 10), (report.inserted, report.skipped))
+        self.assertEqual(encoded + 4, self.embedder.texts_encoded)
+        self.assertGreater(report.embed_rate, 0)
+        self.assertEqual(14, self.stored())
+
+        report = self.job().run(make_documents(14))
+        self.assertEqual((0, 14), (report.inserted, report.skipped))
+
+    def test_02_journaled_embeddings(self):
+        """Test that vectors journaled before a failed upload are not embedded again."""
+        insert = self.store.client.batch_insert_embeddings
+        with mock.patch.object(self.store.client, "batch_insert_embeddings", side_effect=ConnectionError("down")):
+            report = self.job(journal_embeddings=True).run(make_documents(6))
+        self.assertEqual((0, 6, 6), (report.inserted, report.failed, report.embedded))
+
+        with mock.patch.object(self.store.client, "batch_insert_embeddings", wraps=insert):
+            report = self.job(journal_embeddings=True).run(make_documents(6))
+        self.assertEqual((6, 0), (report.inserted, report.embedded))
+        self.assertEqual(6, self.embedder.texts_encoded)
+        self.assertEqual(6, self.stored())
+
+    def test_03_journal_checks(self):
+        """Test that a torn last record is ignored and changed input is refused."""
+        self.job().run(make_documents(4))
+        with open(self.journal, "ab") as f:
+            f.write(b'{"type":"uploa')
+        self.assertEqual(1, len(self.job().read_journal().completed))
+        self.job().run(make_documents(8))
+        self.assertEqual(2, len(self.job().read_journal().completed))
+        with self.assertRaises(ValueError):
+            self.job().run(make_documents(9)[1:])
+        with self.assertRaises(ValueError):
+            IngestJob(self.store, self.collection_name, self.journal, self.embedder, batch_size=5).run([])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import math
+import unittest
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.local import LocalCollection, drop_engine
+
+
+def _score(distance, a, b):
+    """A pure-Python reference for the engine's scores."""
+    if distance == "dot":
+        return sum(x * y for x, y in zip(a, b))
+    if distance == "euclidean":
+        return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+
+class TestLocalCollection(unittest.TestCase):
+    def test_01_search_matches_brute_force(self):
+        """Test that vectorized top-k matches a brute-force ranking for every distance."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((200, 8)).astype(np.float32)
+        query = rng.standard_normal(8).astype(np.float32)
+        for distance in ("cosine", "euclidean", "dot"):
+            collection = LocalCollection(8, distance)
+            collection.insert([str(i) for i in range(200)], vectors, [None] * 200)
+            rows, scores = collection.search(query, 5)
+            expected = sorted(
+                range(200),
+                key=lambda i: _score(distance, query.tolist(), vectors[i].tolist()),
+                reverse=distance != "euclidean"
+            )[:5]
+            self.assertEqual(expected, rows.tolist(), distance)
+            self.assertAlmostEqual(_score(distance, query.tolist(), vectors[expected[0]].tolist()), scores[0], 4)
+
+    def test_02_upsert_and_growth(self):
+        """Test that rows grow past the initial capacity and existing ids are overwritten."""
+        collection = LocalCollection(2, "dot")
+        collection.insert([str(i) for i in range(40)], np.ones((40, 2), dtype=np.float32), [None] * 40)
+        collection.insert(["3"], np.array([[5.0, 5.0]], dtype=np.float32), [{"key": "value"}])
+        rows, scores = collection.search(np.array([1.0, 1.0], dtype=np.float32), 1)
+        self.assertEqual(40, len(collection))
+        self.assertEqual("3", collection.ids[rows[0]])
+        self.assertEqual(10.0, scores[0])
+        self.assertEqual({"key": "value"}, collection.embedding(rows[0])["metadata"])
+
+
+class TestMemVectorDBLocal(unittest.TestCase):
+    """MemVectorDB client tests against the in-process engine."""
+
+    def setUp(self) -> None:
+        self.client = MemVectorDB(base_url="memory://")
+        self.collection_name = "test_collection_name"
+        self.client.create_collection(self.collection_name, 3, "cosine")
+        self.client.batch_insert_embeddings(self.collection_name, [
+            {"id": {"unique_id": "1"}, "vector": [0.14, 0.316, 0.433], "metadata": {"key1": "value1"}},
+            {"id": {"unique_id": "4"}, "vector": [0.27, 0.531, 0.621]},
+        ])
+
+    def tearDown(self) -> None:
+        self.client.close()
+
+    def test_01_endpoints(self):
+        """Test that the engine answers like the server."""
+        self.client.insert_embeddings(self.collection_name, "7", np.array([0.9, 0.1, 0.05]))
+        inserted_data = self.client.get_collection(self.collection_name)
+        similar_vectors = self.client.query(1, self.collection_name, [0.9, 0.1, 0.05])
+        self.assertEqual(3, inserted_data["dimension"])
+        self.assertEqual(3, len(inserted_data["embeddings"]))
+        self.assertEqual("7", similar_vectors[0]["embedding"]["id"]["unique_id"])
+        self.assertIn("already exists", self.client.create_collection(self.collection_name, 3, "cosine"))
+        self.assertEqual({"status": "Error: NotFound"}, self.client.get_collection("missing"))
+        self.assertIn("DimensionMismatch", self.client.insert_embeddings(self.collection_name, "8", [1.0]))
+
+    def test_02_streaming_and_chunked(self):
+        """Test that streamed reads and chunked uploads work without a server."""
+        report = self.client.batch_insert_embeddings(
+            self.collection_name,
+            ids=[str(i) for i in range(10, 30)],
+            vectors=np.ones((20, 3), dtype=np.float32),
+            chunk_size=7
+        )
+        self.assertEqual(20, report.inserted)
+        self.assertEqual(22, sum(len(batch) for batch in self.client.iter_embeddings(self.collection_name, batch_size=5)))
+
+    def test_03_named_engines_are_shared(self):
+        """Test that clients using the same memory:// name see the same collections."""
+        self.addCleanup(drop_engine, "shared")
+        with MemVectorDB("memory://shared") as writer, MemVectorDB("memory://shared") as reader:
+            writer.create_collection("shared_collection", 2, "euclidean")
+            writer.insert_embeddings("shared_collection", "1", [0.0, 1.0])
+            self.assertEqual(1, len(reader.get_embeddings("shared_collection")))
+        self.assertEqual({"status": "Error: NotFound"}, self.client.get_collection("shared_collection"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
+import os
 import unittest
 from memvectordb.collection import MemVectorDB
 from json.decoder import JSONDecodeError
 
+# Set MEMVECTORDB_URL=memory:// to run these tests against the in-process engine.
+BASE_URL = os.environ.get("MEMVECTORDB_URL", "http://127.0.0.1:8000")
+
 class TestMemVectorDB(unittest.TestCase):
     @classmethod
     def setUpClass(self) -> None:
-        self.client = MemVectorDB(base_url="http://127.0.0.1:8000")
+        self.client = MemVectorDB(base_url=BASE_URL)
 
 
     def test_01_create_collection(self):
@@ -171,6 +175,21 @@ class TestMemVectorDB(unittest.TestCase):
         self.assertEqual(1, len(similar_vectors))
         self.assertIsNotNone(similar_vectors, "The result should not be None")
 
+    @unittest.skipUnless(BASE_URL.startswith("http"), "needs an HTTP server")
+    def test_07_pooled_session(self):
+        """Test that the client reuses its session and closes it as a context manager."""
+        collection_name = "test_collection_name"
+        distance = "cosine" 
+        dimension = 3
+        with MemVectorDB(base_url=BASE_URL, pool_maxsize=2, timeout=10) as client:
+            session = client.session
+            client.create_collection(collection_name, dimension, distance)
+            inserted_data = client.get_collection(collection_name)
+            client.delete_collection(collection_name)
+            self.assertIs(session, client.session)
+        self.assertEqual(dimension, inserted_data["dimension"])
+        self.assertEqual(0, len(client.session.adapters["http://"].poolmanager.pools))
+
     @classmethod
     def sort_test_methods(cls, testCaseClass, testCaseNames):
         """
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from unittest import mock
+from memvectordb.collection import MemVectorDB
+from memvectordb.mirror import CollectionMirror
+
+
+class TestCollectionMirror(unittest.TestCase):
+    """CollectionMirror tests, with the in-process engine standing in for the server."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.client = MemVectorDB(base_url="memory://")
+        self.collection_name = "test_collection_name"
+        self.client.create_collection(self.collection_name, 4, "cosine")
+        rng = np.random.default_rng(0)
+        self.vectors = rng.standard_normal((50, 4)).astype(np.float32)
+        self.client.batch_insert_embeddings(
+            self.collection_name,
+            ids=[str(i) for i in range(50)],
+            vectors=self.vectors,
+            metadata=[{"parity": str(i % 2)} for i in range(50)]
+        )
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.directory.cleanup()
+
+    def ids(self, results):
+        return [item["embedding"]["id"]["unique_id"] for item in results]
+
+    def test_01_sync_and_query_locally(self):
+        """Test that a streamed first sync answers like the server, filters included."""
+        mirror = CollectionMirror(self.client, self.collection_name, self.directory.name)
+        self.assertTrue(mirror.stale)
+        with mock.patch.object(self.client, "get_collection", side_effect=AssertionError("full load")):
+            report = mirror.refresh()
+        self.assertEqual(50, report.added)
+        query = self.vectors[7]
+        self.assertEqual(self.ids(self.client.query(5, self.collection_name, query)), self.ids(mirror.query(5, query)))
+        odd = mirror.query(3, query, filter={"parity": "1"}, as_numpy=True)
+        self.assertEqual("7", odd.ids[0])
+        self.assertEqual(2, mirror.stats.local_queries)
+        self.assertEqual(0, mirror.stats.remote_queries)
+
+    def test_02_incremental_refresh(self):
+        """Test that a refresh applies only additions, updates and removals."""
+        mirror = CollectionMirror(self.client, self.collection_name, self.directory.name)
+        mirror.refresh()
+        self.client.insert_embeddings(self.collection_name, "3", [1.0, 0.0, 0.0, 0.0], {"parity": "1"})
+        self.client.batch_insert_embeddings(
+            self.collection_name, ids=["50", "51"], vectors=np.ones((2, 4)), metadata=[None, None]
+        )
+        report = mirror.refresh()
+        self.assertEqual((2, 1, 0, 49), (report.added, report.updated, report.removed, report.unchanged))
+        self.assertEqual("3", self.ids(mirror.query(1, [1.0, 0.0, 0.0, 0.0]))[0])
+
+        self.client.delete_collection(self.collection_name)
+        self.client.create_collection(self.collection_name, 4, "cosine")
+        self.client.insert_embeddings(self.collection_name, "51", [1.0, 2.0, 3.0, 4.0])
+        report = mirror.refresh()
+        self.assertEqual((0, 1, 51), (report.added, report.updated, report.removed))
+        self.assertEqual(1, len(mirror))
+
+    def test_03_reopen_and_staleness(self):
+        """Test that a reopened mirror is usable offline and that a stale one falls back to the server."""
+        CollectionMirror(self.client, self.collection_name, self.directory.name).refresh()
+        mirror = CollectionMirror(self.client, self.collection_name, self.directory.name, max_age=0.05)
+        self.assertEqual(50, len(mirror))
+        mirror.refresh()
+        mirror.query(1, self.vectors[0])
+        time.sleep(0.06)
+        self.assertTrue(mirror.stale)
+        self.assertEqual("0", self.ids(mirror.query(1, self.vectors[0]))[0])
+        self.assertEqual(1, mirror.stats.remote_queries)
+        mirror.close()
+
+
+    def test_04_compaction_is_crash_safe(self):
+        """Test that a crash while compacting leaves the previous sidecar matching its vector file."""
+        CollectionMirror(self.client, self.collection_name, self.directory.name).refresh()
+        self.client.delete_collection(self.collection_name)
+        self.client.create_collection(self.collection_name, 4, "cosine")
+        self.client.batch_insert_embeddings(
+            self.collection_name, ids=[str(i) for i in range(40, 50)], vectors=self.vectors[40:]
+        )
+        mirror = CollectionMirror(self.client, self.collection_name, self.directory.name)
+        with mock.patch.object(CollectionMirror, "_save_sidecar", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                mirror.refresh()
+        mirror = CollectionMirror(self.client, self.collection_name, self.directory.name)
+        self.assertEqual(50, len(mirror))
+        self.assertEqual(["7"], self.ids(mirror.query(1, self.vectors[7])))
+        np.testing.assert_array_equal(self.vectors[7], mirror.collection.vectors[mirror.collection.index["7"]])
+
+        report = mirror.refresh()
+        self.assertEqual((40, 10), (report.removed, len(mirror)))
+        self.assertEqual(["45"], self.ids(mirror.query(1, self.vectors[45])))
+        self.assertEqual(["test_collection_name.1.f32", "test_collection_name.json"], sorted(os.listdir(self.directory.name)))
+        mirror.close()
+        mirror = CollectionMirror(self.client, self.collection_name, self.directory.name)
+        np.testing.assert_array_equal(self.vectors[45], mirror.collection.vectors[mirror.collection.index["45"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.quantization import Quantizer
+from memvectordb.serialization import get_serializer
+
+
+class TestQuantizer(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        vector = rng.standard_normal(64).astype(np.float32)
+        self.vector = vector / np.linalg.norm(vector)
+
+    def test_01_encodings(self):
+        """Test that each mode stays close to the original and shrinks the payload."""
+        dumps = get_serializer("auto").dumps
+        raw = len(dumps(self.vector))
+        half = Quantizer("float16").encode(self.vector)
+        np.testing.assert_allclose(self.vector, half, atol=1e-3)
+        self.assertLess(len(dumps(half)), raw * 0.75)
+        quantizer = Quantizer("int8")
+        codes = quantizer.encode(self.vector)
+        self.assertTrue(all(isinstance(code, int) and -127 <= code <= 127 for code in codes))
+        np.testing.assert_allclose(self.vector, quantizer.decode(codes), atol=quantizer.step)
+        self.assertLess(len(dumps(codes)), raw * 0.5)
+        with self.assertRaises(ValueError):
+            Quantizer("int4")
+
+    def test_02_truncation(self):
+        """Test that truncation keeps the leading components at unit length."""
+        truncated = Quantizer(dimensions=16).truncate(self.vector)
+        self.assertEqual((16,), truncated.shape)
+        self.assertAlmostEqual(1.0, float(np.linalg.norm(truncated)), places=5)
+        raw = Quantizer(dimensions=16, renormalize=False).truncate(self.vector)
+        np.testing.assert_array_equal(self.vector[:16], raw)
+
+    def test_03_calibrate(self):
+        """Test that calibration fits the int8 scale to the sample."""
+        sample = np.stack([self.vector, -self.vector])
+        quantizer = Quantizer.calibrate(sample, quantile=1.0)
+        self.assertAlmostEqual(float(np.abs(self.vector).max()), quantizer.scale, places=6)
+        self.assertEqual(127, max(abs(code) for code in quantizer.encode(self.vector)))
+
+
+class TestQuantizedClient(unittest.TestCase):
+    """MemVectorDB with quantization against the in-process engine."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((200, 32)).astype(np.float32)
+        self.vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.ids = [str(i) for i in range(200)]
+
+    def result_ids(self, results):
+        return [item["embedding"]["id"]["unique_id"] for item in results]
+
+    def test_01_int8_round_trip(self):
+        """Test that int8 inserts and queries rank like float32 and return float vectors."""
+        with MemVectorDB(base_url="memory://") as exact, \
+                MemVectorDB(base_url="memory://", quantization=Quantizer("int8")) as client:
+            for db in (exact, client):
+                db.create_collection("c", 32, "cosine")
+                db.batch_insert_embeddings("c", ids=self.ids, vectors=self.vectors, chunk_size=64)
+            client.insert_embeddings("c", "0", self.vectors[0])
+            results = client.query(5, "c", self.vectors[3])
+            self.assertEqual("3", self.result_ids(results)[0])
+            self.assertAlmostEqual(1.0, results[0]["score"], places=3)
+            np.testing.assert_allclose(self.vectors[3], results[0]["embedding"]["vector"], atol=0.01)
+            expected = self.result_ids(exact.query(5, "c", self.vectors[7]))
+            self.assertEqual(expected[:3], self.result_ids(client.query(5, "c", self.vectors[7]))[:3])
+            batch = client.query_many(5, "c", self.vectors[:3], rerank="cosine")
+            self.assertEqual(["0", "1", "2"], [self.result_ids(result)[0] for result in batch])
+            stored = client.get_embeddings("c", as_numpy=True)
+            self.assertLess(float(np.abs(stored.vectors).max()), 1.01)
+
+    def test_02_truncated_float16(self):
+        """Test that truncated float16 vectors are stored at the truncated dimension."""
+        quantizer = Quantizer("float16", dimensions=16)
+        with MemVectorDB(base_url="memory://", quantization=quantizer) as client:
+            client.create_collection("c", 16, "dot")
+            client.batch_insert_embeddings("c", [
+                {"id": {"unique_id": i}, "vector": vector} for i, vector in zip(self.ids, self.vectors)
+            ])
+            results = client.query(3, "c", self.vectors[9], filter={})
+            self.assertEqual("9", self.result_ids(results)[0])
+            self.assertEqual(16, len(results[0]["embedding"]["vector"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import time
+import unittest
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.query_cache import QueryCache
+from memvectordb.testing import MockMemVectorDBServer, MockMemVectorDBStore
+
+
+class CountingStore(MockMemVectorDBStore):
+    """A stand-in store that counts similarity requests."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.similarity_requests = 0
+
+    def get_similarity(self, payload):
+        self.similarity_requests += 1
+        return super().get_similarity(payload)
+
+    routes = {
+        **MockMemVectorDBStore.routes,
+        ("GET", "/get_similarity"): get_similarity,
+    }
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_01_lru_and_ttl(self):
+        """Test hits, least recently used eviction and expiry."""
+        cache = QueryCache(max_items=2, ttl=0.05)
+        cache.put("c", 1, [0.1, 0.2], ["a"])
+        cache.put("c", 2, [0.1, 0.2], ["b"])
+        self.assertEqual(["a"], cache.get("c", 1, np.array([0.1, 0.2], dtype=np.float32)))
+        cache.put("c", 3, [0.1, 0.2], ["c"])
+        self.assertIsNone(cache.get("c", 2, [0.1, 0.2]))
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("c", 1, [0.1, 0.2]))
+        self.assertEqual(1, cache.stats.hits)
+        self.assertEqual(1, cache.stats.evictions)
+        self.assertEqual(1, cache.stats.expirations)
+
+    def test_02_invalidate_discards_racing_put(self):
+        """Test that invalidation drops a collection's entries and results computed before it."""
+        cache = QueryCache()
+        cache.put("c", 1, [0.1], ["a"])
+        cache.put("other", 1, [0.1], ["b"])
+        generation = cache.generation("c")
+        cache.invalidate("c")
+        cache.put("c", 1, [0.1], ["stale"], generation)
+        self.assertIsNone(cache.get("c", 1, [0.1]))
+        self.assertEqual(["b"], cache.get("other", 1, [0.1]))
+        self.assertEqual(1, cache.stats.invalidations)
+
+
+class TestQueryCacheMockServer(unittest.TestCase):
+    """MemVectorDB query caching against the local stand-in server."""
+
+    def setUp(self) -> None:
+        self.server = MockMemVectorDBServer().start()
+        self.server.httpd.store = CountingStore()
+        self.cache = QueryCache()
+        self.client = MemVectorDB(base_url=self.server.url, query_cache=self.cache)
+        self.collection_name = "test_collection_name"
+        self.client.create_collection(self.collection_name, 3, "cosine")
+        self.client.insert_embeddings(self.collection_name, "1", [0.14, 0.316, 0.433])
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+
+    def test_01_repeated_query_is_cached(self):
+        """Test that identical queries hit the server once."""
+        for _ in range(3):
+            results = self.client.query(1, self.collection_name, [0.14, 0.316, 0.433])
+        self.assertEqual("1", results[0]["embedding"]["id"]["unique_id"])
+        self.assertEqual(1, self.server.store.similarity_requests)
+        self.assertEqual(2, self.cache.stats.hits)
+
+    def test_02_writes_invalidate(self):
+        """Test that inserts and deletes from the same client drop cached results."""
+        self.client.query(2, self.collection_name, [0.9, 0.1, 0.05])
+        self.client.batch_insert_embeddings(self.collection_name, [
+            {"id": {"unique_id": "7"}, "vector": [0.9, 0.1, 0.05]},
+        ])
+        results = self.client.query(2, self.collection_name, [0.9, 0.1, 0.05])
+        self.assertEqual("7", results[0]["embedding"]["id"]["unique_id"])
+        self.assertEqual(2, self.server.store.similarity_requests)
+        self.client.delete_collection(self.collection_name)
+        self.assertEqual(0, len(self.cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from memvectordb.collection import MemVectorDB
+from memvectordb.filters import compile_filter
+from memvectordb.rerank import Reranker, score_vectors
+
+
+class TestReranker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.results = [
+            {"score": 0.9, "embedding": {"id": {"unique_id": "a"}, "vector": [1.0, 0.0], "metadata": {"lang": "en"}}},
+            {"score": 0.8, "embedding": {"id": {"unique_id": "b"}, "vector": [3.0, 3.0], "metadata": {"lang": "fr"}}},
+            {"score": 0.7, "embedding": {"id": {"unique_id": "c"}, "vector": [0.0, 1.0], "metadata": None}},
+        ]
+
+    def ids(self, results):
+        return [item["embedding"]["id"]["unique_id"] for item in results]
+
+    def test_01_metrics(self):
+        """Test that each metric ranks higher-is-better."""
+        vectors = np.array([[1.0, 0.0], [3.0, 3.0], [0.0, 1.0]], dtype=np.float32)
+        query = np.array([0.0, 2.0], dtype=np.float32)
+        self.assertEqual([2, 1, 0], np.argsort(-score_vectors(vectors, query, "cosine")).tolist())
+        self.assertEqual(1, int(np.argmax(score_vectors(vectors, query, "dot"))))
+        self.assertEqual(2, int(np.argmax(score_vectors(vectors, query, "euclidean"))))
+
+    def test_02_filter_boost_and_fusion(self):
+        """Test metadata filters, boosts and reciprocal rank fusion."""
+        self.assertEqual(["b", "a"], self.ids(Reranker("dot", where={"lang": ["en", "fr"]}).rerank(self.results, [1.0, 1.0], 3)))
+        boosted = Reranker("cosine", boosts={"lang": {"en": 1.0}}).rerank(self.results, [0.0, 1.0], 2)
+        self.assertEqual(["a", "c"], self.ids(boosted))
+        self.assertEqual(0.9, boosted[0]["server_score"])
+        fused = Reranker("cosine", fusion="rrf", server_weight=2.0).rerank(self.results, [0.0, 1.0], 3)
+        self.assertEqual(["a", "b", "c"], self.ids(fused))
+        self.assertTrue(compile_filter(lambda metadata: "lang" not in metadata)(None))
+
+
+class TestQueryRerank(unittest.TestCase):
+    """MemVectorDB.query re-ranking against the in-process engine."""
+
+    def setUp(self) -> None:
+        self.client = MemVectorDB(base_url="memory://")
+        self.client.create_collection("test_collection_name", 2, "dot")
+        self.client.batch_insert_embeddings(
+            "test_collection_name",
+            ids=["a", "b", "c"],
+            vectors=np.array([[1.0, 0.0], [3.0, 3.0], [0.0, 1.0]]),
+            metadata=[{"lang": "en"}, {"lang": "fr"}, {"lang": "en"}]
+        )
+
+    def tearDown(self) -> None:
+        self.client.close()
+
+    def test_01_query_rerank(self):
+        """Test that query re-ranks server candidates by a different metric and filter."""
+        plain = self.client.query(1, "test_collection_name", [0.0, 1.0])
+        reranked = self.client.query(1, "test_collection_name", [0.0, 1.0], rerank="cosine")
+        filtered = self.client.query(
+            1, "test_collection_name", [0.0, 1.0], rerank=Reranker("dot", where={"lang": "en"}), as_numpy=True
+        )
+        self.assertEqual("b", plain[0]["embedding"]["id"]["unique_id"])
+        self.assertEqual("c", reranked[0]["embedding"]["id"]["unique_id"])
+        self.assertEqual(["c"], filtered.ids)
+
+    def test_02_query_many_rerank(self):
+        """Test that query_many applies the reranker to every query."""
+        results = self.client.query_many(1, "test_collection_name", [[0.0, 1.0], [1.0, 0.0]], rerank="cosine")
+        self.assertEqual(["c", "a"], [result[0]["embedding"]["id"]["unique_id"] for result in results])
+
+
+if __name__ == "__main__":
+    unittest.main()
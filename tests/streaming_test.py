@@ -0,0 +1,64 @@
+import json
+import unittest
+from memvectordb.streaming import iter_json_array, batched, read_json_header
+
+
+def byte_chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestJSONArrayStreamParser(unittest.TestCase):
+    def setUp(self) -> None:
+        self.embeddings = [
+            {
+                "id": {"unique_id": str(i)},
+                "vector": [0.1 * i, -2.5e-3, 1.0],
+                "metadata": {"text": 'quote " brace } bracket ] backslash \\ done', "i": str(i)}
+            }
+            for i in range(5)
+        ]
+
+    def test_01_top_level_array(self):
+        """Test decoding a top-level array fed one byte at a time."""
+        data = json.dumps(self.embeddings).encode("utf-8")
+        self.assertEqual(self.embeddings, list(iter_json_array(byte_chunks(data, 1))))
+
+    def test_02_keyed_array(self):
+        """Test decoding the array under a key of a top-level object."""
+        collection = {
+            "distance": "embeddings",
+            "dimension": 3,
+            "embeddings": self.embeddings,
+            "trailing": [{"not": "yielded"}]
+        }
+        data = json.dumps(collection).encode("utf-8")
+        for size in (1, 7, len(data)):
+            decoded = list(iter_json_array(byte_chunks(data, size), key="embeddings"))
+            self.assertEqual(self.embeddings, decoded)
+
+    def test_03_empty_array(self):
+        """Test that an empty array yields nothing."""
+        self.assertEqual([], list(iter_json_array([b"[", b" ]"])))
+
+    def test_04_read_json_header(self):
+        """Test that the fields before a key are decoded without reading past it."""
+        collection = {"distance": "embeddings", "dimension": 3, "embeddings": self.embeddings}
+        data = json.dumps(collection).encode("utf-8")
+        consumed = []
+
+        def chunks():
+            for chunk in byte_chunks(data, 7):
+                consumed.append(chunk)
+                yield chunk
+
+        self.assertEqual({"distance": "embeddings", "dimension": 3}, read_json_header(chunks(), "embeddings"))
+        self.assertLess(len(consumed), 10)
+        self.assertEqual({"a": {"embeddings": 1}}, read_json_header([b'{"a": {"embeddings": 1}}'], "embeddings"))
+
+    def test_05_batched(self):
+        """Test grouping items into batches."""
+        self.assertEqual([[0, 1], [2, 3], [4]], list(batched(range(5), 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
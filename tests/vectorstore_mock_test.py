@@ -0,0 +1,315 @@
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from memvectordb import vectorstore
+from memvectordb.vectorstore import MemVectorDBVectorStore
+from memvectordb.testing import MockMemVectorDBServer, FakeSentenceTransformer
+from memvectordb.embedding_cache import EmbeddingCache
+from memvectordb.ids import IdLedger
+from memvectordb.instrumentation import Instrumentation
+
+
+def make_documents(n):
+    return [
+        SimpleNamespace(page_content=f"Page {i} of the document", metadata={"page": i})
+        for i in range(n)
+    ]
+
+
+class TestMemVectorDBVectorStoreMockServer(unittest.TestCase):
+    """MemVectorDBVectorStore tests against the local stand-in server and a fake embedder."""
+
+    @classmethod
+    def setUpClass(self) -> None:
+        self.server = MockMemVectorDBServer().start()
+
+    @classmethod
+    def tearDownClass(self) -> None:
+        self.server.stop()
+
+    def setUp(self) -> None:
+        self.collection_name = "test_collection"
+        self.store = MemVectorDBVectorStore(self.server.url, "sentence_transformers", "multi-qa-MiniLM-L6-cos-v1")
+        self.store.create_collection(self.collection_name, "cosine")
+        self.embedder = FakeSentenceTransformer(dimension=384)
+
+    def tearDown(self) -> None:
+        self.store.delete_collection(self.collection_name)
+        self.store.close()
+
+    def test_01_embed_batch(self):
+        """Test that embed_batch matches embed and uses one model call."""
+        texts = ["First text string", "Second text string", "Third text string"]
+        vectors = self.store.embed_batch(texts, self.embedder)
+        self.assertEqual(1, self.embedder.calls)
+        self.assertEqual(3, len(vectors))
+        self.assertEqual(list(self.store.embed(texts[1], self.embedder)), list(vectors[1]))
+
+    def test_02_add_documents_batch(self):
+        """Test that batch add_documents embeds all documents in one call."""
+        self.store.add_documents(self.collection_name, make_documents(10), self.embedder, streaming=False)
+        inserted_data = self.store.get_collection(self.collection_name)
+        self.assertEqual(1, self.embedder.calls)
+        self.assertEqual(10, len(inserted_data["embeddings"]))
+
+    def test_03_add_documents_streaming(self):
+        """Test that streaming add_documents embeds in batches and inserts every document."""
+        self.store.add_documents(
+            self.collection_name, make_documents(10), self.embedder, streaming=True, batch_size=4
+        )
+        inserted_data = self.store.get_collection(self.collection_name)
+        self.assertEqual(3, self.embedder.calls)
+        self.assertEqual(10, len(inserted_data["embeddings"]))
+
+    def test_04_add_documents_pipeline(self):
+        """Test that pipeline mode embeds and uploads every batch and reports the outcome."""
+        documents = make_documents(25)
+        report = self.store.add_documents(
+            self.collection_name, documents, self.embedder, streaming=False,
+            batch_size=4, pipeline=True, embed_workers=2, upload_workers=2, queue_size=1,
+            show_progress=False
+        )
+        inserted_data = self.store.get_collection(self.collection_name)
+        self.assertEqual(25, report.documents)
+        self.assertEqual(25, report.inserted)
+        self.assertEqual(7, report.batches)
+        self.assertEqual(25, len(set(report.inserted_ids)))
+        self.assertEqual(25, len(inserted_data["embeddings"]))
+
+    def test_05_add_documents_pipeline_failures(self):
+        """Test that a failed upload is reported without stopping the other batches."""
+        documents = make_documents(8)
+        documents[5].page_content = "x" * 10
+        embedder = FakeSentenceTransformer(dimension=384)
+        encode = embedder.encode
+
+        def encode_with_bad_dimension(sentences, batch_size=32, **kwargs):
+            vectors = encode(sentences, batch_size=batch_size)
+            if "x" * 10 in sentences:
+                return vectors[:, :3]
+            return vectors
+
+        embedder.encode = encode_with_bad_dimension
+        report = self.store.add_documents(
+            self.collection_name, documents, embedder, streaming=False,
+            batch_size=4, pipeline=True, show_progress=False
+        )
+        self.assertEqual(4, report.inserted)
+        self.assertEqual(4, report.failed)
+        self.assertEqual(1, len(report.errors))
+        self.assertEqual([4, 5, 6, 7], [failure.index for failure in report.failures])
+
+    def test_06_embedding_cache(self):
+        """Test that cached texts are not sent to the model again."""
+        store = MemVectorDBVectorStore(
+            self.server.url, "sentence_transformers", "multi-qa-MiniLM-L6-cos-v1",
+            embedding_cache=EmbeddingCache()
+        )
+        store.embed_batch(["First text string", "Second text string"], self.embedder)
+        vectors = store.embed_batch(["Second text string", "Third text string"], self.embedder)
+        store.embed("First text string", self.embedder)
+        store.close()
+        self.assertEqual(3, self.embedder.texts_encoded)
+        self.assertEqual(2, len(vectors))
+        self.assertEqual(2, store.embedding_cache.stats.hits)
+
+
+    def test_07_embedding_client_memoized(self):
+        """Test that the embedding client is loaded once per process, even from many threads."""
+        vectorstore.clear_embedding_model_clients()
+        self.addCleanup(vectorstore.clear_embedding_model_clients)
+        with mock.patch.object(
+            vectorstore, "_create_embedding_model_client", return_value=self.embedder
+        ) as create:
+            stores = [
+                MemVectorDBVectorStore(self.server.url, "sentence_transformers", "multi-qa-MiniLM-L6-cos-v1")
+                for _ in range(4)
+            ]
+            threads = [threading.Thread(target=store.warmup) for store in stores]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(1, create.call_count)
+            self.assertEqual(1, sum(not store.embedding_client_stats.reused for store in stores))
+            for store in stores:
+                self.assertIs(self.embedder, store.embedding_model_client)
+                store.close()
+            self.store.add_documents(self.collection_name, make_documents(3))
+            self.assertEqual(1, create.call_count)
+        self.assertEqual(3, len(self.store.get_collection(self.collection_name)["embeddings"]))
+
+
+    def test_08_add_documents_streaming_concurrent(self):
+        """Test that concurrent streaming inserts every document and reports each failure."""
+        documents = make_documents(30)
+        documents[11].page_content = "x" * 10
+        embedder = FakeSentenceTransformer(dimension=384)
+        encode = embedder.encode
+
+        def encode_with_bad_dimension(sentences, batch_size=32, **kwargs):
+            vectors = encode(sentences, batch_size=batch_size)
+            return vectors[:, :3] if "x" * 10 in sentences else vectors
+
+        embedder.encode = encode_with_bad_dimension
+        report = self.store.add_documents(
+            self.collection_name, iter(documents), embedder, streaming=True,
+            batch_size=4, concurrency=3, show_progress=False
+        )
+        inserted_data = self.store.get_collection(self.collection_name)
+        self.assertEqual((30, 26, 4, 8), (report.documents, report.inserted, report.failed, report.batches))
+        self.assertEqual([8, 9, 10, 11], [failure.index for failure in report.failures])
+        self.assertEqual({"upload"}, {failure.stage for failure in report.failures})
+        self.assertEqual(26, len(set(report.inserted_ids)))
+        self.assertEqual(26, len(inserted_data["embeddings"]))
+
+
+    def test_09_deterministic_ids_and_resume(self):
+        """Test that re-ingesting with content ids neither duplicates nor re-embeds stored documents."""
+        documents = make_documents(10) + make_documents(2)
+        self.store.add_documents(self.collection_name, documents, self.embedder, deterministic_ids=True)
+        self.assertEqual(10, self.embedder.texts_encoded)
+        self.store.add_documents(self.collection_name, make_documents(10), self.embedder, deterministic_ids=True)
+        self.assertEqual(10, len(self.store.get_collection(self.collection_name)["embeddings"]))
+
+        report = self.store.add_documents(
+            self.collection_name, make_documents(12), self.embedder, pipeline=True, batch_size=4,
+            deterministic_ids=True, skip_existing=True, show_progress=False
+        )
+        self.assertEqual((2, 10), (report.inserted, report.skipped))
+        self.assertEqual(22, self.embedder.texts_encoded)
+
+        with mock.patch.object(self.store.client, "batch_insert_embeddings") as batch_insert:
+            result = self.store.add_documents(
+                self.collection_name, make_documents(12), self.embedder, streaming=False,
+                deterministic_ids=True, skip_existing=True
+            )
+            report = self.store.add_documents(
+                self.collection_name, make_documents(12), self.embedder, streaming=False,
+                deterministic_ids=True, skip_existing=True, adaptive=True
+            )
+        batch_insert.assert_not_called()
+        self.assertEqual("Skipped: all 12 documents already exist", result)
+        self.assertEqual((0, 0), (report.inserted, report.chunks))
+        self.assertEqual(22, self.embedder.texts_encoded)
+
+    def test_10_resume_from_ledger(self):
+        """Test that a ledger records uploads and lets a later run skip them without asking the server."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ids.ledger")
+            with IdLedger(path) as ledger:
+                report = self.store.add_documents(
+                    self.collection_name, make_documents(6), self.embedder, streaming=True, concurrency=2,
+                    batch_size=2, deterministic_ids=True, ledger=ledger, show_progress=False
+                )
+                self.assertEqual(6, report.inserted)
+            with IdLedger(path) as ledger:
+                self.assertEqual(6, len(ledger))
+                report = self.store.add_documents(
+                    self.collection_name, make_documents(8), self.embedder, streaming=True, concurrency=2,
+                    batch_size=2, deterministic_ids=True, skip_existing=True, ledger=ledger, show_progress=False
+                )
+            self.assertEqual((2, 6), (report.inserted, report.skipped))
+            self.assertEqual(8, self.embedder.texts_encoded)
+            self.assertEqual("Skipped", self.store.add_texts(
+                self.collection_name, "Page 0 of the document", self.embedder,
+                deterministic_ids=True, skip_existing=True
+            )[:7])
+
+    def test_11_add_documents_adaptive(self):
+        """Test that adaptive add_documents grows its uploads with the default settings in batch and pipeline mode."""
+        report = self.store.add_documents(
+            self.collection_name, make_documents(400), self.embedder, streaming=False, adaptive=True
+        )
+        self.assertEqual((400, []), (report.inserted, report.failed_ids))
+        self.assertEqual(32, report.chunk_sizes[0])
+        self.assertGreater(report.adaptive.increases, 0)
+        report = self.store.add_documents(
+            self.collection_name, make_documents(2000), self.embedder, pipeline=True, adaptive=True,
+            show_progress=False
+        )
+        self.assertEqual((2000, 0), (report.inserted, report.failed))
+        self.assertGreater(report.adaptive.increases, 0)
+        self.assertGreater(report.adaptive.largest, 32)
+        self.assertLess(report.batches, 2000 // 32)
+        self.assertEqual(2400, len(self.store.get_collection(self.collection_name)["embeddings"]))
+
+    def test_12_add_documents_generator(self):
+        """Test that batch and streaming add_documents accept a generator of documents."""
+        self.store.add_documents(self.collection_name, iter(make_documents(5)), self.embedder, streaming=False)
+        self.store.add_documents(
+            self.collection_name, (page for page in make_documents(3)), self.embedder,
+            streaming=True, show_progress=False
+        )
+        self.store.add_documents(
+            self.collection_name, iter(make_documents(5)), self.embedder, deterministic_ids=True
+        )
+        inserted_data = self.store.get_collection(self.collection_name)
+        self.assertEqual(13, len(inserted_data["embeddings"]))
+
+
+    def test_13_pipeline_bad_documents(self):
+        """Test that a bad document or a failing ledger fails its batch without stalling the pipeline."""
+        documents = make_documents(40)
+        documents[3].metadata = None
+        documents[9].metadata = "not a mapping"
+        report = self.store.add_documents(
+            self.collection_name, documents, self.embedder, batch_size=4, pipeline=True,
+            queue_size=1, show_progress=False
+        )
+        self.assertEqual((36, 4), (report.inserted, report.failed))
+        self.assertEqual([8, 9, 10, 11], [failure.index for failure in report.failures])
+        self.assertEqual("embed", report.failures[0].stage)
+
+        ledger = mock.Mock(add=mock.Mock(side_effect=OSError("disk full")))
+        report = self.store.add_documents(
+            self.collection_name, make_documents(12), self.embedder, batch_size=4, pipeline=True,
+            queue_size=1, show_progress=False, ledger=ledger
+        )
+        self.assertEqual((0, 12), (report.inserted, report.failed))
+        self.assertIn("disk full", report.errors[0])
+
+
+    def test_14_streaming_bad_documents(self):
+        """Test that concurrent streaming reports every document a bad input or a short embedding leaves behind."""
+        documents = make_documents(20)
+        documents[0].metadata = None
+        documents[1].metadata = "not a mapping"
+        report = self.store.add_documents(
+            self.collection_name, documents, self.embedder, streaming=True,
+            batch_size=10, concurrency=2, show_progress=False
+        )
+        self.assertEqual((19, 1), (report.inserted, report.failed))
+        self.assertEqual([1], [failure.index for failure in report.failures])
+
+        embed_batch = self.store.embed_batch
+        with mock.patch.object(self.store, "embed_batch", lambda texts, *args: embed_batch(texts, *args)[:-1]):
+            report = self.store.add_documents(
+                self.collection_name, make_documents(8), self.embedder, streaming=True,
+                batch_size=4, concurrency=2, show_progress=False
+            )
+        self.assertEqual((6, 2), (report.inserted, report.failed))
+        self.assertEqual([3, 7], [failure.index for failure in report.failures])
+
+    def test_15_adaptive_pipeline_gauges(self):
+        """Test that the store's instrumentation receives the pipeline's adaptive batch gauges."""
+        instrumentation = Instrumentation()
+        with MemVectorDBVectorStore(
+            self.server.url, "sentence_transformers", "multi-qa-MiniLM-L6-cos-v1", instrumentation=instrumentation
+        ) as store:
+            report = store.add_documents(
+                self.collection_name, make_documents(200), self.embedder, pipeline=True, adaptive=True,
+                show_progress=False
+            )
+        self.assertEqual(200, report.inserted)
+        metrics = instrumentation.to_prometheus()
+        self.assertIn(f"memvectordb_batch_chunk_size {report.adaptive.chunk_size}\n", metrics)
+        self.assertIn('memvectordb_batch_chunk_decisions{decision="increase"}', metrics)
+        self.assertIn("/batch_insert_embeddings", metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()